@@ -0,0 +1,222 @@
+"""
+Action Executor - Runs recommended actions in the background
+============================================================
+Actions are submitted and return at once; each runs in its own asyncio task
+behind a per-kind semaphore, with a timeout per attempt and retries with
+exponential backoff and jitter. An idempotency key (given, or derived from
+the action's content) makes resubmitting the same action within a window
+return the existing record instead of running it again, so a recommendation
+repeated on every /chat runs once.
+
+Handlers are plain coroutines registered per action kind; kinds without a
+handler are recorded as simulated. Every finished action is passed to the
+result callback, which the orchestrator uses to write it to episodic memory.
+"""
+
+import time
+import uuid
+import random
+import asyncio
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Callable, Awaitable, Set
+
+from dedupe import content_key
+
+logger = logging.getLogger(__name__)
+
+Handler = Callable[[Dict[str, Any]], Awaitable[Any]]
+
+FINISHED = frozenset({"succeeded", "failed", "simulated", "rejected"})
+
+class PermanentActionError(Exception):
+    """Raised by a handler when retrying cannot help"""
+
+@dataclass
+class ActionPolicy:
+    concurrency: int = 4
+    timeout: float = 30.0
+    retries: int = 2
+    # Delay before the first retry; doubled for each further attempt
+    backoff: float = 0.5
+    max_backoff: float = 30.0
+
+class ActionExecutor:
+    def __init__(self, on_result: Optional[Callable[[Dict[str, Any]], None]] = None,
+                 default_policy: Optional[ActionPolicy] = None, max_pending: int = 1000,
+                 idempotency_seconds: float = 6 * 3600, history: int = 5000):
+        self.on_result = on_result
+        self.default_policy = default_policy or ActionPolicy()
+        self.max_pending = max_pending
+        self.idempotency_seconds = idempotency_seconds
+        self.history = history
+        self.handlers: Dict[str, Handler] = {}
+        self.policies: Dict[str, ActionPolicy] = {}
+        self._limits: Dict[str, asyncio.Semaphore] = {}
+        # Records by id, oldest first, and the id holding each idempotency key
+        self.records: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._by_key: Dict[str, str] = {}
+        self._tasks: Set[asyncio.Task] = set()
+        self.running: Dict[str, int] = {}
+        self.counts = {"submitted": 0, "deduplicated": 0, "succeeded": 0, "failed": 0, "simulated": 0,
+                       "rejected": 0, "retries": 0, "timeouts": 0}
+
+    def register(self, kind: str, handler: Handler, policy: Optional[ActionPolicy] = None):
+        self.handlers[kind] = handler
+        if policy is not None:
+            self.policies[kind] = policy
+            self._limits.pop(kind, None)
+
+    def policy(self, kind: str) -> ActionPolicy:
+        return self.policies.get(kind, self.default_policy)
+
+    def _limit(self, kind: str) -> asyncio.Semaphore:
+        if kind not in self._limits:
+            self._limits[kind] = asyncio.Semaphore(max(1, self.policy(kind).concurrency))
+        return self._limits[kind]
+
+    @property
+    def pending(self) -> int:
+        return len(self._tasks)
+
+    # ---------- submission ----------
+
+    def submit(self, action: Dict[str, Any], idempotency_key: Optional[str] = None) -> Dict[str, Any]:
+        """Queue an action; returns its record, or the earlier record for the same idempotency key"""
+        kind = action.get("kind") or "other"
+        key = idempotency_key or action.get("idempotency_key") or content_key("action", {
+            "kind": kind, "action": action.get("action"), "client": action.get("client")
+        })
+        earlier = self.records.get(self._by_key.get(key, ""))
+        if earlier is not None and earlier["status"] not in ("failed", "rejected") and \
+                time.time() - earlier["submitted"] < self.idempotency_seconds:
+            self.counts["deduplicated"] += 1
+            return earlier
+
+        record = {
+            "id": uuid.uuid4().hex[:16],
+            "idempotency_key": key,
+            "kind": kind,
+            "action": action.get("action"),
+            "client": action.get("client"),
+            "payload": action,
+            "status": "queued",
+            "attempts": 0,
+            "result": None,
+            "error": None,
+            "submitted": time.time(),
+            "timestamp": datetime.now().isoformat(),
+            "finished_at": None
+        }
+        self._remember(record)
+        self.counts["submitted"] += 1
+
+        if kind not in self.handlers:
+            self._finish(record, "simulated")
+        elif self.pending >= self.max_pending:
+            self._finish(record, "rejected", error="Too many actions pending")
+        else:
+            task = asyncio.get_running_loop().create_task(self._run(record))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        return record
+
+    def _remember(self, record: Dict[str, Any]):
+        self.records[record["id"]] = record
+        self._by_key[record["idempotency_key"]] = record["id"]
+        while len(self.records) > self.history:
+            _, old = next(iter(self.records.items()))
+            if old["status"] not in FINISHED:
+                # Never forget a running action; the history briefly overshoots instead
+                break
+            self.records.popitem(last=False)
+            if self._by_key.get(old["idempotency_key"]) == old["id"]:
+                del self._by_key[old["idempotency_key"]]
+
+    # ---------- execution ----------
+
+    async def _run(self, record: Dict[str, Any]):
+        kind = record["kind"]
+        handler, policy = self.handlers[kind], self.policy(kind)
+        try:
+            async with self._limit(kind):
+                record["status"] = "running"
+                self.running[kind] = self.running.get(kind, 0) + 1
+                try:
+                    await self._attempt(record, handler, policy)
+                finally:
+                    self.running[kind] -= 1
+        except asyncio.CancelledError:
+            if record["status"] not in FINISHED:
+                self._finish(record, "failed", error="Cancelled")
+            raise
+
+    async def _attempt(self, record: Dict[str, Any], handler: Handler, policy: ActionPolicy):
+        for attempt in range(policy.retries + 1):
+            record["attempts"] = attempt + 1
+            try:
+                result = await asyncio.wait_for(handler(record["payload"]), policy.timeout)
+                self._finish(record, "succeeded", result=result)
+                return
+            except PermanentActionError as e:
+                self._finish(record, "failed", error=str(e))
+                return
+            except Exception as e:
+                if isinstance(e, asyncio.TimeoutError):
+                    self.counts["timeouts"] += 1
+                    error = f"Timed out after {policy.timeout}s"
+                else:
+                    error = f"{type(e).__name__}: {e}"
+                if attempt == policy.retries:
+                    self._finish(record, "failed", error=error)
+                    return
+                record["error"] = error
+                self.counts["retries"] += 1
+                delay = min(policy.backoff * 2 ** attempt, policy.max_backoff)
+                # Full jitter keeps retries of a failing dependency from arriving in lockstep
+                await asyncio.sleep(random.uniform(delay / 2, delay))
+
+    def _finish(self, record: Dict[str, Any], status: str, result: Any = None, error: Optional[str] = None):
+        record["status"] = status
+        record["result"] = result
+        record["error"] = error
+        record["finished_at"] = datetime.now().isoformat()
+        self.counts[status] += 1
+        if status == "failed":
+            logger.warning(f"Action {record['kind']} failed after {record['attempts']} attempts: {error}")
+        if self.on_result is not None:
+            try:
+                self.on_result(record)
+            except Exception as e:
+                logger.error(f"Action result callback failed: {e}")
+
+    async def shutdown(self, timeout: float = 5.0):
+        """Give running actions a moment to finish, then cancel the rest"""
+        if not self._tasks:
+            return
+        done, running = await asyncio.wait(set(self._tasks), timeout=timeout)
+        for task in running:
+            task.cancel()
+        if running:
+            await asyncio.gather(*running, return_exceptions=True)
+
+    # ---------- reads ----------
+
+    def recent(self, limit: int = 50, status: Optional[str] = None) -> List[Dict[str, Any]]:
+        found = []
+        for record in reversed(self.records.values()):
+            if status is None or record["status"] == status:
+                found.append(record)
+                if len(found) >= limit:
+                    break
+        return found
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self.counts,
+            "pending": self.pending,
+            "handlers": sorted(self.handlers),
+            "running": {kind: count for kind, count in self.running.items() if count}
+        }
@@ -0,0 +1,263 @@
+"""
+Bulk Import/Export - Compact dump format for the whole orchestrator state
+=========================================================================
+A dump is a short header followed by length-prefixed frames. Each frame
+holds one batch of nodes or edges stored column by column (all ids, then
+all types, ...), which compresses well because neighbouring values repeat.
+Frames are read one at a time and handed to GraphStore.bulk_load, so
+loading never needs the whole file in memory.
+
+    header: b"LOGD" | format version (1 byte) | flags (1 byte, bit 0 = zlib)
+    frame:  kind (1 byte: N/E/M) | payload length (uint32, big-endian) | payload
+"""
+
+import sys
+import json
+import zlib
+import struct
+import logging
+import argparse
+from datetime import datetime
+from typing import Dict, Any, List, Iterable, Iterator, Optional, BinaryIO, Tuple
+
+from life_orchestrator import ContextNode, ContextEdge, EntityType, RelationType, MemoryBank
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"LOGD"
+FORMAT_VERSION = 1
+FLAG_ZLIB = 0x01
+FRAME_HEADER = struct.Struct(">cI")
+BATCH_SIZE = 10000
+
+NODE_COLUMNS = ("id", "type", "status", "confidence", "created_at", "updated_at", "data")
+EDGE_COLUMNS = ("from", "to", "type", "strength", "created_at", "metadata")
+
+# ==================== Writer ====================
+
+class DumpWriter:
+    """Streams nodes, edges and memory into a dump file"""
+
+    def __init__(self, stream: BinaryIO, compress: bool = True, batch_size: int = BATCH_SIZE):
+        self.stream = stream
+        self.compress = compress
+        self.batch_size = batch_size
+        self.counts = {"nodes": 0, "edges": 0}
+        stream.write(MAGIC + bytes([FORMAT_VERSION, FLAG_ZLIB if compress else 0]))
+
+    def _frame(self, kind: bytes, payload: Dict[str, Any]):
+        raw = json.dumps(payload, ensure_ascii=False, separators=(",", ":"), default=str).encode("utf-8")
+        if self.compress:
+            raw = zlib.compress(raw, 6)
+        self.stream.write(FRAME_HEADER.pack(kind, len(raw)))
+        self.stream.write(raw)
+
+    def _batches(self, items: Iterable[Any]) -> Iterator[List[Any]]:
+        batch = []
+        for item in items:
+            batch.append(item)
+            if len(batch) >= self.batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def write_nodes(self, nodes: Iterable[ContextNode]):
+        for batch in self._batches(nodes):
+            self._frame(b"N", {
+                "id": [n.id for n in batch],
+                "type": [n.type.value for n in batch],
+                "status": [n.status for n in batch],
+                "confidence": [n.confidence for n in batch],
+                "created_at": [n.created_at.isoformat() for n in batch],
+                "updated_at": [n.updated_at.isoformat() for n in batch],
+                "data": [n.data for n in batch]
+            })
+            self.counts["nodes"] += len(batch)
+
+    def write_edges(self, edges: Iterable[ContextEdge]):
+        for batch in self._batches(edges):
+            self._frame(b"E", {
+                "from": [e.from_node for e in batch],
+                "to": [e.to_node for e in batch],
+                "type": [e.type.value for e in batch],
+                "strength": [e.strength for e in batch],
+                "created_at": [e.created_at.isoformat() for e in batch],
+                "metadata": [e.metadata for e in batch]
+            })
+            self.counts["edges"] += len(batch)
+
+    def write_memory(self, memory: MemoryBank):
+        self._frame(b"M", memory.to_dict())
+
+# ==================== Reader ====================
+
+class DumpReader:
+    """Reads a dump frame by frame.
+
+    Frames are written nodes first, then edges, then memory, so nodes() and
+    edges() can be passed straight to GraphStore.bulk_load as lazy iterables.
+    """
+
+    def __init__(self, stream: BinaryIO):
+        self.stream = stream
+        header = stream.read(len(MAGIC) + 2)
+        if len(header) < len(MAGIC) + 2 or header[:len(MAGIC)] != MAGIC:
+            raise ValueError("Not an orchestrator dump")
+        if header[len(MAGIC)] != FORMAT_VERSION:
+            raise ValueError(f"Unsupported dump version {header[len(MAGIC)]}")
+        self.compressed = bool(header[len(MAGIC) + 1] & FLAG_ZLIB)
+        self.memory: Optional[Dict[str, Any]] = None
+        self._pending: Optional[Tuple[bytes, Dict[str, Any]]] = None
+
+    def _next_frame(self) -> Optional[Tuple[bytes, Dict[str, Any]]]:
+        if self._pending is not None:
+            frame, self._pending = self._pending, None
+            return frame
+        head = self.stream.read(FRAME_HEADER.size)
+        if not head:
+            return None
+        if len(head) < FRAME_HEADER.size:
+            raise ValueError("Truncated dump: incomplete frame header")
+        kind, length = FRAME_HEADER.unpack(head)
+        raw = self.stream.read(length)
+        if len(raw) < length:
+            raise ValueError("Truncated dump: incomplete frame")
+        if self.compressed:
+            raw = zlib.decompress(raw)
+        return kind, json.loads(raw)
+
+    def _frames(self, wanted: bytes) -> Iterator[Dict[str, Any]]:
+        while True:
+            frame = self._next_frame()
+            if frame is None:
+                return
+            kind, payload = frame
+            if kind == b"M":
+                self.memory = payload
+                continue
+            if kind != wanted:
+                # Belongs to the next section; leave it for the next reader call
+                self._pending = frame
+                return
+            yield payload
+
+    def nodes(self) -> Iterator[ContextNode]:
+        for columns in self._frames(b"N"):
+            for node_id, type_, status, confidence, created, updated, data in zip(
+                    *(columns[c] for c in NODE_COLUMNS)):
+                yield ContextNode(
+                    id=node_id,
+                    type=EntityType(type_),
+                    data=data,
+                    status=status,
+                    confidence=confidence,
+                    created_at=datetime.fromisoformat(created),
+                    updated_at=datetime.fromisoformat(updated)
+                )
+
+    def edges(self) -> Iterator[ContextEdge]:
+        for columns in self._frames(b"E"):
+            for from_node, to_node, type_, strength, created, metadata in zip(
+                    *(columns[c] for c in EDGE_COLUMNS)):
+                yield ContextEdge(
+                    from_node=from_node,
+                    to_node=to_node,
+                    type=RelationType(type_),
+                    strength=strength,
+                    metadata=metadata,
+                    created_at=datetime.fromisoformat(created)
+                )
+
+    def read_memory(self) -> Optional[Dict[str, Any]]:
+        """Memory frame; any graph frames not yet consumed are skipped"""
+        while True:
+            frame = self._next_frame()
+            if frame is None:
+                return self.memory
+            if frame[0] == b"M":
+                self.memory = frame[1]
+
+# ==================== Orchestrator Helpers ====================
+
+def export_dump(orchestrator, path: str, compress: bool = True) -> Dict[str, int]:
+    """Write the graph and memory of an orchestrator to a dump file"""
+    with open(path, "wb") as f:
+        writer = DumpWriter(f, compress=compress)
+        writer.write_nodes(orchestrator.graph.iter_nodes())
+        writer.write_edges(orchestrator.graph.iter_edges())
+        writer.write_memory(orchestrator.memory)
+    logger.info(f"Exported {writer.counts['nodes']} nodes, {writer.counts['edges']} edges to {path}")
+    return writer.counts
+
+def import_dump(orchestrator, path: str, rebuild_indexes: bool = True) -> Dict[str, int]:
+    """Bulk-load a dump into an orchestrator.
+
+    Skip rebuild_indexes when the target is a persistent store that the server
+    will index on startup anyway; it dominates the cost of large imports.
+    The counts include how many memory entries the dump carried.
+    """
+    with open(path, "rb") as f:
+        reader = DumpReader(f)
+        before = (orchestrator.graph.node_count(), orchestrator.graph.edge_count())
+        orchestrator.graph.bulk_load(reader.nodes(), reader.edges())
+        memory = reader.read_memory()
+    if memory:
+        orchestrator.memory.load_dict(memory)
+    if rebuild_indexes:
+        orchestrator.rebuild_indexes()
+    counts = {
+        "nodes": orchestrator.graph.node_count() - before[0],
+        "edges": orchestrator.graph.edge_count() - before[1],
+        "memory": _memory_entries(memory)
+    }
+    logger.info(f"Imported {counts['nodes']} nodes, {counts['edges']} edges from {path}")
+    return counts
+
+def _memory_entries(memory: Optional[Dict[str, Any]]) -> int:
+    if not memory:
+        return 0
+    return sum(len(memory.get(name) or ()) for name in ("short_term", "long_term", "episodic", "patterns"))
+
+# ==================== CLI ====================
+
+def _open_orchestrator(args):
+    from life_orchestrator import LifeOrchestrator
+    if args.db:
+        from sqlite_store import SQLiteGraphStore
+        return LifeOrchestrator(graph=SQLiteGraphStore(args.db))
+    orchestrator = LifeOrchestrator()
+    # Imports into a state file merge with whatever it already holds
+    if not orchestrator.load_state(args.state) and args.command == "export":
+        raise SystemExit(f"State file not found: {args.state}")
+    return orchestrator
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Export or import orchestrator state as a compact dump")
+    parser.add_argument("command", choices=["export", "import"])
+    parser.add_argument("dump", help="Dump file to write (export) or read (import)")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--state", help="JSON state file written by save_state")
+    source.add_argument("--db", help="SQLite graph database")
+    parser.add_argument("--no-compress", action="store_true", help="Write frames without zlib")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    orchestrator = _open_orchestrator(args)
+    started = datetime.now()
+    if args.command == "export":
+        counts = export_dump(orchestrator, args.dump, compress=not args.no_compress)
+    else:
+        # A JSON state file carries the text index, so it must be rebuilt before saving
+        counts = import_dump(orchestrator, args.dump, rebuild_indexes=bool(args.state))
+        if args.state:
+            orchestrator.save_state(args.state)
+        elif counts["memory"]:
+            # The graph database has no memory table; only a state file keeps the memory frame
+            logger.warning(f"Dropped {counts['memory']} memory entries: --db stores the graph only, "
+                           f"import into a --state file to keep them")
+    elapsed = (datetime.now() - started).total_seconds()
+    print(f"{args.command}: {counts['nodes']} nodes, {counts['edges']} edges in {elapsed:.1f}s")
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,169 @@
+"""
+Graph Centrality - Incremental PageRank-style importance over the context graph
+===============================================================================
+Scores are maintained with the residual "push" formulation of PageRank: each
+node holds an estimate and a residual of rank not yet passed on. Graph events
+only adjust the residuals around the touched nodes, and a refresh pushes the
+residuals above a tolerance until none are left, so after a batch of
+mutations the work done is proportional to the part of the graph whose
+scores actually moved, not to the whole graph.
+
+Rank of dangling nodes is dropped rather than spread over every node and the
+estimates are normalized on read, which yields the same ranking as the
+textbook formulation. Importance flows toward what other items depend on: a
+blocked task passes rank to its blocker, a requiring task to its
+requirement; symmetric relations pass it both ways.
+"""
+
+import time
+import logging
+from typing import Dict, Any, List, Set
+
+logger = logging.getLogger(__name__)
+
+# How rank flows along each relation type (by RelationType value)
+FORWARD = frozenset({"requires", "depends_on"})
+REVERSE = frozenset({"blocks", "enables", "influences"})
+
+class CentralityIndex:
+    """Fed by the orchestrator's graph listener, like the task clusterer"""
+
+    def __init__(self, damping: float = 0.85, tolerance: float = 1e-4):
+        self.damping = damping
+        # Largest residual left unpushed; the relative error of a score is at most tolerance / (1 - damping)
+        self.tolerance = tolerance
+        self.stats: Dict[str, Any] = {"refreshes": 0, "pushes": 0, "seconds": 0.0}
+        self.clear()
+
+    def __len__(self):
+        return len(self.estimate)
+
+    def clear(self):
+        self.out: Dict[str, Dict[str, float]] = {}
+        self.out_weight: Dict[str, float] = {}
+        self.inbound: Dict[str, Set[str]] = {}
+        self.estimate: Dict[str, float] = {}
+        self.residual: Dict[str, float] = {}
+        self.total = 0.0
+        self._pending: Set[str] = set()
+
+    # ---------- updates ----------
+
+    def _bump(self, node_id: str, amount: float):
+        value = self.residual[node_id] + amount
+        self.residual[node_id] = value
+        if abs(value) > self.tolerance:
+            self._pending.add(node_id)
+
+    def add_node(self, node_id: str):
+        if node_id not in self.estimate:
+            self.estimate[node_id] = 0.0
+            self.residual[node_id] = 0.0
+            self._bump(node_id, 1 - self.damping)
+
+    def add_edge(self, from_id: str, to_id: str, relation: str, strength: float = 1.0):
+        if strength <= 0 or from_id == to_id:
+            return
+        self.add_node(from_id)
+        self.add_node(to_id)
+        if relation in FORWARD:
+            self._link(from_id, to_id, strength)
+        elif relation in REVERSE:
+            self._link(to_id, from_id, strength)
+        else:
+            self._link(from_id, to_id, strength)
+            self._link(to_id, from_id, strength)
+
+    def _reshare(self, node_id: str, old_weight: float, new_weight: float):
+        """Residual correction when a node's outgoing weight changes but its existing links do not"""
+        rank = self.estimate[node_id]
+        if rank and old_weight and new_weight:
+            factor = self.damping * rank * (1 / new_weight - 1 / old_weight)
+            for other, weight in self.out[node_id].items():
+                self._bump(other, factor * weight)
+
+    def _link(self, a: str, b: str, weight: float):
+        old = self.out_weight.get(a, 0.0)
+        new = old + weight
+        links = self.out.setdefault(a, {})
+        self._reshare(a, old, new)
+        links[b] = links.get(b, 0.0) + weight
+        self.out_weight[a] = new
+        self.inbound.setdefault(b, set()).add(a)
+        if self.estimate[a]:
+            self._bump(b, self.damping * self.estimate[a] * weight / new)
+
+    def remove_node(self, node_id: str):
+        if node_id not in self.estimate:
+            return
+        # What this node passed on disappears from its targets
+        rank = self.estimate.pop(node_id)
+        del self.residual[node_id]
+        self._pending.discard(node_id)
+        self.total -= rank
+        links = self.out.pop(node_id, {})
+        weight = self.out_weight.pop(node_id, 0.0)
+        for other, w in links.items():
+            self.inbound[other].discard(node_id)
+            if rank:
+                self._bump(other, -self.damping * rank * w / weight)
+
+        # Nodes linking here now share their rank among fewer targets
+        for source in self.inbound.pop(node_id, ()):
+            source_links = self.out[source]
+            old = self.out_weight[source]
+            new = old - source_links.pop(node_id)
+            if source_links:
+                self.out_weight[source] = new
+                self._reshare(source, old, new)
+            else:
+                del self.out[source], self.out_weight[source]
+
+    # ---------- scoring ----------
+
+    def refresh(self) -> int:
+        """Push pending residuals until every one is within tolerance; returns the number of pushes"""
+        pending = self._pending
+        if not pending:
+            return 0
+        started = time.perf_counter()
+        estimate, residual, out, out_weight = self.estimate, self.residual, self.out, self.out_weight
+        tolerance, damping = self.tolerance, self.damping
+        pushes = 0
+        while pending:
+            node_id = pending.pop()
+            amount = residual[node_id]
+            if abs(amount) <= tolerance:
+                continue
+            residual[node_id] = 0.0
+            estimate[node_id] += amount
+            self.total += amount
+            pushes += 1
+            weight = out_weight.get(node_id)
+            if weight:
+                share = damping * amount / weight
+                for other, w in out[node_id].items():
+                    value = residual[other] + share * w
+                    residual[other] = value
+                    if abs(value) > tolerance:
+                        pending.add(other)
+
+        elapsed = time.perf_counter() - started
+        self.stats["refreshes"] += 1
+        self.stats["pushes"] = pushes
+        self.stats["seconds"] = round(elapsed, 4)
+        logger.debug(f"Centrality refreshed over {len(estimate)} nodes: {pushes} pushes in {elapsed:.3f}s")
+        return pushes
+
+    def score(self, node_id: str) -> float:
+        """Rank relative to the average node: 1.0 is typical, higher means more depended upon"""
+        self.refresh()
+        rank = self.estimate.get(node_id)
+        if rank is None or self.total <= 0:
+            return 1.0
+        return rank * len(self.estimate) / self.total
+
+    def top(self, limit: int = 10) -> List[Dict[str, Any]]:
+        self.refresh()
+        best = sorted(self.estimate, key=self.estimate.__getitem__, reverse=True)[:limit]
+        return [{"node_id": node_id, "score": round(self.score(node_id), 4)} for node_id in best]
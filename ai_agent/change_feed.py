@@ -0,0 +1,175 @@
+"""
+Change Feed - Coalesced live deltas for dashboard subscribers
+=============================================================
+Graph mutations, urgency transitions and rule firings are buffered and
+flushed once per tick as a single delta. Each delta is serialized once and
+shared by every subscriber, and recommendations are recomputed at most once
+per tick, so many open dashboards cost one change feed rather than many
+full analyses.
+Slow subscribers have bounded queues; on overflow their backlog is dropped
+and they are told to resync.
+"""
+
+import json
+import asyncio
+import logging
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Callable, Set, FrozenSet
+
+logger = logging.getLogger(__name__)
+
+TOPICS = frozenset({"nodes", "edges", "urgency", "rules", "recommendations"})
+
+class Subscriber:
+    """One live connection; holds serialized messages until they are sent"""
+
+    def __init__(self, topics: FrozenSet[str], max_queue: int):
+        self.topics = topics
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self.dropped = 0
+
+    def offer(self, message: str, resync: str):
+        if self.queue.full():
+            # Backpressure: stale deltas are useless to a client this far behind
+            self.dropped += self.queue.qsize()
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(resync)
+            return
+        self.queue.put_nowait(message)
+
+    async def next(self) -> str:
+        return await self.queue.get()
+
+class ChangeFeed:
+    def __init__(self, tick_seconds: float = 0.25, max_queue: int = 64, max_items: int = 500,
+                 recommender: Optional[Callable[[], List[Dict[str, Any]]]] = None):
+        self.tick_seconds = tick_seconds
+        self.max_queue = max_queue
+        self.max_items = max_items
+        self.recommender = recommender
+        self.subscribers: Set[Subscriber] = set()
+        self.sequence = 0
+        self._last_recommendations: Optional[List[Dict[str, Any]]] = None
+        self._reset()
+
+    def _reset(self):
+        self._nodes: Dict[str, Any] = {}
+        self._removed: Set[str] = set()
+        self._edges: List[Any] = []
+        self._urgency: Dict[str, Dict[str, Any]] = {}
+        self._rules: List[Dict[str, Any]] = []
+        self._overflow = False
+
+    @property
+    def has_pending(self) -> bool:
+        return bool(self._nodes or self._removed or self._edges or self._urgency or self._rules or self._overflow)
+
+    # ---------- producers ----------
+
+    def on_graph_event(self, event: str, payload: Any):
+        """ContextGraph listener"""
+        if not self.subscribers:
+            return
+        if event in ("node_added", "node_updated"):
+            # Several updates to one node in a tick collapse to its latest version
+            self._nodes[payload.id] = payload
+            self._removed.discard(payload.id)
+        elif event == "node_removed":
+            self._nodes.pop(payload.id, None)
+            self._removed.add(payload.id)
+        elif event == "edge_added":
+            if len(self._edges) < self.max_items:
+                self._edges.append(payload)
+            else:
+                self._overflow = True
+        elif event == "bulk_loaded":
+            # Too much to stream; subscribers see truncated and refetch
+            self._overflow = True
+
+    def on_urgency_change(self, transition: Dict[str, Any]):
+        if self.subscribers:
+            self._urgency[transition["item_id"]] = transition
+
+    def on_rule_fired(self, activation: Dict[str, Any]):
+        if self.subscribers and len(self._rules) < self.max_items:
+            self._rules.append(activation)
+
+    # ---------- subscribers ----------
+
+    def subscribe(self, topics: Optional[List[str]] = None) -> Subscriber:
+        wanted = frozenset(topics) & TOPICS if topics else TOPICS
+        subscriber = Subscriber(wanted or TOPICS, self.max_queue)
+        self.subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber):
+        self.subscribers.discard(subscriber)
+
+    # ---------- flushing ----------
+
+    def flush(self) -> Optional[Dict[str, Any]]:
+        """Build one delta from everything buffered since the last tick and fan it out"""
+        if not self.has_pending or not self.subscribers:
+            self._reset()
+            return None
+
+        self.sequence += 1
+        nodes = list(self._nodes.values())
+        delta: Dict[str, Any] = {
+            "type": "delta",
+            "seq": self.sequence,
+            "timestamp": datetime.now().isoformat(),
+            "nodes": [n.to_dict() for n in nodes[:self.max_items]],
+            "removed": sorted(self._removed),
+            "edges": [e.to_dict() for e in self._edges],
+            "urgency": list(self._urgency.values()),
+            "rules": self._rules,
+            "truncated": self._overflow or len(nodes) > self.max_items
+        }
+        self._reset()
+
+        if self.recommender is not None and any("recommendations" in s.topics for s in self.subscribers):
+            recommendations = self.recommender()
+            if recommendations != self._last_recommendations:
+                self._last_recommendations = recommendations
+                delta["recommendations"] = recommendations
+
+        resync = json.dumps({"type": "resync", "seq": self.sequence})
+        serialized: Dict[FrozenSet[str], Optional[str]] = {}
+        for subscriber in list(self.subscribers):
+            if subscriber.topics not in serialized:
+                filtered = self._filter(delta, subscriber.topics)
+                serialized[subscriber.topics] = (
+                    json.dumps(filtered, ensure_ascii=False, default=str) if filtered else None
+                )
+            message = serialized[subscriber.topics]
+            if message is not None:
+                subscriber.offer(message, resync)
+        return delta
+
+    @staticmethod
+    def _filter(delta: Dict[str, Any], topics: FrozenSet[str]) -> Optional[Dict[str, Any]]:
+        """The part of a delta a subscriber asked for, or None when none of it applies"""
+        fields = {
+            "nodes": ("nodes", "removed"),
+            "edges": ("edges",),
+            "urgency": ("urgency",),
+            "rules": ("rules",),
+            "recommendations": ("recommendations",)
+        }
+        filtered = {k: delta[k] for k in ("type", "seq", "timestamp", "truncated")}
+        for topic in topics:
+            for key in fields[topic]:
+                if delta.get(key):
+                    filtered[key] = delta[key]
+        return filtered if len(filtered) > 4 else None
+
+    async def run(self):
+        logger.info(f"Change feed started, tick {self.tick_seconds}s")
+        while True:
+            await asyncio.sleep(self.tick_seconds)
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Change feed flush failed: {e}")
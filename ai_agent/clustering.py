@@ -0,0 +1,234 @@
+"""
+Task Clustering - Incremental grouping of tasks that could be handled together
+==============================================================================
+Each open task is filed under a few bucket keys: its client within a
+deadline window, each task that blocks it, and MinHash LSH bands of its
+text. Tasks sharing a key are merged with union-find, with LSH candidates
+confirmed by estimated Jaccard similarity first, so adding a task costs
+roughly its number of keys. Updates and removals cannot split a union-find
+set; they mark it dirty and it is rebuilt from the buckets on the next read.
+"""
+
+import zlib
+import random
+import operator
+import itertools
+from datetime import datetime
+from typing import Dict, Any, List, Set, Tuple, Optional
+
+from text_index import tokenize
+
+MERSENNE_PRIME = (1 << 61) - 1
+TOKEN_CACHE_SIZE = 50000
+
+Key = Tuple[Any, ...]
+
+SIGNAL_LABELS = {
+    "client": "same client and deadline window",
+    "blocker": "shared dependency",
+    "lsh": "similar description"
+}
+
+class TaskClusterer:
+    """Fed by the orchestrator's graph listener, like the deadline scheduler"""
+
+    DONE_STATUSES = frozenset({"done", "completed", "cancelled"})
+
+    def __init__(self, deadline_window_days: int = 3, num_perm: int = 32, bands: int = 16,
+                 text_threshold: float = 0.5, max_candidates: int = 20):
+        self.deadline_window_days = deadline_window_days
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.text_threshold = text_threshold
+        self.max_candidates = max_candidates
+        rng = random.Random(7)
+        self._perms = [(rng.randrange(1, MERSENNE_PRIME), rng.randrange(0, MERSENNE_PRIME)) for _ in range(num_perm)]
+        self._token_cache: Dict[str, Tuple[int, ...]] = {}
+        self.clear()
+
+    def __len__(self):
+        return len(self.keys)
+
+    def clear(self):
+        self.keys: Dict[str, Set[Key]] = {}
+        self.buckets: Dict[Key, Set[str]] = {}
+        self.signatures: Dict[str, Tuple[int, ...]] = {}
+        self.similar: Dict[str, Set[str]] = {}
+        self.blockers: Dict[str, Set[str]] = {}
+        # blocker -> tasks waiting on it, so a removed blocker leaves their dependencies
+        self.waiting: Dict[str, Set[str]] = {}
+        self._parent: Dict[str, str] = {}
+        self._signals: Dict[str, Set[str]] = {}
+        self._dirty = False
+
+    # ---------- updates ----------
+
+    def update(self, task_id: str, text: str, client: Optional[str] = None,
+               deadline: Optional[datetime] = None, status: str = "active"):
+        """Add or re-file a task; closed tasks drop out of every cluster"""
+        if task_id in self.keys:
+            self._unindex(task_id)
+        if status in self.DONE_STATUSES:
+            return
+
+        signature = self._minhash(text) if text else None
+        if signature:
+            self.signatures[task_id] = signature
+        self.keys[task_id] = set()
+        self._parent.setdefault(task_id, task_id)
+
+        if client and deadline:
+            # Two staggered windows, so deadlines a day apart never fall on opposite sides of a boundary
+            day, size = deadline.toordinal(), self.deadline_window_days
+            self._add_key(task_id, ("client", client, day // size))
+            self._add_key(task_id, ("client", client, "staggered", (day + size // 2) // size))
+        elif client:
+            self._add_key(task_id, ("client", client, None))
+        for blocker in self.blockers.get(task_id, ()):
+            self._add_key(task_id, ("blocker", blocker))
+        if signature:
+            self._add_similar(task_id, signature)
+
+    def add_dependency(self, task_id: str, blocker_id: str):
+        """task_id waits on blocker_id; tasks waiting on the same blocker cluster together"""
+        self.blockers.setdefault(task_id, set()).add(blocker_id)
+        self.waiting.setdefault(blocker_id, set()).add(task_id)
+        if task_id in self.keys:
+            self._add_key(task_id, ("blocker", blocker_id))
+
+    def remove(self, node_id: str):
+        self._unindex(node_id)
+        for blocker in self.blockers.pop(node_id, ()):
+            self.waiting[blocker].discard(node_id)
+            if not self.waiting[blocker]:
+                del self.waiting[blocker]
+        # Tasks that waited on it no longer do, now or when they are next re-filed
+        key = ("blocker", node_id)
+        for task_id in self.waiting.pop(node_id, ()):
+            blockers = self.blockers.get(task_id)
+            if blockers is not None:
+                blockers.discard(node_id)
+                if not blockers:
+                    del self.blockers[task_id]
+            self.keys.get(task_id, set()).discard(key)
+        if self.buckets.pop(key, None):
+            self._dirty = True
+
+    # ---------- indexing ----------
+
+    def _token_hashes(self, token: str) -> Tuple[int, ...]:
+        cached = self._token_cache.get(token)
+        if cached is None:
+            h = zlib.crc32(token.encode("utf-8"))
+            cached = tuple((a * h + b) % MERSENNE_PRIME for a, b in self._perms)
+            if len(self._token_cache) >= TOKEN_CACHE_SIZE:
+                self._token_cache.clear()
+            self._token_cache[token] = cached
+        return cached
+
+    def _minhash(self, text: str) -> Optional[Tuple[int, ...]]:
+        tokens = set(tokenize(text))
+        if len(tokens) < 2:
+            # One-word texts collide with everything that shares the word
+            return None
+        # Vocabulary repeats across tasks, so per-token permutations are computed once
+        return tuple(map(min, zip(*map(self._token_hashes, tokens))))
+
+    def _add_key(self, task_id: str, key: Key):
+        if key in self.keys[task_id]:
+            return
+        self.keys[task_id].add(key)
+        members = self.buckets.setdefault(key, set())
+        if members:
+            # Every member is already in one set, so one union covers the bucket
+            self._union(task_id, next(iter(members)), key[0])
+        members.add(task_id)
+
+    def _add_similar(self, task_id: str, signature: Tuple[int, ...]):
+        """File LSH band keys; band collisions are only candidates and are confirmed before merging"""
+        candidates: Set[str] = set()
+        for band in range(self.bands):
+            key = ("lsh", band, hash(signature[band * self.rows:(band + 1) * self.rows]))
+            members = self.buckets.setdefault(key, set())
+            candidates.update(itertools.islice(members, self.max_candidates))
+            members.add(task_id)
+            self.keys[task_id].add(key)
+        
+        for other in candidates:
+            if self._similarity(signature, self.signatures[other]) >= self.text_threshold:
+                self.similar.setdefault(task_id, set()).add(other)
+                self.similar.setdefault(other, set()).add(task_id)
+                self._union(task_id, other, "lsh")
+
+    def _unindex(self, task_id: str):
+        keys = self.keys.pop(task_id, None)
+        if keys is None:
+            return
+        for key in keys:
+            members = self.buckets.get(key)
+            if members is not None:
+                members.discard(task_id)
+                if not members:
+                    del self.buckets[key]
+        for other in self.similar.pop(task_id, ()):
+            self.similar.get(other, set()).discard(task_id)
+        self.signatures.pop(task_id, None)
+        self._dirty = True
+
+    def _similarity(self, a: Tuple[int, ...], b: Tuple[int, ...]) -> float:
+        """MinHash estimate of Jaccard similarity"""
+        return sum(map(operator.eq, a, b)) / self.num_perm
+
+    # ---------- union-find ----------
+
+    def _find(self, task_id: str) -> str:
+        parent = self._parent
+        while parent[task_id] != task_id:
+            parent[task_id] = parent[parent[task_id]]
+            task_id = parent[task_id]
+        return task_id
+
+    def _union(self, a: str, b: str, signal: str):
+        root_a, root_b = self._find(a), self._find(b)
+        if root_a != root_b:
+            self._parent[root_b] = root_a
+            signals = self._signals.pop(root_b, set())
+            self._signals.setdefault(root_a, set()).update(signals)
+        self._signals.setdefault(root_a, set()).add(signal)
+
+    def _regroup(self):
+        """Recompute sets from the buckets after removals or updates"""
+        self._parent = {task_id: task_id for task_id in self.keys}
+        self._signals = {}
+        for key, members in self.buckets.items():
+            if key[0] == "lsh" or len(members) < 2:
+                continue
+            first, *rest = members
+            for other in rest:
+                self._union(first, other, key[0])
+        for task_id, others in self.similar.items():
+            for other in others:
+                self._union(task_id, other, "lsh")
+        self._dirty = False
+
+    # ---------- reads ----------
+
+    def clusters(self, min_size: int = 2) -> List[Dict[str, Any]]:
+        """Groups of open tasks, largest first, with the signals that joined them"""
+        if self._dirty:
+            self._regroup()
+
+        groups: Dict[str, List[str]] = {}
+        for task_id in self.keys:
+            groups.setdefault(self._find(task_id), []).append(task_id)
+
+        result = [
+            {
+                "task_ids": sorted(members),
+                "signals": sorted(SIGNAL_LABELS[s] for s in self._signals.get(root, ()))
+            }
+            for root, members in groups.items() if len(members) >= min_size
+        ]
+        result.sort(key=lambda c: (-len(c["task_ids"]), c["task_ids"][0]))
+        return result
@@ -0,0 +1,248 @@
+"""
+Critical Path - Earliest/latest start times and slack over task dependencies
+============================================================================
+Open tasks and the BLOCKS edges between them form a dependency network.
+Earliest starts are offsets of work from "now" (the longest chain of
+blocker durations), latest finishes are absolute times derived from
+deadlines downstream, so neither goes stale as the clock moves; slack is
+their difference, taken at read time. A change only re-evaluates the
+descendants (earliest starts) and ancestors (latest finishes) of the tasks
+it touched, each once, in topological order.
+
+Tasks on a dependency cycle, and those downstream of one, have no schedule:
+they are left out of critical() and info()/slack() return None for them.
+"""
+
+import math
+import logging
+from datetime import datetime
+from typing import Dict, Any, List, Set, Optional, Iterable, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TASK_HOURS = 1.0
+
+def task_duration(data: Dict[str, Any]) -> float:
+    """Estimated hours of work for a task payload, DEFAULT_TASK_HOURS when none is given"""
+    for key, scale in (("estimated_hours", 1.0), ("duration_hours", 1.0), ("estimated_minutes", 1 / 60)):
+        value = data.get(key)
+        if value is not None:
+            try:
+                return max(0.0, float(value) * scale)
+            except (TypeError, ValueError):
+                pass
+    return DEFAULT_TASK_HOURS
+
+class CriticalPathScheduler:
+    """Fed by the orchestrator's graph listener, like the task clusterer"""
+
+    DONE_STATUSES = frozenset({"done", "completed", "cancelled"})
+
+    def __init__(self):
+        self.clear()
+
+    def __len__(self):
+        return len(self.duration)
+
+    def clear(self):
+        # Only open tasks are tracked; edges are kept for every id so reopening a task restores its links
+        self.duration: Dict[str, float] = {}
+        self.deadline: Dict[str, float] = {}
+        self.blockers: Dict[str, Set[str]] = {}
+        self.blocked: Dict[str, Set[str]] = {}
+        self.earliest: Dict[str, float] = {}
+        self.latest_finish: Dict[str, float] = {}
+        self._dirty_forward: Set[str] = set()
+        self._dirty_backward: Set[str] = set()
+
+    # ---------- updates ----------
+
+    def update(self, task_id: str, hours: float, deadline: Optional[datetime] = None, status: str = "active"):
+        if status in self.DONE_STATUSES:
+            self.remove(task_id, keep_edges=True)
+            return
+        seconds = hours * 3600
+        due = deadline.timestamp() if deadline else None
+        if self.duration.get(task_id) == seconds and self.deadline.get(task_id) == due:
+            return
+        self.duration[task_id] = seconds
+        if due is None:
+            self.deadline.pop(task_id, None)
+        else:
+            self.deadline[task_id] = due
+        self._touch(task_id)
+
+    def add_dependency(self, task_id: str, blocker_id: str):
+        """task_id cannot start before blocker_id finishes"""
+        if task_id == blocker_id:
+            return
+        self.blockers.setdefault(task_id, set()).add(blocker_id)
+        self.blocked.setdefault(blocker_id, set()).add(task_id)
+        self._dirty_forward.add(task_id)
+        self._dirty_backward.add(blocker_id)
+
+    def remove(self, node_id: str, keep_edges: bool = False):
+        if node_id in self.duration:
+            del self.duration[node_id]
+            self.deadline.pop(node_id, None)
+            self.earliest.pop(node_id, None)
+            self.latest_finish.pop(node_id, None)
+            # Neighbours lose a constraint
+            self._dirty_forward.update(self.blocked.get(node_id, ()))
+            self._dirty_backward.update(self.blockers.get(node_id, ()))
+        if not keep_edges:
+            for other in self.blockers.pop(node_id, ()):
+                self.blocked.get(other, set()).discard(node_id)
+            for other in self.blocked.pop(node_id, ()):
+                self.blockers.get(other, set()).discard(node_id)
+
+    def _touch(self, task_id: str):
+        self._dirty_forward.add(task_id)
+        self._dirty_backward.add(task_id)
+
+    # ---------- propagation ----------
+
+    def _ordered(self, seeds: Iterable[str], step: Dict[str, Set[str]],
+                 back: Dict[str, Set[str]]) -> Tuple[List[str], Set[str]]:
+        """Tracked nodes reachable from seeds along `step` in topological order (Kahn's algorithm),
+        and those a cycle keeps out of the order"""
+        reached = set()
+        stack = [s for s in seeds if s in self.duration]
+        while stack:
+            node = stack.pop()
+            if node in reached:
+                continue
+            reached.add(node)
+            stack.extend(n for n in step.get(node, ()) if n in self.duration and n not in reached)
+
+        indegree = {node: sum(1 for p in back.get(node, ()) if p in reached) for node in reached}
+        queue = [node for node, degree in indegree.items() if degree == 0]
+        order = []
+        while queue:
+            node = queue.pop()
+            order.append(node)
+            for n in step.get(node, ()):
+                if n in indegree:
+                    indegree[n] -= 1
+                    if indegree[n] == 0:
+                        queue.append(n)
+        stuck = reached.difference(order)
+        if stuck:
+            logger.warning(f"Dependency cycle holds up {len(stuck)} tasks; they have no schedule until it is broken")
+        return order, stuck
+
+    def refresh(self):
+        """Re-evaluate only what the changes since the last refresh can have moved"""
+        if self._dirty_forward:
+            duration, earliest = self.duration, self.earliest
+            order, stuck = self._ordered(self._dirty_forward, self.blocked, self.blockers)
+            for node in stuck:
+                earliest.pop(node, None)
+            for node in order:
+                earliest[node] = max(
+                    (earliest[b] + duration[b] for b in self.blockers.get(node, ()) if b in earliest),
+                    default=0.0
+                )
+            self._dirty_forward = set()
+
+        if self._dirty_backward:
+            duration, latest = self.duration, self.latest_finish
+            order, stuck = self._ordered(self._dirty_backward, self.blockers, self.blocked)
+            for node in stuck:
+                latest.pop(node, None)
+            for node in order:
+                latest[node] = min(
+                    (latest[t] - duration[t] for t in self.blocked.get(node, ()) if t in latest),
+                    default=math.inf
+                )
+                if node in self.deadline:
+                    latest[node] = min(latest[node], self.deadline[node])
+            self._dirty_backward = set()
+
+    # ---------- reads ----------
+
+    def _scheduled(self, task_id: str) -> bool:
+        return task_id in self.earliest and task_id in self.latest_finish
+
+    def info(self, task_id: str, now: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """Schedule of one open task; slack_hours is None when nothing downstream has a deadline.
+        None for untracked tasks and tasks held up by a dependency cycle."""
+        self.refresh()
+        if not self._scheduled(task_id):
+            return None
+        now = now if now is not None else datetime.now().timestamp()
+        earliest = now + self.earliest[task_id]
+        latest = self.latest_finish[task_id] - self.duration[task_id]
+        slack = None if math.isinf(latest) else (latest - earliest) / 3600
+        return {
+            "task_id": task_id,
+            "duration_hours": self.duration[task_id] / 3600,
+            "earliest_start": datetime.fromtimestamp(earliest).isoformat(),
+            "latest_start": None if math.isinf(latest) else datetime.fromtimestamp(latest).isoformat(),
+            "slack_hours": None if slack is None else round(slack, 2),
+            "critical": slack is not None and slack <= 0,
+            # No open blocker: can be started right away
+            "startable": self.earliest[task_id] == 0
+        }
+
+    def slack(self, task_id: str, now: Optional[float] = None) -> Optional[float]:
+        """Hours of slack without building the full info; None when untracked, unconstrained or on a cycle"""
+        self.refresh()
+        if not self._scheduled(task_id):
+            return None
+        latest = self.latest_finish[task_id] - self.duration[task_id]
+        if math.isinf(latest):
+            return None
+        now = now if now is not None else datetime.now().timestamp()
+        return (latest - now - self.earliest[task_id]) / 3600
+
+    def would_cycle(self, task_id: str, blocker_id: str) -> bool:
+        """Whether making task_id wait for blocker_id would close a dependency cycle"""
+        if task_id == blocker_id:
+            return True
+        seen, stack = {task_id}, [task_id]
+        while stack:
+            for other in self.blocked.get(stack.pop(), ()):
+                if other == blocker_id:
+                    return True
+                if other not in seen:
+                    seen.add(other)
+                    stack.append(other)
+        return False
+
+    def open_blockers(self, task_id: str) -> List[str]:
+        return [b for b in self.blockers.get(task_id, ()) if b in self.duration]
+
+    def critical(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """Tasks with no slack left, least slack first"""
+        self.refresh()
+        now = datetime.now().timestamp()
+        duration, earliest, latest = self.duration, self.earliest, self.latest_finish
+
+        def slack_of(task_id: str) -> float:
+            return latest[task_id] - duration[task_id] - now - earliest[task_id]
+
+        # Ties (a whole chain shares its slack) put the end of the chain first, so critical_path() walks all of it
+        tight = sorted(
+            (t for t in duration if self._scheduled(t) and slack_of(t) <= 0),
+            key=lambda t: (round(slack_of(t) / 60), -earliest[t])
+        )
+        return [self.info(t, now) for t in tight[:limit]]
+
+    def critical_path(self) -> List[Dict[str, Any]]:
+        """Chain of driving blockers leading to the task with the least slack"""
+        tight = self.critical(limit=1)
+        if not tight:
+            return []
+        now = datetime.now().timestamp()
+        path = [tight[0]["task_id"]]
+        while True:
+            node = path[-1]
+            driving = [
+                b for b in self.blockers.get(node, ())
+                if b in self.earliest and self.earliest[b] + self.duration[b] == self.earliest[node]
+            ]
+            if not driving or driving[0] in path:
+                break
+            path.append(driving[0])
+        return [self.info(t, now) for t in reversed(path)]
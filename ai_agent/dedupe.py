@@ -0,0 +1,78 @@
+"""
+Ingest Deduplication - Content hashing with a Bloom filter in front of an exact store
+=====================================================================================
+Every ingested payload gets a content key (a hash of its canonical JSON).
+A Bloom filter answers "definitely new" in O(1) without touching the exact
+store; only possible repeats are confirmed against a bounded LRU map of
+key -> node id, so retry storms are skipped cheaply and memory stays flat.
+"""
+
+import json
+import math
+import hashlib
+from collections import OrderedDict
+from typing import Dict, Any, Optional
+
+def content_key(kind: str, payload: Dict[str, Any]) -> str:
+    """Stable hash of a payload; key order and whitespace in the JSON do not matter"""
+    canonical = json.dumps(payload, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str)
+    return hashlib.sha256(f"{kind}\n{canonical}".encode("utf-8")).hexdigest()
+
+class BloomFilter:
+    """Fixed-size Bloom filter using double hashing over one blake2b digest"""
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        self.capacity = capacity
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, key: str):
+        for position in self._positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        return all(self.bits[p >> 3] & (1 << (p & 7)) for p in self._positions(key))
+
+class SeenSet:
+    """Bounded record of ingested content keys and the node each one produced"""
+
+    def __init__(self, capacity: int = 100000, error_rate: float = 0.001):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.exact: "OrderedDict[str, str]" = OrderedDict()
+        self.bloom = BloomFilter(capacity, error_rate)
+        self.hits = 0
+
+    def __len__(self):
+        return len(self.exact)
+
+    def get(self, key: str) -> Optional[str]:
+        """Node id recorded for a key, or None when the payload has not been seen"""
+        if key not in self.bloom:
+            return None
+        node_id = self.exact.get(key)
+        if node_id is not None:
+            self.exact.move_to_end(key)
+            self.hits += 1
+        return node_id
+
+    def add(self, key: str, node_id: str):
+        self.exact[key] = node_id
+        self.exact.move_to_end(key)
+        if len(self.exact) > self.capacity:
+            self.exact.popitem(last=False)
+        self.bloom.add(key)
+        if self.bloom.count > 2 * self.capacity:
+            # Evicted keys still set bits; rebuild so the false-positive rate stays near target
+            self.bloom = BloomFilter(self.capacity, self.error_rate)
+            for existing in self.exact:
+                self.bloom.add(existing)
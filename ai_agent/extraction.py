@@ -0,0 +1,222 @@
+"""
+Entity Extraction - Single-pass extraction of dates, amounts and people
+=======================================================================
+Patterns are compiled once at import. Known names (clients, people already
+in the graph) are matched with an Aho-Corasick automaton so the cost per
+email does not grow with the size of the dictionary. Names learned since the
+last full build sit in a small second automaton, so a relationship pass that
+adds a few names rebuilds only those, not the whole dictionary.
+
+Generic words ("until", "due", "עד") count as deadline wording only right
+before a date; explicit phrases ("deadline", "מועד אחרון") count anywhere.
+"""
+
+import re
+from collections import deque
+from datetime import datetime
+from typing import Dict, Any, List, Tuple, Optional, Iterable
+
+# ==================== Compiled Patterns ====================
+
+# One alternation so a single scan finds every structured entity
+ENTITY_PATTERN = re.compile(
+    r"(?P<iso>\b(?P<iy>\d{4})-(?P<im>\d{1,2})-(?P<id>\d{1,2})(?:[T ](?P<ih>\d{1,2}):(?P<imin>\d{2}))?)"
+    r"|(?P<dmy>\b(?P<dd>\d{1,2})[./](?P<dm>\d{1,2})[./](?P<dy>\d{4}|\d{2})\b)"
+    r"|(?P<email>[\w.+-]+@[\w-]+(?:\.[\w-]+)+)"
+    r"|(?:(?P<cur1>₪|\$|€|\bNIS\b|\bILS\b|\bUSD\b|\bEUR\b)\s?(?P<amt1>\d[\d,]*(?:\.\d+)?))"
+    r"|(?:(?P<amt2>\d[\d,]*(?:\.\d+)?)\s?(?P<cur2>₪|ש\"ח|ש״ח|שקלים|שקל|\bNIS\b|\bILS\b|\bUSD\b|\bEUR\b|\$|€))",
+    re.IGNORECASE
+)
+
+DEADLINE_KEYWORDS = re.compile(
+    r"\b(?:deadline|due date|no later than|תאריך אחרון|מועד אחרון|לתשלום|יש להגיש)\b",
+    re.IGNORECASE
+)
+
+# Words that only mean a deadline when a date follows: "due 5.3.2030", "until 2030-03-05", "עד ה-5.3.30"
+DATE_LEAD = re.compile(
+    r"\b(?:due(?:\s+(?:on|by))?|until|עד(?:\s+(?:יום|לתאריך|ל|ה))?)[\s:-]*$",
+    re.IGNORECASE
+)
+DATE_LEAD_WINDOW = 24
+
+CURRENCIES = {
+    "₪": "ILS", "ש\"ח": "ILS", "ש״ח": "ILS", "שקלים": "ILS", "שקל": "ILS",
+    "nis": "ILS", "ils": "ILS", "$": "USD", "usd": "USD", "€": "EUR", "eur": "EUR"
+}
+
+# ==================== Aho-Corasick ====================
+
+# Pending names are merged into the main automaton once they reach this many, or a quarter of it
+MERGE_AT = 64
+
+class _Automaton:
+    """Goto, failure and output tables for a fixed set of lowercase patterns"""
+
+    def __init__(self, patterns: Iterable[str]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[str]] = [[]]
+        for pattern in patterns:
+            state = 0
+            for ch in pattern:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append([])
+                state = nxt
+            self._output[state].append(pattern)
+
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[nxt] = self._goto[fallback].get(ch, 0)
+                self._output[nxt] = self._output[nxt] + self._output[self._fail[nxt]]
+
+    def scan(self, text: str) -> List[Tuple[int, int, str]]:
+        """Whole-word matches in lowercase text as (start, end, pattern)"""
+        goto, fail, output = self._goto, self._fail, self._output
+        matches = []
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for pattern in output[state]:
+                start = i - len(pattern) + 1
+                before_ok = start == 0 or not text[start - 1].isalnum()
+                after_ok = i + 1 == len(text) or not text[i + 1].isalnum()
+                if before_ok and after_ok:
+                    matches.append((start, i + 1, pattern))
+        return matches
+
+class AhoCorasick:
+    """Multi-pattern matcher over lowercase text.
+
+    Additions collect in a pending automaton that is rebuilt lazily on the next
+    search; the main automaton is rebuilt only when the pending one grows past
+    MERGE_AT or a quarter of the dictionary, so building stays amortized.
+    """
+
+    def __init__(self):
+        self.patterns: Dict[str, Any] = {}
+        self._main = _Automaton(())
+        self._pending: List[str] = []
+        self._extra: Optional[_Automaton] = None
+        self._dirty = False
+
+    def __len__(self):
+        return len(self.patterns)
+
+    def add(self, pattern: str, payload: Any):
+        pattern = pattern.strip().lower()
+        if len(pattern) < 2 or pattern in self.patterns:
+            return
+        self.patterns[pattern] = payload
+        self._pending.append(pattern)
+        self._dirty = True
+
+    def _build(self):
+        if len(self._pending) >= max(MERGE_AT, (len(self.patterns) - len(self._pending)) // 4):
+            self._main = _Automaton(self.patterns)
+            self._pending = []
+            self._extra = None
+        else:
+            self._extra = _Automaton(self._pending)
+        self._dirty = False
+
+    def find_all(self, text: str) -> List[Tuple[int, int, Any]]:
+        """Whole-word matches as (start, end, payload)"""
+        if self._dirty:
+            self._build()
+        if not self.patterns:
+            return []
+
+        text = text.lower()
+        matches = self._main.scan(text)
+        if self._extra is not None:
+            # Ordered as one automaton would report them: by end, longest first
+            matches = sorted(matches + self._extra.scan(text), key=lambda m: (m[1], m[0]))
+        return [(start, end, self.patterns[pattern]) for start, end, pattern in matches]
+
+# ==================== Extractor ====================
+
+def _parse_amount(raw: str) -> Optional[float]:
+    try:
+        return float(raw.replace(",", ""))
+    except ValueError:
+        return None
+
+class EntityExtractor:
+    """Pulls dates, amounts, email addresses and known names out of free text"""
+
+    def __init__(self):
+        self.dictionary = AhoCorasick()
+
+    def add_entity(self, name: str, node_id: str, kind: str):
+        """Register a known name (client, person); the first registration of a name wins"""
+        if name:
+            self.dictionary.add(name, {"name": name, "node_id": node_id, "kind": kind})
+
+    def extract(self, text: str) -> Dict[str, Any]:
+        dates: List[str] = []
+        amounts: List[Dict[str, Any]] = []
+        emails: List[str] = []
+        led = False
+
+        for match in ENTITY_PATTERN.finditer(text):
+            groups = match.groupdict()
+            if groups["iso"]:
+                parsed = self._make_date(groups["iy"], groups["im"], groups["id"], groups["ih"], groups["imin"])
+                if parsed:
+                    dates.append(parsed)
+                    led = led or self._after_lead(text, match.start())
+            elif groups["dmy"]:
+                # Day-first, as written in Israel and Europe
+                year = groups["dy"] if len(groups["dy"]) == 4 else f"20{groups['dy']}"
+                parsed = self._make_date(year, groups["dm"], groups["dd"])
+                if parsed:
+                    dates.append(parsed)
+                    led = led or self._after_lead(text, match.start())
+            elif groups["email"]:
+                emails.append(groups["email"].lower())
+            else:
+                raw, currency = (groups["amt1"], groups["cur1"]) if groups["amt1"] else (groups["amt2"], groups["cur2"])
+                value = _parse_amount(raw) if raw else None
+                if value is not None:
+                    amounts.append({"value": value, "currency": CURRENCIES.get(currency.lower(), currency)})
+
+        entities = []
+        seen = set()
+        for _, _, payload in self.dictionary.find_all(text):
+            if payload["node_id"] not in seen:
+                seen.add(payload["node_id"])
+                entities.append(payload)
+
+        return {
+            "dates": dates,
+            "amounts": amounts,
+            "emails": emails,
+            "entities": entities,
+            "mentions_deadline": led or bool(DEADLINE_KEYWORDS.search(text))
+        }
+
+    @staticmethod
+    def _after_lead(text: str, start: int) -> bool:
+        """A generic deadline word ends just before the date at `start`"""
+        return DATE_LEAD.search(text[max(0, start - DATE_LEAD_WINDOW):start]) is not None
+
+    @staticmethod
+    def _make_date(year, month, day, hour=None, minute=None) -> Optional[str]:
+        try:
+            return datetime(int(year), int(month), int(day), int(hour or 0), int(minute or 0)).isoformat()
+        except ValueError:
+            return None
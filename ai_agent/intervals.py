@@ -0,0 +1,163 @@
+"""
+Interval Index - Time windows of commitments, queried for overlaps
+==================================================================
+A treap ordered by window start where every node also records the latest
+end in its subtree. An overlap query skips any subtree that ends before
+the query starts and stops descending right once starts pass the query
+end, so it costs O(log n) plus the overlaps it reports instead of a scan.
+Insert and remove are O(log n) expected.
+"""
+
+import random
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+Window = Tuple[str, datetime, datetime, str]
+
+class _Node:
+    __slots__ = ("key", "end", "max_end", "priority", "kind", "left", "right")
+
+    def __init__(self, key: Tuple[float, str], end: float, priority: float, kind: str):
+        self.key = key
+        self.end = end
+        self.max_end = end
+        self.priority = priority
+        self.kind = kind
+        self.left: Optional["_Node"] = None
+        self.right: Optional["_Node"] = None
+
+    def update(self):
+        self.max_end = max(
+            self.end,
+            self.left.max_end if self.left else self.end,
+            self.right.max_end if self.right else self.end
+        )
+
+class IntervalIndex:
+    """Half-open windows [start, end) keyed by item id; each item has at most one window"""
+
+    def __init__(self, seed: int = 11):
+        self._random = random.Random(seed)
+        self.clear()
+
+    def __len__(self):
+        return len(self.windows)
+
+    def __contains__(self, item_id: str):
+        return item_id in self.windows
+
+    def clear(self):
+        self.root: Optional[_Node] = None
+        self.windows: Dict[str, Tuple[float, float, str]] = {}
+
+    # ---------- updates ----------
+
+    def add(self, item_id: str, start: datetime, end: datetime, kind: str = ""):
+        """File or move an item's window; empty windows are not indexed"""
+        self.remove(item_id)
+        begin, finish = start.timestamp(), end.timestamp()
+        if finish <= begin:
+            return
+        self.windows[item_id] = (begin, finish, kind)
+        self.root = self._insert(self.root, _Node((begin, item_id), finish, self._random.random(), kind))
+
+    def remove(self, item_id: str):
+        window = self.windows.pop(item_id, None)
+        if window is not None:
+            self.root = self._delete(self.root, (window[0], item_id))
+
+    def _insert(self, root: Optional[_Node], node: _Node) -> _Node:
+        if root is None:
+            return node
+        if node.key < root.key:
+            root.left = self._insert(root.left, node)
+            if root.left.priority > root.priority:
+                root = self._rotate_right(root)
+        else:
+            root.right = self._insert(root.right, node)
+            if root.right.priority > root.priority:
+                root = self._rotate_left(root)
+        root.update()
+        return root
+
+    def _delete(self, root: Optional[_Node], key: Tuple[float, str]) -> Optional[_Node]:
+        if root is None:
+            return None
+        if key < root.key:
+            root.left = self._delete(root.left, key)
+        elif key > root.key:
+            root.right = self._delete(root.right, key)
+        else:
+            return self._merge(root.left, root.right)
+        root.update()
+        return root
+
+    def _merge(self, left: Optional[_Node], right: Optional[_Node]) -> Optional[_Node]:
+        if left is None or right is None:
+            return left or right
+        if left.priority > right.priority:
+            left.right = self._merge(left.right, right)
+            left.update()
+            return left
+        right.left = self._merge(left, right.left)
+        right.update()
+        return right
+
+    @staticmethod
+    def _rotate_right(node: _Node) -> _Node:
+        pivot = node.left
+        node.left, pivot.right = pivot.right, node
+        node.update()
+        pivot.update()
+        return pivot
+
+    @staticmethod
+    def _rotate_left(node: _Node) -> _Node:
+        pivot = node.right
+        node.right, pivot.left = pivot.left, node
+        node.update()
+        pivot.update()
+        return pivot
+
+    # ---------- queries ----------
+
+    def get(self, item_id: str) -> Optional[Tuple[datetime, datetime]]:
+        window = self.windows.get(item_id)
+        if window is None:
+            return None
+        return datetime.fromtimestamp(window[0]), datetime.fromtimestamp(window[1])
+
+    def overlapping(self, start: datetime, end: datetime, limit: Optional[int] = None,
+                    exclude: Optional[str] = None) -> List[Window]:
+        """Items whose window overlaps [start, end), in start order"""
+        low, high = start.timestamp(), end.timestamp()
+        found: List[Window] = []
+        stack: List[Tuple[_Node, bool]] = [(self.root, False)] if self.root else []
+        # Iterative in-order walk, pruned by max_end on the left and by start on the right
+        while stack:
+            node, visited = stack.pop()
+            if visited:
+                if node.key[0] >= high:
+                    break
+                if node.end > low and node.key[1] != exclude:
+                    found.append((
+                        node.key[1], datetime.fromtimestamp(node.key[0]), datetime.fromtimestamp(node.end), node.kind
+                    ))
+                    if limit is not None and len(found) >= limit:
+                        break
+                if node.right is not None and node.right.max_end > low:
+                    stack.append((node.right, False))
+                continue
+            if node.max_end <= low:
+                continue
+            stack.append((node, True))
+            if node.left is not None and node.left.max_end > low:
+                stack.append((node.left, False))
+        return found
+
+    def overlaps_of(self, item_id: str, limit: Optional[int] = None) -> List[Window]:
+        """Other items whose window overlaps this item's window"""
+        window = self.get(item_id)
+        if window is None:
+            return []
+        return self.overlapping(window[0], window[1], limit=limit, exclude=item_id)
@@ -0,0 +1,178 @@
+"""
+Pattern Learner - Streaming success statistics from action feedback
+===================================================================
+Each feedback event updates a few fixed-size counters in O(1): the success
+rate of the action kind, of the exact action, of the kind per hour of day
+and of the kind per client. Counters decay exponentially, so old habits
+fade, and the number of tracked keys is capped with LRU eviction, so memory
+stays bounded however much feedback arrives.
+
+Action, hour and client counters only shift the kind's rate by their
+smoothed deviation from it, so a client seen once cannot outweigh months
+of evidence.
+"""
+
+from array import array
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Any, Optional, Tuple
+
+HOURS = 24
+
+class DecayingCounter:
+    """Success and weight totals, plus the same per hour of day, decayed lazily on access"""
+
+    __slots__ = ("values", "updated")
+
+    def __init__(self, slots: int, updated: float):
+        # values[0], values[1] = success, weight; then (success, weight) per slot
+        self.values = array("d", [0.0] * (2 + 2 * slots))
+        self.updated = updated
+
+    def decay(self, now: float, half_life: float):
+        elapsed = now - self.updated
+        if elapsed > 0:
+            factor = 0.5 ** (elapsed / half_life)
+            values = self.values
+            for i in range(len(values)):
+                values[i] *= factor
+            self.updated = now
+
+    def add(self, success: bool, slot: Optional[int] = None):
+        self.values[0] += success
+        self.values[1] += 1.0
+        if slot is not None:
+            self.values[2 + 2 * slot] += success
+            self.values[3 + 2 * slot] += 1.0
+
+    def rate(self, prior: float, strength: float, slot: Optional[int] = None) -> float:
+        """Success rate shrunk toward `prior`; `strength` is how many events the prior is worth"""
+        offset = 0 if slot is None else 2 + 2 * slot
+        success, weight = self.values[offset], self.values[offset + 1]
+        return (success + prior * strength) / (weight + strength)
+
+    def raw(self, default: float) -> float:
+        """Observed rate without smoothing, or `default` when nothing was observed"""
+        return self.values[0] / self.values[1] if self.values[1] > 1e-9 else default
+
+    def weight(self) -> float:
+        return self.values[1]
+
+class PatternLearner:
+    def __init__(self, half_life_days: float = 14.0, prior: float = 0.5, prior_strength: float = 2.0,
+                 max_actions: int = 2000, max_clients: int = 5000):
+        self.half_life = half_life_days * 86400
+        self.prior = prior
+        self.prior_strength = prior_strength
+        self.max_actions = max_actions
+        self.max_clients = max_clients
+        self.actions: "OrderedDict[str, DecayingCounter]" = OrderedDict()
+        self.clients: "OrderedDict[Tuple[str, str], DecayingCounter]" = OrderedDict()
+        self.events = 0
+
+    def __len__(self):
+        return len(self.actions) + len(self.clients)
+
+    @staticmethod
+    def _bounded_get(store: OrderedDict, key, limit: int, slots: int, now: float, create: bool):
+        counter = store.get(key)
+        if counter is None:
+            if not create:
+                return None
+            counter = DecayingCounter(slots, now)
+            store[key] = counter
+            if len(store) > limit:
+                store.popitem(last=False)
+        else:
+            store.move_to_end(key)
+        return counter
+
+    def observe(self, kind: str, success: bool, action: Optional[str] = None,
+                client: Optional[str] = None, at: Optional[datetime] = None):
+        """Fold one feedback event into the counters"""
+        at = at or datetime.now()
+        now = at.timestamp()
+        hour = at.hour
+        keys = [f"kind:{kind}"] + ([f"action:{action}"] if action else [])
+        for key in keys:
+            counter = self._bounded_get(self.actions, key, self.max_actions, HOURS, now, create=True)
+            counter.decay(now, self.half_life)
+            counter.add(success, hour)
+        if client:
+            counter = self._bounded_get(self.clients, (kind, client), self.max_clients, 0, now, create=True)
+            counter.decay(now, self.half_life)
+            counter.add(success)
+        self.events += 1
+
+    def score(self, kind: str, action: Optional[str] = None, client: Optional[str] = None,
+              at: Optional[datetime] = None) -> float:
+        """Expected success in [0, 1]; the prior when nothing has been learned.
+
+        The kind's rate is the base. Action, hour and client counters see a subset
+        of the same events, so each contributes only its shrunk deviation from the
+        parent's observed rate rather than being counted again.
+        """
+        at = at or datetime.now()
+        now = at.timestamp()
+        strength = self.prior_strength
+
+        base = self.actions.get(f"kind:{kind}")
+        if base is None:
+            return self.prior
+        base.decay(now, self.half_life)
+        estimate = base.rate(self.prior, strength)
+        parent_rate = base.raw(self.prior)
+
+        specific = base
+        if action:
+            counter = self.actions.get(f"action:{action}")
+            if counter is not None:
+                counter.decay(now, self.half_life)
+                estimate += counter.rate(parent_rate, strength) - parent_rate
+                specific = counter
+        own_rate = specific.raw(parent_rate)
+        estimate += specific.rate(own_rate, strength, at.hour) - own_rate
+
+        if client:
+            counter = self.clients.get((kind, client))
+            if counter is not None:
+                counter.decay(now, self.half_life)
+                estimate += counter.rate(parent_rate, strength) - parent_rate
+        return min(1.0, max(0.0, estimate))
+
+    def summary(self, limit: int = 20) -> Dict[str, Any]:
+        """Most-evidenced action kinds and actions with their decayed success rates"""
+        now = datetime.now().timestamp()
+        rows = []
+        for key, counter in self.actions.items():
+            counter.decay(now, self.half_life)
+            rows.append({
+                "key": key,
+                "success_rate": round(counter.rate(self.prior, self.prior_strength), 3),
+                "weight": round(counter.weight(), 2)
+            })
+        rows.sort(key=lambda r: -r["weight"])
+        return {"events": self.events, "tracked_keys": len(self), "actions": rows[:limit]}
+
+    # ---------- persistence ----------
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "events": self.events,
+            "actions": {k: [c.updated, list(c.values)] for k, c in self.actions.items()},
+            "clients": [[kind, client, c.updated, list(c.values)] for (kind, client), c in self.clients.items()]
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], **kwargs) -> "PatternLearner":
+        learner = cls(**kwargs)
+        learner.events = data.get("events", 0)
+        for key, (updated, values) in data.get("actions", {}).items():
+            counter = DecayingCounter(HOURS, updated)
+            counter.values = array("d", values)
+            learner.actions[key] = counter
+        for kind, client, updated, values in data.get("clients", []):
+            counter = DecayingCounter(0, updated)
+            counter.values = array("d", values)
+            learner.clients[(kind, client)] = counter
+        return learner
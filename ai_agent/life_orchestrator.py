@@ -6,17 +6,75 @@ Complete rewrite to match the Life Orchestrator architecture
 
 import os
 import json
+import math
+import base64
 import asyncio
+import bisect
+import heapq
+from email.utils import parseaddr
 from datetime import datetime, timedelta
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple, Callable, Iterable, Iterator, Set, Protocol
 from enum import Enum
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
+from itertools import islice
 import logging
+from collections import deque, OrderedDict, Counter
+
+from text_index import InvertedIndex
+from extraction import EntityExtractor
+from vectors import SemanticIndex
+from scheduler import DeadlineScheduler
+from change_feed import ChangeFeed
+from dedupe import SeenSet, content_key
+from clustering import TaskClusterer
+from learning import PatternLearner
+from centrality import CentralityIndex
+from critical_path import CriticalPathScheduler, task_duration
+from planner import Candidate, free_windows, pack
+from intervals import IntervalIndex
+from partitions import PartitionIndex
+from rules import RuleEngine
+from actions import ActionExecutor, ActionPolicy, Handler
 
-# Setup logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Relationship detection links a new node to at most this many peers per key,
+# so a client with thousands of items does not grow a quadratic clique
+MAX_RELATED_PER_KEY = 25
+
+# Urgency buckets and how long before the deadline each begins; matches the
+# day-count rule in DecisionEngine (days_left <= 3 critical, <= 0 overdue)
+URGENCY_BUCKETS = [("critical", timedelta(days=4)), ("overdue", timedelta(days=1))]
+URGENCY_ACTIONS = {"overdue": "immediate_action_required", "critical": "prioritize_today"}
+
+# Semantic links: nearest neighbours considered per node and the similarity required
+SEMANTIC_NEIGHBORS = 5
+SEMANTIC_THRESHOLD = 0.4
+
+# Task clusters surfaced as batching opportunities per analysis
+MAX_OPPORTUNITIES = 3
+
+# Daily plans: working hours, the length assumed for untimed items and events, and value weights
+PLAN_DAY_HOURS = (9, 18)
+# datetime.weekday() numbers of working days: Sunday to Thursday
+PLAN_WORK_DAYS = (6, 0, 1, 2, 3)
+PLAN_ITEM_MINUTES = 30
+PLAN_EVENT_MINUTES = 60
+
+# Deadline nodes occupy this much time before they fall due when checking for overlapping commitments
+DEADLINE_WINDOW_MINUTES = 30
+PLAN_URGENCY_VALUE = {"overdue": 4.0, "critical": 2.0}
+PLAN_NO_SLACK_VALUE = 3.0
+
+# Archival to a cold tier (tiering.TieredGraph): finished items go after a week untouched,
+# emails, events and deadlines once they lie this far in the past; swept this often
+ARCHIVE_DONE_AFTER = timedelta(days=7)
+ARCHIVE_STALE_AFTER = timedelta(days=90)
+ARCHIVE_INTERVAL_SECONDS = 3600
+
+# Recent feedback entries kept in memory.patterns; the learner holds the long-run statistics
+PATTERN_MEMORY_LIMIT = 500
+
 # ==================== Data Models ====================
 
 class EntityType(Enum):
@@ -61,6 +119,18 @@ class ContextNode:
             "created_at": self.created_at.isoformat(),
             "updated_at": self.updated_at.isoformat()
         }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ContextNode":
+        return cls(
+            id=data["id"],
+            type=EntityType(data["type"]),
+            data=data["data"],
+            status=data.get("status", "active"),
+            confidence=data.get("confidence", 1.0),
+            created_at=datetime.fromisoformat(data["created_at"]),
+            updated_at=datetime.fromisoformat(data["updated_at"])
+        )
 
 @dataclass
 class ContextEdge:
@@ -70,52 +140,649 @@ class ContextEdge:
     strength: float = 1.0
     metadata: Dict[str, Any] = field(default_factory=dict)
     created_at: datetime = field(default_factory=datetime.now)
+    
+    def to_dict(self):
+        return {
+            "from": self.from_node,
+            "to": self.to_node,
+            "type": self.type.value,
+            "strength": self.strength,
+            "metadata": self.metadata,
+            "created_at": self.created_at.isoformat()
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ContextEdge":
+        return cls(
+            from_node=data["from"],
+            to_node=data["to"],
+            type=RelationType(data["type"]),
+            strength=data.get("strength", 1.0),
+            metadata=data.get("metadata", {}),
+            created_at=datetime.fromisoformat(data["created_at"])
+        )
+
+def parse_time(value: Any) -> Optional[datetime]:
+    """An ISO timestamp (or datetime) in naive local time, or None when missing or malformed"""
+    if not value:
+        return None
+    if isinstance(value, datetime):
+        parsed = value
+    else:
+        try:
+            parsed = datetime.fromisoformat(value)
+        except (TypeError, ValueError):
+            return None
+    # Compare everything in naive local time, like datetime.now()
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone().replace(tzinfo=None)
+    return parsed
+
+def parse_deadline(node: ContextNode) -> Optional[datetime]:
+    """The node's deadline as a datetime, or None when missing or malformed"""
+    return parse_time(node.data.get("deadline"))
+
+def encode_cursor(last_id: str) -> str:
+    """Encode the last returned node id as an opaque pagination cursor"""
+    return base64.urlsafe_b64encode(json.dumps({"after": last_id}).encode()).decode()
+
+def decode_cursor(cursor: Optional[str]) -> Optional[str]:
+    """Decode a cursor produced by encode_cursor; raises ValueError if malformed"""
+    if not cursor:
+        return None
+    try:
+        return json.loads(base64.urlsafe_b64decode(cursor.encode()))["after"]
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+# ==================== Graph History ====================
+
+class GraphHistory:
+    """Per-node version chains stored as deltas with periodic full keyframes.
+    
+    Nodes are replaced, never mutated, on update, so unchanged values are shared
+    between versions and a snapshot reuses every node that has not changed since.
+    """
+    
+    KEYFRAME_INTERVAL = 16
+    
+    def __init__(self):
+        self.timestamps: Dict[str, List[datetime]] = {}
+        self.entries: Dict[str, List[Dict[str, Any]]] = {}
+        self.change_log: List[Tuple[datetime, str]] = []
+        self.edge_times: List[datetime] = []
+        self.edge_log: List[ContextEdge] = []
+    
+    def record_node(self, node: ContextNode, previous: Optional[ContextNode]):
+        entries = self.entries.get(node.id, [])
+        entry: Dict[str, Any] = {
+            "type": node.type,
+            "status": node.status,
+            "confidence": node.confidence
+        }
+        
+        if previous is None or not entries or len(entries) % self.KEYFRAME_INTERVAL == 0:
+            entry["data"] = dict(node.data)
+            entry["created_at"] = node.created_at
+        else:
+            entry["set"] = {k: v for k, v in node.data.items()
+                            if k not in previous.data or previous.data[k] != v}
+            entry["unset"] = [k for k in previous.data if k not in node.data]
+        
+        self._append(node.id, node.updated_at, entry)
+    
+    def record_removal(self, node_id: str, timestamp: datetime):
+        self._append(node_id, timestamp, {"deleted": True})
+    
+    def record_edge(self, edge: ContextEdge):
+        if self.edge_times and edge.created_at < self.edge_times[-1]:
+            position = bisect.bisect_right(self.edge_times, edge.created_at)
+            self.edge_times.insert(position, edge.created_at)
+            self.edge_log.insert(position, edge)
+        else:
+            self.edge_times.append(edge.created_at)
+            self.edge_log.append(edge)
+    
+    def forget(self, node_ids: Iterable[str]):
+        """Drop the versions of nodes that moved out of the graph, and of the edges touching them"""
+        gone = set(node_ids)
+        for node_id in gone:
+            self.timestamps.pop(node_id, None)
+            self.entries.pop(node_id, None)
+        self.change_log = [entry for entry in self.change_log if entry[1] not in gone]
+        kept = [i for i, e in enumerate(self.edge_log) if e.from_node not in gone and e.to_node not in gone]
+        if len(kept) < len(self.edge_log):
+            self.edge_times = [self.edge_times[i] for i in kept]
+            self.edge_log = [self.edge_log[i] for i in kept]
+    
+    def _append(self, node_id: str, timestamp: datetime, entry: Dict[str, Any]):
+        timestamps = self.timestamps.setdefault(node_id, [])
+        # Loaded state can replay older timestamps; keep every log sorted for bisect
+        if timestamps and timestamp < timestamps[-1]:
+            timestamp = timestamps[-1]
+        timestamps.append(timestamp)
+        self.entries.setdefault(node_id, []).append(entry)
+        if self.change_log and timestamp < self.change_log[-1][0]:
+            bisect.insort(self.change_log, (timestamp, node_id))
+        else:
+            self.change_log.append((timestamp, node_id))
+    
+    def versions(self, node_id: str) -> List[Dict[str, Any]]:
+        """Every recorded version of a node, oldest first"""
+        versions = []
+        for position, timestamp in enumerate(self.timestamps.get(node_id, [])):
+            node = self._materialize(node_id, position)
+            versions.append({
+                "version": position + 1,
+                "timestamp": timestamp.isoformat(),
+                "node": node.to_dict() if node else None
+            })
+        return versions
+    
+    def node_as_of(self, node_id: str, timestamp: datetime) -> Optional[ContextNode]:
+        position = bisect.bisect_right(self.timestamps.get(node_id, []), timestamp) - 1
+        if position < 0:
+            return None
+        return self._materialize(node_id, position)
+    
+    def _materialize(self, node_id: str, position: int) -> Optional[ContextNode]:
+        entries = self.entries[node_id]
+        if entries[position].get("deleted"):
+            return None
+        
+        start = position
+        while "data" not in entries[start]:
+            start -= 1
+        
+        data = dict(entries[start]["data"])
+        created_at = entries[start]["created_at"]
+        for entry in entries[start + 1:position + 1]:
+            data.update(entry["set"])
+            for key in entry["unset"]:
+                data.pop(key, None)
+        
+        entry = entries[position]
+        return ContextNode(
+            id=node_id,
+            type=entry["type"],
+            data=data,
+            status=entry["status"],
+            confidence=entry["confidence"],
+            created_at=created_at,
+            updated_at=self.timestamps[node_id][position]
+        )
+    
+    def snapshot(self, graph: "GraphStore", timestamp: datetime) -> "ContextGraph":
+        """Read-only graph as it was at `timestamp`"""
+        snapshot = ContextGraph(track_history=False)
+        
+        for node_id, timestamps in self.timestamps.items():
+            if timestamps[0] > timestamp:
+                continue
+            current = graph.get_node(node_id)
+            if current is not None and timestamps[-1] <= timestamp:
+                # Unchanged since then: share the live node instead of rebuilding it
+                snapshot.add_node(current)
+            else:
+                node = self.node_as_of(node_id, timestamp)
+                if node is not None:
+                    snapshot.add_node(node)
+        
+        for edge in self.edge_log[:bisect.bisect_right(self.edge_times, timestamp)]:
+            if edge.from_node in snapshot.nodes or edge.to_node in snapshot.nodes:
+                snapshot.add_edge(edge)
+        
+        return snapshot
+    
+    def diff(self, start: datetime, end: datetime) -> Dict[str, Any]:
+        """Nodes added, removed and changed, and edges added, between two points in time"""
+        lo = bisect.bisect_right(self.change_log, (start, chr(0x10FFFF)))
+        hi = bisect.bisect_right(self.change_log, (end, chr(0x10FFFF)))
+        touched = dict.fromkeys(node_id for _, node_id in self.change_log[lo:hi])
+        
+        added, removed, changed = [], [], []
+        for node_id in touched:
+            before = self.node_as_of(node_id, start)
+            after = self.node_as_of(node_id, end)
+            if before is None and after is not None:
+                added.append(after.to_dict())
+            elif before is not None and after is None:
+                removed.append(before.to_dict())
+            elif before is not None and after is not None:
+                changes = {
+                    key: {"before": before.data.get(key), "after": after.data.get(key)}
+                    for key in before.data.keys() | after.data.keys()
+                    if before.data.get(key) != after.data.get(key)
+                }
+                if before.status != after.status:
+                    changes["status"] = {"before": before.status, "after": after.status}
+                if changes:
+                    changed.append({"id": node_id, "changes": changes})
+        
+        edge_lo = bisect.bisect_right(self.edge_times, start)
+        edge_hi = bisect.bisect_right(self.edge_times, end)
+        return {
+            "from": start.isoformat(),
+            "to": end.isoformat(),
+            "added": added,
+            "removed": removed,
+            "changed": changed,
+            "edges_added": [e.to_dict() for e in self.edge_log[edge_lo:edge_hi]]
+        }
 
 # ==================== Context Graph ====================
 
+class GraphStore(Protocol):
+    """Storage interface the orchestrator works against.
+    
+    ContextGraph is the in-memory implementation; sqlite_store.SQLiteGraphStore
+    keeps the graph on disk. Listeners receive (event, payload) for node_added,
+    node_updated, node_removed, edge_added and bulk_loaded (payload None, after
+    bulk_load); `version` increases on every mutation. Stores shared between
+    processes replay other processes' writes to listeners from poll_changes().
+    """
+    
+    version: int
+    history: Optional[GraphHistory]
+    
+    def subscribe(self, listener: Callable[[str, Any], None]) -> None: ...
+    def add_node(self, node: ContextNode) -> None: ...
+    def update_node(self, node_id: str, data: Optional[Dict[str, Any]] = None,
+                    status: Optional[str] = None, confidence: Optional[float] = None) -> ContextNode: ...
+    def remove_node(self, node_id: str) -> Optional[ContextNode]: ...
+    def remove_nodes(self, node_ids: Iterable[str], record_removal: bool = True) -> List[ContextNode]: ...
+    def get_node(self, node_id: str) -> Optional[ContextNode]: ...
+    def has_node(self, node_id: str) -> bool: ...
+    def iter_nodes(self, types: Optional[List[EntityType]] = None) -> Iterator[ContextNode]: ...
+    def node_count(self) -> int: ...
+    def type_counts(self) -> Dict[EntityType, int]: ...
+    def add_edge(self, edge: ContextEdge) -> None: ...
+    def iter_edges(self, relation_types: Optional[List[RelationType]] = None) -> Iterator[ContextEdge]: ...
+    def edge_count(self) -> int: ...
+    def neighbors(self, node_id: str, relation_types: Optional[List[RelationType]] = None) -> List[ContextEdge]: ...
+    def linked_ids(self, node_id: str) -> Set[str]: ...
+    def find_by_attribute(self, key: str, value: Any, limit: Optional[int] = None) -> List[ContextNode]: ...
+    def deadline_range(self, start: Optional[datetime] = None, end: Optional[datetime] = None,
+                       limit: Optional[int] = None, descending: bool = False) -> List[ContextNode]: ...
+    def expand(self, node_ids: List[str], hops: int = 1,
+               relation_types: Optional[List[RelationType]] = None) -> Dict[str, Any]: ...
+    def query(self, types: Optional[List[EntityType]] = None, statuses: Optional[List[str]] = None,
+              deadline_from: Optional[datetime] = None, deadline_to: Optional[datetime] = None,
+              attributes: Optional[Dict[str, Any]] = None, limit: int = 50,
+              cursor: Optional[str] = None) -> Dict[str, Any]: ...
+    def bulk_load(self, nodes: Iterable[ContextNode], edges: Iterable[ContextEdge]) -> None: ...
+    def poll_changes(self) -> List[Tuple[str, Any]]: ...
+
+def matches_filters(node: ContextNode, statuses, deadline_from, deadline_to, attributes) -> bool:
+    """Shared predicate behind GraphStore.query"""
+    if statuses and node.status not in statuses:
+        return False
+    
+    if deadline_from or deadline_to:
+        deadline = parse_deadline(node)
+        if deadline is None:
+            return False
+        if deadline_from and deadline < deadline_from:
+            return False
+        if deadline_to and deadline > deadline_to:
+            return False
+    
+    for key, expected in (attributes or {}).items():
+        value = node.data.get(key)
+        if isinstance(expected, list):
+            if value not in expected:
+                return False
+        elif value != expected:
+            return False
+    
+    return True
+
 class ContextGraph:
-    def __init__(self):
+    """In-memory GraphStore"""
+    
+    # Attributes with an exact-match secondary index
+    INDEXED_ATTRIBUTES = ("client",)
+    
+    def __init__(self, track_history: bool = True):
         self.nodes: Dict[str, ContextNode] = {}
         self.edges: List[ContextEdge] = []
+        # Ids of each type, sorted, so lookups and removals bisect
         self.index: Dict[EntityType, List[str]] = {}
+        self.adjacency: Dict[str, List[ContextEdge]] = {}
+        # Attribute value -> ids as an insertion-ordered set (dict keys), most recent last
+        self.attribute_index: Dict[str, Dict[Any, Dict[str, None]]] = {k: {} for k in self.INDEXED_ATTRIBUTES}
+        self.deadlines: List[Tuple[datetime, str]] = []
+        # Entries replaced during a bulk load, dropped when its lists are sorted at the end
+        self._bulk_stale: Counter = Counter()
+        self.version = 0
+        self.history: Optional[GraphHistory] = GraphHistory() if track_history else None
+        self._listeners: List[Callable[[str, Any], None]] = []
+        self._bulk = False
+    
+    def subscribe(self, listener: Callable[[str, Any], None]):
+        """Register listener(event, payload) for node_added, node_updated, node_removed, edge_added and bulk_loaded"""
+        self._listeners.append(listener)
+    
+    def _notify(self, event: str, payload: Any):
+        self.version += 1
+        for listener in self._listeners:
+            listener(event, payload)
+    
+    # ---------- nodes ----------
     
     def add_node(self, node: ContextNode):
+        """Insert a node; an existing id becomes a new version rather than a duplicate"""
+        previous = self.nodes.get(node.id)
+        if previous is not None:
+            node.created_at = previous.created_at
+            if node.updated_at <= previous.updated_at:
+                node.updated_at = datetime.now()
+            self._unindex(previous)
+        self._index(node)
+        
         self.nodes[node.id] = node
-        if node.type not in self.index:
-            self.index[node.type] = []
-        self.index[node.type].append(node.id)
-        logger.info(f"Added node: {node.id} of type {node.type}")
+        if self.history:
+            self.history.record_node(node, previous)
+        self._notify("node_updated" if previous else "node_added", node)
+        logger.debug("Added node: %s of type %s", node.id, node.type)
+    
+    def update_node(self, node_id: str, data: Optional[Dict[str, Any]] = None,
+                    status: Optional[str] = None, confidence: Optional[float] = None) -> ContextNode:
+        """Copy-on-write update: the stored node is replaced, older versions stay intact"""
+        current = self.nodes[node_id]
+        updated = replace(
+            current,
+            data={**current.data, **(data or {})},
+            status=status if status is not None else current.status,
+            confidence=confidence if confidence is not None else current.confidence,
+            updated_at=datetime.now()
+        )
+        self.add_node(updated)
+        return updated
+    
+    def remove_node(self, node_id: str) -> Optional[ContextNode]:
+        """Remove a node and its edges; history keeps every earlier version"""
+        removed = self.remove_nodes([node_id])
+        return removed[0] if removed else None
+    
+    def remove_nodes(self, node_ids: Iterable[str], record_removal: bool = True) -> List[ContextNode]:
+        """Remove many nodes with one pass over the edge list.
+        
+        With record_removal=False the nodes' history is dropped instead of ending in
+        a deletion, for nodes that move elsewhere (archival) rather than cease to exist.
+        """
+        removed: List[ContextNode] = []
+        gone: Set[int] = set()
+        others: Set[str] = set()
+        for node_id in node_ids:
+            node = self.nodes.pop(node_id, None)
+            if node is None:
+                continue
+            self._unindex(node)
+            for edge in self.adjacency.pop(node_id, []):
+                gone.add(id(edge))
+                others.add(edge.to_node if edge.from_node == node_id else edge.from_node)
+            removed.append(node)
+        
+        if gone:
+            self.edges = [e for e in self.edges if id(e) not in gone]
+            for other in others:
+                if other in self.adjacency:
+                    self.adjacency[other] = [e for e in self.adjacency[other] if id(e) not in gone]
+        
+        if self.history and not record_removal:
+            self.history.forget(node.id for node in removed)
+        now = datetime.now()
+        for node in removed:
+            if self.history and record_removal:
+                self.history.record_removal(node.id, now)
+            self._notify("node_removed", node)
+        return removed
+    
+    def _index(self, node: ContextNode):
+        ids = self.index.setdefault(node.type, [])
+        deadline = parse_deadline(node)
+        if self._bulk:
+            # Sorted once when the bulk load finishes
+            ids.append(node.id)
+            if deadline is not None:
+                self.deadlines.append((deadline, node.id))
+        else:
+            bisect.insort(ids, node.id)
+            if deadline is not None:
+                bisect.insort(self.deadlines, (deadline, node.id))
+        for key, values in self.attribute_index.items():
+            value = node.data.get(key)
+            if value is not None and isinstance(value, (str, int, float)):
+                values.setdefault(value, {})[node.id] = None
+    
+    def _unindex(self, node: ContextNode):
+        for key, values in self.attribute_index.items():
+            value = node.data.get(key)
+            ids = values.get(value) if isinstance(value, (str, int, float)) else None
+            if ids is not None:
+                ids.pop(node.id, None)
+                if not ids:
+                    del values[value]
+        deadline = parse_deadline(node)
+        if self._bulk:
+            self._bulk_stale[(node.type, node.id)] += 1
+            if deadline is not None:
+                self._bulk_stale[(deadline, node.id)] += 1
+            return
+        _remove_sorted(self.index[node.type], node.id)
+        if deadline is not None:
+            _remove_sorted(self.deadlines, (deadline, node.id))
+    
+    def _sort_indexes(self):
+        """Sort the lists a bulk load appended to, dropping the entries it replaced"""
+        stale = self._bulk_stale
+        
+        def live(key) -> bool:
+            if stale[key]:
+                stale[key] -= 1
+                return False
+            return True
+        
+        for node_type, ids in self.index.items():
+            ids.sort()
+            if stale:
+                ids[:] = [node_id for node_id in ids if live((node_type, node_id))]
+        self.deadlines.sort()
+        if stale:
+            self.deadlines[:] = [entry for entry in self.deadlines if live(entry)]
+        stale.clear()
+    
+    def get_node(self, node_id: str) -> Optional[ContextNode]:
+        return self.nodes.get(node_id)
+    
+    def has_node(self, node_id: str) -> bool:
+        return node_id in self.nodes
+    
+    def iter_nodes(self, types: Optional[List[EntityType]] = None) -> Iterator[ContextNode]:
+        if not types:
+            return iter(list(self.nodes.values()))
+        return (self.nodes[nid] for t in types for nid in list(self.index.get(t, [])))
+    
+    def node_count(self) -> int:
+        return len(self.nodes)
+    
+    def type_counts(self) -> Dict[EntityType, int]:
+        return {t: len(ids) for t, ids in self.index.items() if ids}
+    
+    def find_by_attribute(self, key: str, value: Any, limit: Optional[int] = None) -> List[ContextNode]:
+        """Nodes whose data[key] == value, most recently added first"""
+        if key in self.attribute_index:
+            ids = reversed(self.attribute_index[key].get(value, {}))
+            return [self.nodes[nid] for nid in (islice(ids, limit) if limit else ids)]
+        found = [n for n in reversed(list(self.nodes.values())) if n.data.get(key) == value]
+        return found[:limit] if limit else found
+    
+    def deadline_range(self, start: Optional[datetime] = None, end: Optional[datetime] = None,
+                       limit: Optional[int] = None, descending: bool = False) -> List[ContextNode]:
+        """Nodes with a deadline in [start, end], ordered by deadline"""
+        lo = bisect.bisect_left(self.deadlines, (start,)) if start else 0
+        hi = bisect.bisect_right(self.deadlines, (end, chr(0x10FFFF))) if end else len(self.deadlines)
+        window = self.deadlines[lo:hi]
+        if descending:
+            window.reverse()
+        if limit:
+            window = window[:limit]
+        return [self.nodes[nid] for _, nid in window]
+    
+    # ---------- edges ----------
     
     def add_edge(self, edge: ContextEdge):
         self.edges.append(edge)
-        logger.info(f"Added edge: {edge.from_node} -> {edge.to_node} ({edge.type})")
+        self.adjacency.setdefault(edge.from_node, []).append(edge)
+        if edge.to_node != edge.from_node:
+            self.adjacency.setdefault(edge.to_node, []).append(edge)
+        if self.history:
+            self.history.record_edge(edge)
+        self._notify("edge_added", edge)
+        logger.debug("Added edge: %s -> %s (%s)", edge.from_node, edge.to_node, edge.type)
+    
+    def iter_edges(self, relation_types: Optional[List[RelationType]] = None) -> Iterator[ContextEdge]:
+        if not relation_types:
+            return iter(list(self.edges))
+        return (e for e in list(self.edges) if e.type in relation_types)
+    
+    def edge_count(self) -> int:
+        return len(self.edges)
+    
+    def neighbors(self, node_id: str, relation_types: Optional[List[RelationType]] = None) -> List[ContextEdge]:
+        """Edges touching a node in either direction, optionally filtered by relation type"""
+        edges = self.adjacency.get(node_id, [])
+        if relation_types:
+            edges = [e for e in edges if e.type in relation_types]
+        return edges
+    
+    def linked_ids(self, node_id: str) -> Set[str]:
+        """Ids of nodes directly connected to node_id"""
+        return {e.to_node if e.from_node == node_id else e.from_node for e in self.adjacency.get(node_id, [])}
+    
+    def bulk_load(self, nodes: Iterable[ContextNode], edges: Iterable[ContextEdge]):
+        """Insert many nodes and edges; listeners get one bulk_loaded event instead of one per item.
+        
+        Existing ids are overwritten and edges that already exist are skipped, so loads can be repeated.
+        """
+        listeners, self._listeners = self._listeners, []
+        self._bulk = True
+        try:
+            for node in nodes:
+                self.add_node(node)
+            # An edge that is already there (same endpoints and type) is not added twice
+            linked = {(e.from_node, e.type, e.to_node) for e in self.edges}
+            for edge in edges:
+                key = (edge.from_node, edge.type, edge.to_node)
+                if key not in linked:
+                    linked.add(key)
+                    self.add_edge(edge)
+        finally:
+            self._listeners = listeners
+            self._bulk = False
+            self._sort_indexes()
+        self._notify("bulk_loaded", None)
+    
+    def poll_changes(self) -> List[Tuple[str, Any]]:
+        """Nothing to replay: an in-memory graph belongs to one process"""
+        return []
+    
+    # ---------- traversal and queries ----------
     
     def find_related(self, node_id: str, depth: int = 2) -> List[ContextNode]:
         """Find all nodes related to a given node up to specified depth"""
-        related = []
-        visited = set()
-        queue = [(node_id, 0)]
+        return self.expand([node_id], hops=depth)["nodes"]
+    
+    def expand(self, node_ids: List[str], hops: int = 1,
+               relation_types: Optional[List[RelationType]] = None) -> Dict[str, Any]:
+        """Breadth-first neighborhood of the given nodes up to `hops` away"""
+        return expand_neighborhood(self, node_ids, hops, relation_types)
+    
+    def query(self, types: Optional[List[EntityType]] = None,
+              statuses: Optional[List[str]] = None,
+              deadline_from: Optional[datetime] = None,
+              deadline_to: Optional[datetime] = None,
+              attributes: Optional[Dict[str, Any]] = None,
+              limit: int = 50,
+              cursor: Optional[str] = None) -> Dict[str, Any]:
+        """Filter nodes and return one page ordered by id, with a cursor for the next page"""
+        after = decode_cursor(cursor)
         
-        while queue:
-            current_id, current_depth = queue.pop(0)
-            if current_id in visited or current_depth > depth:
+        def past_cursor(ids: List[str]) -> Iterator[str]:
+            start = bisect.bisect_right(ids, after) if after is not None else 0
+            return (ids[i] for i in range(start, len(ids)))
+        
+        # Each type's ids are sorted and a node has one type, so merging them walks ids in order
+        lists = [self.index.get(t, []) for t in set(types)] if types else list(self.index.values())
+        page: List[ContextNode] = []
+        has_more = False
+        for node_id in heapq.merge(*map(past_cursor, lists)):
+            node = self.nodes.get(node_id)
+            if node is None or not matches_filters(node, statuses, deadline_from, deadline_to, attributes):
                 continue
-            
-            visited.add(current_id)
-            if current_id != node_id and current_id in self.nodes:
-                related.append(self.nodes[current_id])
-            
-            # Find connected nodes
-            for edge in self.edges:
-                if edge.from_node == current_id:
-                    queue.append((edge.to_node, current_depth + 1))
-                elif edge.to_node == current_id:
-                    queue.append((edge.from_node, current_depth + 1))
+            if len(page) == limit:
+                has_more = True
+                break
+            page.append(node)
         
-        return related
+        return {
+            "nodes": page,
+            "next_cursor": encode_cursor(page[-1].id) if has_more else None
+        }
+
+def _remove_sorted(items: List[Any], item: Any):
+    """Remove one occurrence of item from a sorted list, found by bisection"""
+    position = bisect.bisect_left(items, item)
+    if position < len(items) and items[position] == item:
+        del items[position]
+
+def expand_neighborhood(graph: GraphStore, node_ids: List[str], hops: int,
+                        relation_types: Optional[List[RelationType]]) -> Dict[str, Any]:
+    """Breadth-first expansion over GraphStore.neighbors, shared by every backend"""
+    visited = set(node_ids)
+    frontier = list(node_ids)
+    found: List[ContextNode] = []
+    edges: Dict[Tuple[str, str, RelationType, Any], ContextEdge] = {}
+    
+    for _ in range(hops):
+        next_frontier = []
+        for current_id in frontier:
+            for edge in graph.neighbors(current_id, relation_types):
+                other = edge.to_node if edge.from_node == current_id else edge.from_node
+                # An edge is reached from both of its ends, keep it once
+                edges.setdefault((edge.from_node, edge.to_node, edge.type, edge.metadata.get("reason")), edge)
+                if other in visited:
+                    continue
+                visited.add(other)
+                next_frontier.append(other)
+                node = graph.get_node(other)
+                if node is not None:
+                    found.append(node)
+        if not next_frontier:
+            break
+        frontier = next_frontier
+    
+    return {"nodes": found, "edges": list(edges.values())}
 
 # ==================== Memory System ====================
 
+def _entry_key(entry: Any) -> str:
+    """Identity of an episodic or pattern entry: its id when it has one, otherwise its content"""
+    if isinstance(entry, dict) and entry.get("id") is not None:
+        return f"id:{entry['id']}"
+    return json.dumps(entry, sort_keys=True, default=str)
+
+def _merge_entries(existing: List[Any], incoming: Iterable[Any]):
+    """Append incoming entries not already in existing; equal entries are counted, not collapsed"""
+    held = Counter(_entry_key(entry) for entry in existing)
+    for entry in incoming:
+        key = _entry_key(entry)
+        if held[key]:
+            held[key] -= 1
+        else:
+            existing.append(entry)
+
 class MemoryBank:
     def __init__(self):
         self.short_term = {}
@@ -145,6 +812,55 @@ class MemoryBank:
             return self.long_term[key]["value"]
         return None
     
+    @staticmethod
+    def _item_dict(item: Dict[str, Any]) -> Dict[str, Any]:
+        return {**item, "timestamp": item["timestamp"].isoformat()}
+    
+    def item_dict(self, key: str, memory_type: str = "short") -> Dict[str, Any]:
+        """The to_dict fragment holding one stored item"""
+        name = "short_term" if memory_type == "short" else "long_term"
+        return {name: {key: self._item_dict(getattr(self, name)[key])}}
+    
+    def to_dict(self) -> Dict[str, Any]:
+        def items(store):
+            return {k: self._item_dict(v) for k, v in store.items()}
+        
+        return {
+            "short_term": items(self.short_term),
+            "long_term": items(self.long_term),
+            "episodic": self.episodic,
+            "patterns": self.patterns
+        }
+    
+    def load_dict(self, data: Dict[str, Any]):
+        """Merge memory written by to_dict"""
+        for name in ("short_term", "long_term"):
+            store = getattr(self, name)
+            for key, item in data.get(name, {}).items():
+                store[key] = {**item, "timestamp": datetime.fromisoformat(item["timestamp"])}
+        # Entries already held are skipped, so importing the same dump twice changes nothing
+        _merge_entries(self.episodic, data.get("episodic", []))
+        for key, entries in data.get("patterns", {}).items():
+            _merge_entries(self.patterns.setdefault(key, []), entries)
+        self._trim_patterns()
+    
+    def add_pattern(self, key: str, entry: Dict[str, Any]):
+        self.patterns.setdefault(key, []).append(entry)
+        self._trim_patterns()
+    
+    def _trim_patterns(self):
+        """Drop the oldest feedback entries past PATTERN_MEMORY_LIMIT; keys are dated, so they sort oldest first"""
+        excess = sum(len(entries) for entries in self.patterns.values()) - PATTERN_MEMORY_LIMIT
+        for key in sorted(self.patterns):
+            if excess <= 0:
+                break
+            entries = self.patterns[key]
+            dropped = min(excess, len(entries))
+            del entries[:dropped]
+            excess -= dropped
+            if not entries:
+                del self.patterns[key]
+    
     def _calculate_importance(self, value: Any) -> float:
         """Calculate importance score for memory item"""
         score = 5.0
@@ -170,181 +886,946 @@ class MemoryBank:
 # ==================== Decision Engine ====================
 
 class DecisionEngine:
-    def __init__(self, graph: ContextGraph, memory: MemoryBank):
+    def __init__(self, graph: GraphStore, memory: MemoryBank,
+                 scheduler: Optional[DeadlineScheduler] = None,
+                 clusterer: Optional[TaskClusterer] = None,
+                 learner: Optional[PatternLearner] = None,
+                 centrality: Optional[CentralityIndex] = None,
+                 critical_path: Optional[CriticalPathScheduler] = None,
+                 intervals: Optional[IntervalIndex] = None,
+                 rules: Optional[RuleEngine] = None):
         self.graph = graph
         self.memory = memory
+        self.scheduler = scheduler
+        self.clusterer = clusterer
+        self.learner = learner
+        self.centrality = centrality
+        self.critical_path = critical_path
+        self.intervals = intervals
+        self.rules = rules
     
     def analyze_situation(self, context: Dict[str, Any]) -> Dict[str, Any]:
         """Analyze current situation and suggest actions"""
-        decisions = []
         urgent_items = []
         opportunities = []
         conflicts = []
+        critical = []
         
         # Check for urgent deadlines
-        for node_id, node in self.graph.nodes.items():
-            if "deadline" in node.data:
-                deadline = datetime.fromisoformat(node.data["deadline"])
-                days_left = (deadline - datetime.now()).days
-                
-                if days_left <= 0:
-                    urgent_items.append({
-                        "node": node,
-                        "urgency": "overdue",
-                        "action": "immediate_action_required"
-                    })
-                elif days_left <= 3:
+        if self.scheduler is not None:
+            # Buckets are maintained by the scheduler; only fire what came due since last time
+            self.scheduler.advance()
+            for node_id in self.scheduler.items_in("overdue", "critical"):
+                node = self.graph.get_node(node_id)
+                if node:
+                    urgency = self.scheduler.current[node_id]
                     urgent_items.append({
                         "node": node,
-                        "urgency": "critical",
-                        "action": "prioritize_today"
+                        "urgency": urgency,
+                        "action": URGENCY_ACTIONS[urgency]
                     })
+        else:
+            horizon = datetime.now() + URGENCY_BUCKETS[0][1]
+            for node in self.graph.deadline_range(end=horizon):
+                if "deadline" in node.data:
+                    deadline = parse_deadline(node)
+                    days_left = (deadline - datetime.now()).days
+                    
+                    if days_left <= 0:
+                        urgent_items.append({
+                            "node": node,
+                            "urgency": "overdue",
+                            "action": "immediate_action_required"
+                        })
+                    elif days_left <= 3:
+                        urgent_items.append({
+                            "node": node,
+                            "urgency": "critical",
+                            "action": "prioritize_today"
+                        })
         
         # Check for blocked processes
-        for edge in self.graph.edges:
-            if edge.type == RelationType.BLOCKS:
-                blocker = self.graph.nodes.get(edge.from_node)
-                blocked = self.graph.nodes.get(edge.to_node)
-                
-                if blocker and blocked:
+        for edge in self.graph.iter_edges([RelationType.BLOCKS]):
+            blocker = self.graph.get_node(edge.from_node)
+            blocked = self.graph.get_node(edge.to_node)
+            
+            if blocker and blocked:
+                conflicts.append({
+                    "type": "dependency",
+                    "blocker": blocker,
+                    "blocked": blocked,
+                    "suggestion": f"Resolve {blocker.id} to unblock {blocked.id}"
+                })
+        
+        # Check for overlapping commitments that are still ahead; windows come from the interval index,
+        # so edges whose items were rescheduled or closed since are skipped
+        if self.intervals is not None:
+            now = datetime.now()
+            for edge in self.graph.iter_edges([RelationType.CONFLICTS]):
+                a, b = self.intervals.get(edge.from_node), self.intervals.get(edge.to_node)
+                if not (a and b and a[0] < b[1] and b[0] < a[1] and max(a[1], b[1]) > now):
+                    continue
+                first, second = self.graph.get_node(edge.from_node), self.graph.get_node(edge.to_node)
+                if first and second:
                     conflicts.append({
-                        "blocker": blocker,
-                        "blocked": blocked,
-                        "suggestion": f"Resolve {blocker.id} to unblock {blocked.id}"
+                        "type": "schedule",
+                        "items": [first, second],
+                        "overlap": {"start": max(a[0], b[0]), "end": min(a[1], b[1])},
+                        "suggestion": f"Reschedule {second.data.get('title', second.id)} or "
+                                      f"{first.data.get('title', first.id)}: they overlap"
                     })
         
-        # Find optimization opportunities
-        for node_type, node_ids in self.graph.index.items():
-            if len(node_ids) > 3 and node_type == EntityType.TASK:
-                similar_tasks = [self.graph.nodes[nid] for nid in node_ids[:3]]
+        # Find optimization opportunities: groups of open tasks that share real context
+        if self.clusterer is not None:
+            for cluster in self.clusterer.clusters()[:MAX_OPPORTUNITIES]:
+                tasks = [n for n in map(self.graph.get_node, cluster["task_ids"][:10]) if n]
                 opportunities.append({
                     "type": "batch_processing",
-                    "tasks": similar_tasks,
-                    "suggestion": "Consider handling these similar tasks together"
+                    "tasks": tasks,
+                    "size": len(cluster["task_ids"]),
+                    "signals": cluster["signals"],
+                    "suggestion": f"Handle these {len(cluster['task_ids'])} tasks together "
+                                  f"({', '.join(cluster['signals'])})"
                 })
         
+        # Tasks whose dependency chain leaves no slack before a deadline
+        if self.critical_path is not None:
+            for info in self.critical_path.critical(limit=10):
+                node = self.graph.get_node(info["task_id"])
+                if node:
+                    critical.append({"node": node, **info})
+        
+        # User rules whose conditions hold right now; the network keeps them current as the graph changes
+        rule_matches = self.rules.matches(limit=10) if self.rules is not None else []
+        
         return {
             "urgent": urgent_items,
             "opportunities": opportunities,
             "conflicts": conflicts,
-            "recommended_actions": self._generate_recommendations(urgent_items, opportunities, conflicts)
+            "critical": critical,
+            "critical_path": self.critical_path.critical_path() if self.critical_path is not None else [],
+            "rule_matches": rule_matches,
+            "recommended_actions": self._generate_recommendations(
+                urgent_items, opportunities, conflicts, critical, rule_matches
+            )
         }
     
-    def _generate_recommendations(self, urgent, opportunities, conflicts):
-        recommendations = []
+    def _learned(self, kind: str, action: str, client: Optional[str]) -> float:
+        return self.learner.score(kind, action, client) if self.learner is not None else 0.5
+    
+    def _importance(self, *node_ids: str) -> float:
+        """Graph centrality of the most central of the nodes; 1.0 is an average node"""
+        if self.centrality is None or not node_ids:
+            return 1.0
+        return max(map(self.centrality.score, node_ids))
+    
+    def _schedule(self, *node_ids: str, default: str) -> Tuple[str, Optional[float]]:
+        """Estimated time and least slack (hours) of the tasks behind a recommendation"""
+        infos = [self.critical_path.info(n) for n in node_ids] if self.critical_path is not None else []
+        infos = [i for i in infos if i]
+        if not infos:
+            return default, None
+        hours = sum(i["duration_hours"] for i in infos)
+        estimate = f"{round(hours * 60)} minutes" if hours < 2 else f"{hours:.1f} hours"
+        slacks = [i["slack_hours"] for i in infos if i["slack_hours"] is not None]
+        return estimate, min(slacks) if slacks else None
+    
+    def _generate_recommendations(self, urgent, opportunities, conflicts, critical=(), rule_matches=()):
+        candidates = []
         
         # Handle urgent items first
-        for item in urgent[:3]:  # Top 3 urgent
-            recommendations.append({
+        for item in urgent:
+            node = item["node"]
+            estimate, slack = self._schedule(node.id, default="30-60 minutes")
+            candidates.append({
                 "priority": 1,
-                "action": f"Handle {item['node'].data.get('title', item['node'].id)}",
+                "kind": "handle_urgent",
+                "action": f"Handle {node.data.get('title', node.id)}",
                 "reason": f"Status: {item['urgency']}",
-                "estimated_time": "30-60 minutes"
+                "estimated_time": estimate,
+                "slack_hours": slack,
+                "client": node.data.get("client"),
+                "urgency": item["urgency"],
+                "importance": self._importance(node.id)
+            })
+        
+        # Work with no slack left is as pressing as a near deadline, even when its own deadline is far
+        urgent_ids = {item["node"].id for item in urgent}
+        for item in critical:
+            node = item["node"]
+            if node.id in urgent_ids or not item["startable"]:
+                continue
+            candidates.append({
+                "priority": 1,
+                "kind": "critical_path",
+                "action": f"Start {node.data.get('title', node.id)}",
+                "reason": f"On the critical path ({item['slack_hours']}h slack)",
+                "estimated_time": self._schedule(node.id, default="Variable")[0],
+                "slack_hours": item["slack_hours"],
+                "client": node.data.get("client"),
+                "importance": self._importance(node.id)
+            })
+        
+        # Rules carry their own priority
+        for match in rule_matches:
+            nodes = [n for n in map(self.graph.get_node, match["matched"].values()) if n]
+            clients = {n.data.get("client") for n in nodes} - {None}
+            candidates.append({
+                "priority": match["priority"],
+                "kind": f"rule:{match['action']}",
+                "action": match["message"],
+                "reason": f"Rule {match['rule']} matched",
+                "estimated_time": self._schedule(*(n.id for n in nodes), default="Variable")[0],
+                "slack_hours": None,
+                "client": clients.pop() if len(clients) == 1 else None,
+                "importance": self._importance(*(n.id for n in nodes))
             })
         
         # Then conflicts
-        for conflict in conflicts[:2]:  # Top 2 conflicts
-            recommendations.append({
+        for conflict in conflicts:
+            if conflict["type"] == "schedule":
+                first, second = conflict["items"]
+                candidates.append({
+                    "priority": 2,
+                    "kind": "resolve_conflict",
+                    "action": conflict["suggestion"],
+                    "reason": "Overlapping commitments",
+                    "estimated_time": "5-15 minutes",
+                    "slack_hours": None,
+                    "client": first.data.get("client") or second.data.get("client"),
+                    "importance": self._importance(first.id, second.id)
+                })
+                continue
+            estimate, slack = self._schedule(conflict["blocker"].id, default="15-30 minutes")
+            candidates.append({
                 "priority": 2,
+                "kind": "resolve_conflict",
                 "action": conflict["suggestion"],
                 "reason": "Unblocking dependent tasks",
-                "estimated_time": "15-30 minutes"
+                "estimated_time": estimate,
+                "slack_hours": slack,
+                "client": conflict["blocked"].data.get("client"),
+                "importance": self._importance(conflict["blocker"].id)
             })
         
         # Then opportunities
-        for opp in opportunities[:1]:  # Top opportunity
-            recommendations.append({
+        for opp in opportunities:
+            clients = {t.data.get("client") for t in opp["tasks"]}
+            estimate, slack = self._schedule(*(t.id for t in opp["tasks"]), default="Variable")
+            candidates.append({
                 "priority": 3,
+                "kind": "batch_tasks",
                 "action": opp["suggestion"],
                 "reason": "Efficiency optimization",
-                "estimated_time": "Variable"
+                "estimated_time": estimate,
+                "slack_hours": slack,
+                "client": clients.pop() if len(clients) == 1 else None,
+                "importance": self._importance(*(t.id for t in opp["tasks"]))
             })
         
+        # Within a tier, zero-slack work comes first and overdue still precedes critical;
+        # then what has worked before, weighted by how much of the graph depends on the item
+        for rec in candidates:
+            rec["learned_success"] = round(self._learned(rec["kind"], rec["action"], rec["client"]), 3)
+            rec["importance"] = round(rec["importance"], 3)
+        urgency_rank = {"overdue": 0, "critical": 1}
+        candidates.sort(key=lambda r: (
+            r["priority"],
+            r["slack_hours"] is None or r["slack_hours"] > 0,
+            urgency_rank.get(r.get("urgency"), 2),
+            -r["learned_success"] * math.log1p(r["importance"])
+        ))
+        
+        limits = {1: 3, 2: 2, 3: 1}
+        recommendations = []
+        for rec in candidates:
+            if limits[rec["priority"]] > 0:
+                limits[rec["priority"]] -= 1
+                recommendations.append(rec)
+        
         return recommendations
 
 # ==================== Main Life Orchestrator ====================
 
 class LifeOrchestrator:
-    def __init__(self):
-        self.graph = ContextGraph()
+    def __init__(self, graph: Optional[GraphStore] = None):
+        self.graph: GraphStore = graph if graph is not None else ContextGraph()
         self.memory = MemoryBank()
-        self.decision_engine = DecisionEngine(self.graph, self.memory)
+        self.notifications: deque = deque(maxlen=500)
+        self.scheduler = DeadlineScheduler(URGENCY_BUCKETS, on_transition=self._on_urgency_change)
+        self.clusterer = TaskClusterer()
+        self.learner = PatternLearner()
+        self.centrality = CentralityIndex()
+        self.critical_path = CriticalPathScheduler()
+        self.intervals = IntervalIndex()
+        self.partitions = PartitionIndex()
+        self.rules = RuleEngine()
+        # Fires when a rule's within_days window opens on a node attribute; items are (node id, attribute)
+        self.rule_timers = DeadlineScheduler([], on_transition=self._on_rule_window)
+        self._rule_time_attrs: Set[str] = set()
+        self.decision_engine = DecisionEngine(
+            self.graph, self.memory, self.scheduler, self.clusterer, self.learner, self.centrality,
+            self.critical_path, self.intervals, self.rules
+        )
+        self.text_index = InvertedIndex()
+        self.extractor = EntityExtractor()
+        self.semantic_index = SemanticIndex()
+        self.feed = ChangeFeed(recommender=self._current_recommendations)
+        # Runs recommended actions off the request path; finished ones are written to episodic memory
+        self.actions = ActionExecutor(on_result=self._on_action_result)
+        # Content keys of ingested payloads, so retries and re-sends are skipped
+        self.seen = SeenSet()
         self.is_running = False
+        # Bumped on urgency transitions, which change the analysis without touching the graph
+        self._urgency_version = 0
+        # Bumped when rules are added or removed, for the same reason
+        self._rules_version = 0
+        # Rule activations of the perceive call in progress, reported as its insights
+        self._rule_insights: Optional[List[Dict[str, Any]]] = None
+        # Set while applying state another process shared, so it is not written back
+        self._applying_shared = False
+        
+        # Nodes added since the last relationship pass
+        self._new_nodes: List[ContextNode] = []
+        # Recently recommended actions -> (kind, client), so feedback quoting only the action text can be attributed
+        self._recent_actions: "OrderedDict[str, Tuple[str, Optional[str]]]" = OrderedDict()
+        self._semantic_pending: List[str] = []
+        self._semantic_task: Optional[asyncio.Task] = None
+        self._scheduler_task: Optional[asyncio.Task] = None
+        self._rule_timer_task: Optional[asyncio.Task] = None
+        self._feed_task: Optional[asyncio.Task] = None
+        self._sync_task: Optional[asyncio.Task] = None
+        self._archive_task: Optional[asyncio.Task] = None
+        # Partition id -> (stamp, summary); a summary is recomputed only when its partition changed
+        self._partition_cache: Dict[str, Tuple[int, Dict[str, Any]]] = {}
+        
+        self.graph.subscribe(self._track_deadlines)
+        self.graph.subscribe(self._track_tasks)
+        self.graph.subscribe(self._track_centrality)
+        self.graph.subscribe(self._track_intervals)
+        self.graph.subscribe(self._track_partitions)
+        self.graph.subscribe(self._track_rules)
+        self.graph.subscribe(self._track_semantic)
+        self.graph.subscribe(self._track_shared)
+        self.graph.subscribe(self.feed.on_graph_event)
+        if self.tiered:
+            self.graph.on_rehydrate = self._on_rehydrated
         
         logger.info("Life Orchestrator initialized")
     
+    async def start(self):
+        """Start background work: the deadline scheduler, the live change feed, change sync and archival"""
+        if self.is_running:
+            return
+        self.is_running = True
+        loop = asyncio.get_running_loop()
+        self._scheduler_task = loop.create_task(self.scheduler.run())
+        self._rule_timer_task = loop.create_task(self.rule_timers.run())
+        self._feed_task = loop.create_task(self.feed.run())
+        self._sync_task = loop.create_task(self._follow_changes())
+        if self.tiered:
+            self._archive_task = loop.create_task(self._archive_periodically())
+    
+    async def stop(self):
+        self.is_running = False
+        await self.actions.shutdown()
+        for task in (self._scheduler_task, self._rule_timer_task, self._feed_task, self._semantic_task,
+                     self._sync_task, self._archive_task):
+            if task and not task.done():
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._scheduler_task = None
+        self._rule_timer_task = None
+        self._feed_task = None
+        self._sync_task = None
+        self._archive_task = None
+    
+    def sync_changes(self) -> int:
+        """Apply graph writes made by other processes sharing the store; returns how many were applied.
+        
+        Scheduler, clusters and the change feed follow through their graph listeners;
+        the text search and entity indexes are updated here.
+        """
+        changes = self.graph.poll_changes()
+        for event, payload in changes:
+            if event == "bulk_loaded":
+                self.rebuild_indexes()
+                if self.shared:
+                    self.load_shared()
+            elif event in ("node_added", "node_updated"):
+                self._index_derived(payload)
+            elif event == "node_removed":
+                self.text_index.remove(payload.id)
+        return len(changes)
+    
+    async def _follow_changes(self, interval: float = 0.5):
+        while True:
+            try:
+                self.sync_changes()
+            except Exception as e:
+                logger.error(f"Change sync failed: {e}")
+            await asyncio.sleep(interval)
+    
+    @property
+    def shared(self) -> bool:
+        """Whether the graph store shares rules, feedback and memory with other processes"""
+        return getattr(self.graph, "update_shared", None) is not None
+    
+    def _share(self, key: str, value: Any):
+        if self.shared and not self._applying_shared:
+            self.graph.put_shared(key, value)
+    
+    def _track_shared(self, event: str, payload: Any):
+        """Graph listener applying rules, feedback and memory another process shared"""
+        if event == "shared_changed":
+            self._apply_shared(payload, self.graph.get_shared(payload))
+    
+    def load_shared(self):
+        """Apply everything shared through the store so far, e.g. when a worker starts"""
+        for key, value in self.graph.iter_shared():
+            self._apply_shared(key, value)
+    
+    def _apply_shared(self, key: str, value: Any):
+        # Keys are "rule:<name>", "learner" and "memory:<entry>"; values are to_dict-style JSON
+        self._applying_shared = True
+        try:
+            kind, _, name = key.partition(":")
+            if kind == "rule":
+                if value is None:
+                    self.remove_rule(name)
+                elif getattr(self.rules.rules.get(name), "definition", None) != value:
+                    self.add_rule(value)
+            elif kind == "learner" and value is not None:
+                self._set_learner(PatternLearner.from_dict(value))
+            elif kind == "memory" and value is not None:
+                self.memory.load_dict(value)
+        except ValueError as e:
+            logger.warning(f"Skipping shared {key}: {e}")
+        finally:
+            self._applying_shared = False
+    
+    def _set_learner(self, learner: PatternLearner):
+        self.learner = learner
+        self.decision_engine.learner = learner
+    
+    @property
+    def tiered(self) -> bool:
+        """Whether the graph has a cold tier to archive to"""
+        return getattr(self.graph, "archived", None) is not None
+    
+    def archive_inactive(self, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """Move finished and stale nodes with their edges to the cold tier"""
+        if not self.tiered:
+            raise ValueError("The configured graph has no cold tier")
+        candidates = self._archive_candidates(now or datetime.now())
+        # Their vectors go with the node_removed events; semantic links are already edges
+        archived = self.graph.archive(candidates)
+        return {"candidates": len(candidates), "archived": archived, "tiers": self.graph.stats()}
+    
+    def _archive_candidates(self, now: datetime) -> List[str]:
+        done_before = now - ARCHIVE_DONE_AFTER
+        stale_before = now - ARCHIVE_STALE_AFTER
+        candidates = []
+        for node in self.graph.iter_nodes():
+            if node.type == EntityType.PERSON:
+                continue
+            if node.status in CriticalPathScheduler.DONE_STATUSES:
+                inactive = node.updated_at < done_before
+            elif node.type == EntityType.DOCUMENT:
+                inactive = (parse_time(node.data.get("received")) or node.updated_at) < stale_before
+            elif node.type in (EntityType.EVENT, EntityType.DEADLINE):
+                window = self._commitment_window(node)
+                inactive = window is not None and window[1] < stale_before and node.updated_at < stale_before
+            else:
+                inactive = False
+            if inactive and not self._feeds_open_task(node.id):
+                candidates.append(node.id)
+        return candidates
+    
+    def _feeds_open_task(self, node_id: str) -> bool:
+        """Linked to a task still being worked on, which keeps it in the analysis"""
+        for other_id in self.graph.linked_ids(node_id):
+            other = self.graph.get_node(other_id)
+            if other is not None and other.type == EntityType.TASK and \
+                    other.status not in CriticalPathScheduler.DONE_STATUSES:
+                return True
+        return False
+    
+    def _on_rehydrated(self, node: ContextNode):
+        self._register(node)
+        self.semantic_index.add(node.id, node.data)
+    
+    async def _archive_periodically(self, interval: float = ARCHIVE_INTERVAL_SECONDS):
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                result = self.archive_inactive()
+                if result["archived"]:
+                    logger.info(f"Archived {result['archived']} inactive nodes")
+            except Exception as e:
+                logger.error(f"Archival failed: {e}")
+    
+    def _current_recommendations(self) -> List[Dict[str, Any]]:
+        return self.decision_engine.analyze_situation({})["recommended_actions"]
+    
+    def _track_deadlines(self, event: str, payload: Any):
+        """Graph listener keeping the scheduler in step with deadline-bearing nodes"""
+        if event == "node_removed":
+            self.scheduler.unschedule(payload.id)
+        elif event in ("node_added", "node_updated"):
+            deadline = parse_deadline(payload)
+            if deadline is not None:
+                self.scheduler.schedule(payload.id, deadline)
+            else:
+                self.scheduler.unschedule(payload.id)
+    
+    def state_version(self) -> Tuple[int, ...]:
+        """Changes whenever anything decide() or the state endpoints report may have changed"""
+        return (
+            self.graph.version,
+            self._urgency_version,
+            self._rules_version,
+            len(self.memory.short_term),
+            len(self.memory.long_term),
+            len(self.memory.episodic),
+            len(self.memory.patterns)
+        )
+    
+    def memory_structures(self) -> Dict[str, Any]:
+        """The long-lived structures memory grows in, by name, for memory reports"""
+        structures: Dict[str, Any] = {}
+        # Whichever of these the graph backend keeps in memory
+        for name in ("nodes", "edges", "adjacency", "index", "attribute_index", "deadlines", "history", "_cache"):
+            value = getattr(self.graph, name, None)
+            if value is not None:
+                structures[f"graph.{name.lstrip('_')}"] = value
+        if self.tiered:
+            structures["graph.archived_ids"] = self.graph.archived
+        structures.update({
+            "memory.short_term": self.memory.short_term,
+            "memory.long_term": self.memory.long_term,
+            "memory.episodic": self.memory.episodic,
+            "memory.patterns": self.memory.patterns,
+            "notifications": self.notifications,
+            "seen": self.seen,
+            "text_index": self.text_index,
+            "semantic_index": self.semantic_index,
+            "extractor": self.extractor,
+            "scheduler": self.scheduler,
+            "clusterer": self.clusterer,
+            "learner": self.learner,
+            "centrality": self.centrality,
+            "critical_path": self.critical_path,
+            "intervals": self.intervals,
+            "partitions": self.partitions,
+            "partition_cache": self._partition_cache,
+            "rules": self.rules,
+            "feed": self.feed,
+            "actions": self.actions,
+            "recent_actions": self._recent_actions,
+            "pending.relationships": self._new_nodes,
+            "pending.semantic": self._semantic_pending
+        })
+        return structures
+    
+    def _track_tasks(self, event: str, payload: Any):
+        """Graph listener keeping task clusters and the critical path in step with tasks and their dependencies"""
+        if event == "node_removed":
+            self.clusterer.remove(payload.id)
+            self.critical_path.remove(payload.id)
+        elif event in ("node_added", "node_updated") and payload.type == EntityType.TASK:
+            text = "\n".join(str(payload.data[k]) for k in ("title", "description", "notes") if payload.data.get(k))
+            client = payload.data.get("client")
+            deadline = parse_deadline(payload)
+            self.clusterer.update(
+                payload.id, text,
+                client=client if isinstance(client, str) else None,
+                deadline=deadline,
+                status=payload.status
+            )
+            self.critical_path.update(payload.id, task_duration(payload.data), deadline, payload.status)
+        elif event == "edge_added" and payload.type == RelationType.BLOCKS:
+            self.clusterer.add_dependency(payload.to_node, payload.from_node)
+            self.critical_path.add_dependency(payload.to_node, payload.from_node)
+    
+    def _track_centrality(self, event: str, payload: Any):
+        """Graph listener feeding node and edge changes to the centrality scores"""
+        if event == "node_added":
+            self.centrality.add_node(payload.id)
+        elif event == "node_removed":
+            self.centrality.remove_node(payload.id)
+        elif event == "edge_added":
+            self.centrality.add_edge(payload.from_node, payload.to_node, payload.type.value, payload.strength)
+    
+    def _track_intervals(self, event: str, payload: Any):
+        """Graph listener keeping the interval index in step with open commitments"""
+        if event == "node_removed":
+            self.intervals.remove(payload.id)
+        elif event in ("node_added", "node_updated"):
+            window = self._commitment_window(payload)
+            if window is not None and payload.status not in CriticalPathScheduler.DONE_STATUSES:
+                self.intervals.add(payload.id, window[0], window[1], payload.type.value)
+            else:
+                self.intervals.remove(payload.id)
+    
+    def _track_partitions(self, event: str, payload: Any):
+        """Graph listener keeping connected components in step with the graph"""
+        if event == "node_added":
+            self.partitions.add_node(payload.id)
+        elif event == "node_updated":
+            self.partitions.touch(payload.id)
+        elif event == "node_removed":
+            self.partitions.remove_node(payload.id)
+        elif event == "edge_added":
+            self.partitions.add_edge(payload.from_node, payload.to_node)
+    
+    def _track_rules(self, event: str, payload: Any):
+        """Graph listener feeding node and edge changes to the rule network"""
+        if not self.rules.rules:
+            return
+        if event in ("node_added", "node_updated"):
+            fired = self.rules.assert_fact(payload.id, "node", payload.type.value, self._rule_fact(payload))
+            self._time_rule_windows(payload)
+        elif event == "edge_added":
+            fired = self.rules.assert_fact(*self._edge_fact(payload))
+        elif event == "node_removed":
+            self.rules.retract_fact(payload.id)
+            self._time_rule_windows(payload, removed=True)
+            return
+        else:
+            return
+        for activation in fired:
+            self._on_rule_fired(activation)
+    
+    def _time_rule_windows(self, node: ContextNode, removed: bool = False):
+        """Keep a timer at each time attribute a within_days test reads, to re-assert the node when its window opens"""
+        for attr in self._rule_time_attrs:
+            moment = None if removed else parse_time(node.data.get(attr))
+            key = (node.id, attr)
+            if moment is None:
+                self.rule_timers.unschedule(key)
+            elif self.rule_timers.deadlines.get(key) != moment:
+                # The fact was just asserted against the current time; only later openings matter
+                self.rule_timers.schedule(key, moment, notify=False)
+    
+    def _on_rule_window(self, transition: Dict[str, Any]):
+        node = self.graph.get_node(transition["item_id"][0])
+        if node is not None:
+            self._track_rules("node_updated", node)
+    
+    def _refresh_rule_windows(self):
+        """Follow the within_days tests of the compiled rules after rules were added or removed"""
+        windows = self.rules.time_windows()
+        self._rule_time_attrs = set(windows)
+        for key in list(self.rule_timers.deadlines):
+            if key[1] not in windows:
+                self.rule_timers.unschedule(key)
+        days = sorted(set().union(*windows.values()))
+        self.rule_timers.set_buckets([(f"within_{d:g}d", timedelta(days=d)) for d in days])
+        if windows:
+            for node in self.graph.iter_nodes():
+                self._time_rule_windows(node)
+    
+    def _track_semantic(self, event: str, payload: Any):
+        """Graph listener dropping the vectors of removed nodes, so semantic links never point at them"""
+        if event == "node_removed":
+            self.semantic_index.remove(payload.id)
+    
+    def _rule_fact(self, node: ContextNode) -> Dict[str, Any]:
+        """What rule conditions on a node can test: its data plus id, type, status and urgency"""
+        return {
+            **node.data,
+            "id": node.id,
+            "type": node.type.value,
+            "status": node.status,
+            "urgency": self.scheduler.current.get(node.id)
+        }
+    
+    @staticmethod
+    def _edge_fact(edge: ContextEdge) -> Tuple[str, str, str, Dict[str, Any]]:
+        attrs = {**edge.metadata, "from": edge.from_node, "to": edge.to_node, "type": edge.type.value,
+                 "strength": edge.strength}
+        return f"{edge.from_node}|{edge.type.value}|{edge.to_node}", "edge", edge.type.value, attrs
+    
+    def _rule_source(self, kind: str, fact_type: Optional[str]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Current facts of a kind and type, for matching a newly added rule against the graph"""
+        if kind == "edge":
+            relations = [RelationType(fact_type)] if fact_type else None
+            for edge in self.graph.iter_edges(relations):
+                fact_id, _, _, attrs = self._edge_fact(edge)
+                yield fact_id, attrs
+        else:
+            for node in self.graph.iter_nodes([EntityType(fact_type)] if fact_type else None):
+                yield node.id, self._rule_fact(node)
+    
+    def add_rule(self, definition: Dict[str, Any]) -> Dict[str, Any]:
+        """Compile a user rule; matches that already hold are listed, not fired"""
+        for condition in definition.get("when") or []:
+            try:
+                if "edge" in condition:
+                    RelationType(condition["edge"])
+                elif condition.get("type"):
+                    EntityType(condition["type"])
+            except ValueError as e:
+                raise ValueError(f"Rule {definition.get('name')}: {e}")
+        rule = self.rules.add_rule(definition, self._rule_source)
+        self._rules_version += 1
+        self._refresh_rule_windows()
+        self._share(f"rule:{rule['name']}", definition)
+        return rule
+    
+    def remove_rule(self, name: str) -> bool:
+        removed = self.rules.remove_rule(name)
+        if removed:
+            self._rules_version += 1
+            self._refresh_rule_windows()
+            self._share(f"rule:{name}", None)
+        return removed
+    
+    def _on_rule_fired(self, activation: Dict[str, Any]):
+        self.notifications.append(activation)
+        self.feed.on_rule_fired(activation)
+        if self._rule_insights is not None:
+            self._rule_insights.append(activation)
+        logger.info(f"Rule {activation['rule']} fired: {activation['message']}")
+    
+    @staticmethod
+    def _commitment_window(node: ContextNode) -> Optional[Tuple[datetime, datetime]]:
+        """The time a node occupies: an event's slot, a scheduled or estimated task, the run-up to a deadline"""
+        if node.type == EntityType.EVENT:
+            start = parse_time(node.data.get("start"))
+            if start:
+                return start, parse_time(node.data.get("end")) or start + timedelta(minutes=PLAN_EVENT_MINUTES)
+        elif node.type == EntityType.TASK:
+            start = parse_time(node.data.get("start"))
+            if start:
+                return start, parse_time(node.data.get("end")) or start + timedelta(hours=task_duration(node.data))
+            deadline = parse_deadline(node)
+            # Only an explicit estimate says how long before the deadline the work has to happen
+            if deadline and any(k in node.data for k in ("estimated_hours", "duration_hours", "estimated_minutes")):
+                return deadline - timedelta(hours=task_duration(node.data)), deadline
+        elif node.type == EntityType.DEADLINE:
+            deadline = parse_deadline(node)
+            if deadline:
+                return deadline - timedelta(minutes=DEADLINE_WINDOW_MINUTES), deadline
+        return None
+    
+    def _on_urgency_change(self, transition: Dict[str, Any]):
+        self._urgency_version += 1
+        node = self.graph.get_node(transition["item_id"])
+        notification = {
+            "type": "urgency_changed",
+            **transition,
+            "title": node.data.get("title", node.id) if node else transition["item_id"]
+        }
+        self.notifications.append(notification)
+        self.feed.on_urgency_change(notification)
+        # Rules may test urgency, so the node is matched again in its new bucket
+        if node is not None:
+            self._track_rules("node_updated", node)
+        if transition["to"]:
+            logger.info(f"Urgency change: {notification['title']} is now {transition['to']}")
+    
     async def perceive(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """Process new information and update internal state"""
         perception_result = {
             "received": input_data,
             "processed_nodes": [],
             "new_edges": [],
-            "insights": []
+            "insights": [],
+            "duplicates": []
         }
         
-        # Process different types of input
-        if "email" in input_data:
-            node = self._process_email(input_data["email"])
-            perception_result["processed_nodes"].append(node)
-        
-        if "task" in input_data:
-            node = self._process_task(input_data["task"])
-            perception_result["processed_nodes"].append(node)
+        # Rules fired by this input are its insights
+        self._rule_insights = perception_result["insights"]
+        try:
+            self._perceive_input(input_data, perception_result)
+        finally:
+            self._rule_insights = None
         
-        if "deadline" in input_data:
-            node = self._process_deadline(input_data["deadline"])
+        return perception_result
+    
+    def _perceive_input(self, input_data: Dict[str, Any], perception_result: Dict[str, Any]):
+        """Turn the input into nodes and link them"""
+        # Process different types of input; payloads seen before resolve to their existing node
+        processors = (("email", self._process_email), ("task", self._process_task), ("deadline", self._process_deadline))
+        for kind, process in processors:
+            if kind not in input_data:
+                continue
+            node = self._find_duplicate(kind, input_data[kind])
+            if node is not None:
+                perception_result["duplicates"].append(node.id)
+            else:
+                node = process(input_data[kind])
             perception_result["processed_nodes"].append(node)
         
         # Auto-detect relationships
         self._detect_relationships()
+        self._link_semantic()
+    
+    async def ingest_emails(self, emails: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Batch ingest: process every new email, then run a single relationship pass"""
+        nodes, duplicates = [], 0
+        insights: List[Dict[str, Any]] = []
+        self._rule_insights = insights
+        try:
+            for email_data in emails:
+                node = self._find_duplicate("email", email_data)
+                if node is None:
+                    node = self._process_email(email_data)
+                else:
+                    duplicates += 1
+                nodes.append(node)
+            self._detect_relationships()
+        finally:
+            self._rule_insights = None
         
-        return perception_result
+        # Embedding is the slow part of ingest; run it in the background so batches return quickly
+        if self._semantic_task is None or self._semantic_task.done():
+            self._semantic_task = asyncio.get_running_loop().create_task(self.drain_semantic_queue())
+        
+        return {
+            "ingested": len(nodes) - duplicates,
+            "duplicates": duplicates,
+            "node_ids": [n.id for n in nodes],
+            "insights": insights
+        }
+    
+    def _find_duplicate(self, kind: str, payload: Dict[str, Any]) -> Optional[ContextNode]:
+        """The node an identical earlier payload produced, if it is still in the graph"""
+        node_id = self.seen.get(content_key(kind, payload))
+        return self.graph.get_node(node_id) if node_id else None
+    
+    def _add_node(self, node: ContextNode):
+        """Add a node and queue it for the next relationship pass"""
+        self.graph.add_node(node)
+        self._new_nodes.append(node)
     
     def _process_email(self, email_data: Dict) -> ContextNode:
         """Process email and extract relevant information"""
+        key = content_key("email", email_data)
+        # Without an explicit id the content hash is the id, so a resend maps to the same node
+        email_id = email_data.get("id") or key[:16]
+        subject = email_data.get("subject", "")
+        content = email_data.get("content", "")
         node = ContextNode(
-            id=f"email_{datetime.now().timestamp()}",
+            id=f"email_{email_id}",
             type=EntityType.DOCUMENT,
             data={
-                "subject": email_data.get("subject", ""),
+                "subject": subject,
                 "from": email_data.get("from", ""),
-                "content": email_data.get("content", ""),
-                "received": datetime.now().isoformat()
+                "content": content,
+                # Imported archives carry the original date
+                "received": email_data.get("received") or datetime.now().isoformat(),
+                "content_hash": key
             }
         )
-        
-        self.graph.add_node(node)
+        if email_data.get("message_id"):
+            node.data["message_id"] = email_data["message_id"]
         
         # Extract entities from email
-        if "deadline" in email_data.get("content", "").lower():
-            # Create deadline node
+        extracted = self.extractor.extract(f"{subject}\n{content}")
+        clients = [e["name"] for e in extracted["entities"] if e["kind"] == "client"]
+        if clients:
+            node.data["client"] = clients[0]
+        if extracted["amounts"]:
+            node.data["amounts"] = extracted["amounts"]
+        
+        self._add_node(node)
+        self.seen.add(key, node.id)
+        self.text_index.add(node.id, self._email_text(node))
+        
+        sender = self._ensure_person(node.data["from"])
+        if sender:
+            self._link(node.id, sender.id, "sender")
+        
+        for entity in extracted["entities"]:
+            if entity["node_id"] != node.id and self.graph.has_node(entity["node_id"]):
+                self._link(node.id, entity["node_id"], "mentioned")
+        
+        # Dates become deadlines when the email talks about one, otherwise events
+        for i, date in enumerate(extracted["dates"]):
+            if extracted["mentions_deadline"]:
+                item = ContextNode(
+                    id=f"deadline_{node.id}_{i}",
+                    type=EntityType.DEADLINE,
+                    data={"deadline": date, "title": subject, "source": node.id, "extracted": True}
+                )
+                if extracted["amounts"]:
+                    item.data["amount"] = extracted["amounts"][0]["value"]
+            else:
+                item = ContextNode(
+                    id=f"event_{node.id}_{i}",
+                    type=EntityType.EVENT,
+                    data={"start": date, "title": subject, "source": node.id, "extracted": True}
+                )
+            if clients:
+                item.data["client"] = clients[0]
+            self._add_node(item)
+            self._link(node.id, item.id, "extracted")
+        
+        if extracted["mentions_deadline"] and not extracted["dates"]:
+            # Deadline mentioned without a recognizable date
             deadline_node = ContextNode(
-                id=f"deadline_{datetime.now().timestamp()}",
+                id=f"deadline_{node.id}",
                 type=EntityType.DEADLINE,
                 data={"source": node.id, "extracted": True}
             )
-            self.graph.add_node(deadline_node)
-            self.graph.add_edge(ContextEdge(
-                from_node=node.id,
-                to_node=deadline_node.id,
-                type=RelationType.RELATED
-            ))
+            self._add_node(deadline_node)
+            self._link(node.id, deadline_node.id, "extracted")
         
         return node
     
+    def _ensure_person(self, address_field: str) -> Optional[ContextNode]:
+        """Find or create the PERSON node for an email address"""
+        name, address = parseaddr(address_field or "")
+        if not address:
+            return None
+        
+        person_id = f"person_{address.lower()}"
+        person = self.graph.get_node(person_id)
+        if person is None:
+            person = ContextNode(
+                id=person_id,
+                type=EntityType.PERSON,
+                data={"name": name or address, "email": address.lower()}
+            )
+            self._add_node(person)
+        return person
+    
+    def _link(self, from_id: str, to_id: str, reason: str):
+        # Re-ingesting an email with changed content must not link the same pair again
+        if any(to_id in (e.from_node, e.to_node) for e in self.graph.neighbors(from_id, [RelationType.RELATED])):
+            return
+        self.graph.add_edge(ContextEdge(
+            from_node=from_id,
+            to_node=to_id,
+            type=RelationType.RELATED,
+            metadata={"reason": reason}
+        ))
+    
     def _process_task(self, task_data: Dict) -> ContextNode:
         """Process task information"""
+        key = content_key("task", task_data)
         node = ContextNode(
-            id=f"task_{task_data.get('id', datetime.now().timestamp())}",
+            id=f"task_{task_data.get('id', key[:16])}",
             type=EntityType.TASK,
-            data=task_data
+            data={**task_data, "content_hash": key},
+            status=str(task_data.get("status") or "active")
         )
         
-        self.graph.add_node(node)
+        self._add_node(node)
+        self.seen.add(key, node.id)
         
         # Check for dependencies
         if "depends_on" in task_data:
             for dep_id in task_data["depends_on"]:
+                if self.critical_path.would_cycle(node.id, dep_id):
+                    logger.warning(f"Ignoring dependency of {node.id} on {dep_id}: it would close a cycle")
+                    continue
                 self.graph.add_edge(ContextEdge(
                     from_node=dep_id,
                     to_node=node.id,
@@ -353,51 +1834,329 @@ class LifeOrchestrator:
         
         return node
     
+    def set_status(self, node_id: str, status: str) -> Optional[ContextNode]:
+        """Mark an item done, cancelled, reopened...; None when there is no such node"""
+        if not self.graph.has_node(node_id):
+            return None
+        return self.graph.update_node(node_id, data={"status": status}, status=status)
+    
     def _process_deadline(self, deadline_data: Dict) -> ContextNode:
         """Process deadline information"""
+        key = content_key("deadline", deadline_data)
         node = ContextNode(
-            id=f"deadline_{deadline_data.get('id', datetime.now().timestamp())}",
+            id=f"deadline_{deadline_data.get('id', key[:16])}",
             type=EntityType.DEADLINE,
-            data=deadline_data
+            data={**deadline_data, "content_hash": key},
+            status=str(deadline_data.get("status") or "active")
         )
         
-        self.graph.add_node(node)
+        self._add_node(node)
+        self.seen.add(key, node.id)
         self.memory.store(f"deadline_{node.id}", deadline_data, "long")
+        self._share(f"memory:long_term:deadline_{node.id}", self.memory.item_dict(f"deadline_{node.id}", "long"))
         
         return node
     
     def _detect_relationships(self):
-        """Automatically detect relationships between nodes"""
-        nodes_list = list(self.graph.nodes.values())
+        """Link nodes added since the last pass to related existing nodes"""
+        new_nodes, self._new_nodes = self._new_nodes, []
         
-        for i, node1 in enumerate(nodes_list):
-            for node2 in nodes_list[i+1:]:
-                # Check for same person/entity
-                if node1.data.get("client") == node2.data.get("client"):
-                    self.graph.add_edge(ContextEdge(
-                        from_node=node1.id,
-                        to_node=node2.id,
-                        type=RelationType.RELATED,
-                        metadata={"reason": "same_client"}
-                    ))
+        for node in new_nodes:
+            # A re-ingested node is a new version; do not link it to the same peers twice
+            linked = self.graph.linked_ids(node.id)
+            linked.add(node.id)
+            
+            # Check for same person/entity
+            client = node.data.get("client")
+            if client:
+                for other in self.graph.find_by_attribute("client", client, limit=MAX_RELATED_PER_KEY + 1):
+                    other_id = other.id
+                    if other_id not in linked:
+                        linked.add(other_id)
+                        self.graph.add_edge(ContextEdge(
+                            from_node=other_id,
+                            to_node=node.id,
+                            type=RelationType.RELATED,
+                            metadata={"reason": "same_client"}
+                        ))
+            
+            # Check for temporal proximity; the nearest deadlines on either side are the candidates
+            deadline = parse_deadline(node)
+            if deadline:
+                window = timedelta(days=2)
+                candidates = self.graph.deadline_range(deadline, deadline + window, limit=MAX_RELATED_PER_KEY + 1) + \
+                    self.graph.deadline_range(deadline - window, deadline, limit=MAX_RELATED_PER_KEY + 1, descending=True)
                 
-                # Check for temporal proximity
-                if "deadline" in node1.data and "deadline" in node2.data:
-                    d1 = datetime.fromisoformat(node1.data["deadline"])
-                    d2 = datetime.fromisoformat(node2.data["deadline"])
-                    
-                    if abs((d1 - d2).days) <= 1:
+                timeframe_links = 0
+                for other in candidates:
+                    other_id = other.id
+                    if other_id in linked:
+                        continue
+                    other_deadline = parse_deadline(other)
+                    if abs((deadline - other_deadline).days) <= 1:
+                        linked.add(other_id)
                         self.graph.add_edge(ContextEdge(
-                            from_node=node1.id,
-                            to_node=node2.id,
+                            from_node=other_id,
+                            to_node=node.id,
                             type=RelationType.RELATED,
                             metadata={"reason": "same_timeframe"}
                         ))
+                        timeframe_links += 1
+                        if timeframe_links >= MAX_RELATED_PER_KEY:
+                            break
+            
+            # Overlapping commitments; the listener has already filed this node's window
+            if node.id in self.intervals:
+                conflicting = {
+                    e.to_node if e.from_node == node.id else e.from_node
+                    for e in self.graph.neighbors(node.id, [RelationType.CONFLICTS])
+                }
+                for other_id, start, end, _ in self.intervals.overlaps_of(node.id, limit=MAX_RELATED_PER_KEY):
+                    if other_id in conflicting:
+                        continue
+                    own_start, own_end = self.intervals.get(node.id)
+                    self.graph.add_edge(ContextEdge(
+                        from_node=other_id,
+                        to_node=node.id,
+                        type=RelationType.CONFLICTS,
+                        metadata={
+                            "reason": "overlapping_time",
+                            "overlap_start": max(start, own_start).isoformat(),
+                            "overlap_end": min(end, own_end).isoformat()
+                        }
+                    ))
+            
+            self._register(node)
+            self._semantic_pending.append(node.id)
+    
+    def _link_semantic(self, limit: Optional[int] = None) -> int:
+        """Embed queued nodes and link each to sufficiently similar existing nodes"""
+        batch = self._semantic_pending[:limit] if limit else self._semantic_pending
+        self._semantic_pending = self._semantic_pending[len(batch):]
+        
+        for node_id in batch:
+            node = self.graph.get_node(node_id)
+            if node is None or not self.semantic_index.add(node_id, node.data):
+                continue
+            
+            already_linked = self.graph.linked_ids(node_id)
+            for other_id, similarity in self.semantic_index.similar(node_id, SEMANTIC_NEIGHBORS):
+                if similarity < SEMANTIC_THRESHOLD or other_id in already_linked:
+                    continue
+                self.graph.add_edge(ContextEdge(
+                    from_node=other_id,
+                    to_node=node_id,
+                    type=RelationType.RELATED,
+                    strength=similarity,
+                    metadata={"reason": "semantic", "similarity": similarity}
+                ))
+        return len(batch)
+    
+    async def drain_semantic_queue(self, chunk: int = 200):
+        """Process the semantic queue in chunks, yielding to the event loop in between"""
+        while self._semantic_pending:
+            self._link_semantic(chunk)
+            await asyncio.sleep(0)
+    
+    def suggest_related(self, node_id: str, k: int = SEMANTIC_NEIGHBORS) -> List[Dict[str, Any]]:
+        """Semantically similar nodes that are not linked to node_id yet"""
+        linked = self.graph.linked_ids(node_id)
+        suggestions = []
+        for other_id, similarity in self.semantic_index.similar(node_id, k + len(linked)):
+            other = self.graph.get_node(other_id) if similarity > 0 and other_id not in linked else None
+            if other is not None:
+                suggestions.append({"node": other.to_dict(), "similarity": similarity})
+        return suggestions[:k]
+    
+    def semantic_search(self, text: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """Nodes whose content is closest in meaning to the given text"""
+        results = []
+        for node_id, similarity in self.semantic_index.search(text, limit):
+            node = self.graph.get_node(node_id) if similarity > 0 else None
+            if node is not None:
+                results.append({"node": node.to_dict(), "similarity": similarity})
+        return results
+    
+    def _register(self, node: ContextNode):
+        """Make a node's names known to entity extraction"""
+        client = node.data.get("client")
+        if client:
+            self.extractor.add_entity(client, node.id, "client")
+        
+        if node.type == EntityType.PERSON:
+            self.extractor.add_entity(node.data.get("name", ""), node.id, "person")
+    
+    def rebuild_indexes(self, text_index: Optional[InvertedIndex] = None):
+        """Rebuild the in-memory indexes derived from the graph.
+        
+        Needed after a bulk load, or when opening a store that already holds data;
+        pass a persisted text index to skip re-tokenizing every email.
+        """
+        self.text_index = text_index or InvertedIndex()
+        self.clusterer.clear()
+        self.critical_path.clear()
+        self.centrality.clear()
+        self.intervals.clear()
+        self.partitions.clear()
+        self._partition_cache.clear()
+        self.rules.clear_facts()
+        track_rules = bool(self.rules.rules)
+        for edge in self.graph.iter_edges():
+            self._track_tasks("edge_added", edge)
+            self._track_centrality("edge_added", edge)
+            self._track_partitions("edge_added", edge)
+            if track_rules:
+                self.rules.assert_fact(*self._edge_fact(edge), fire=False)
+        for node in self.graph.iter_nodes():
+            deadline = parse_deadline(node)
+            if deadline is not None:
+                # The buckets loaded items already sit in are not transitions: no notifications or rule firings
+                self.scheduler.schedule(node.id, deadline, notify=False)
+            self._track_tasks("node_added", node)
+            self._track_centrality("node_added", node)
+            self._track_intervals("node_added", node)
+            self._track_partitions("node_added", node)
+            if track_rules:
+                # Matches already present in the loaded graph are not news
+                self.rules.assert_fact(node.id, "node", node.type.value, self._rule_fact(node), fire=False)
+                self._time_rule_windows(node)
+            self._index_derived(node, text=text_index is None)
+        # A cold start is the expensive refresh; do it here rather than in the first decide()
+        self.centrality.refresh()
+        logger.info(f"Rebuilt indexes for {self.graph.node_count()} nodes")
+    
+    def partition_summaries(self, min_size: int = 2, limit: int = 50) -> Dict[str, Any]:
+        """Life areas: connected parts of the graph, largest first, each summarized from its own nodes.
+        
+        Summaries are cached per partition and only partitions changed since the
+        last call are recomputed.
+        """
+        ids = self.partitions.partitions()
+        live = set(ids)
+        for stale in [pid for pid in self._partition_cache if pid not in live]:
+            del self._partition_cache[stale]
+        
+        recomputed = 0
+        summaries = []
+        for pid in ids:
+            if len(self.partitions.members[pid]) < min_size or len(summaries) >= limit:
+                continue
+            stamp = self.partitions.stamps[pid]
+            cached = self._partition_cache.get(pid)
+            if cached is None or cached[0] != stamp:
+                cached = (stamp, self._summarize_partition(pid))
+                self._partition_cache[pid] = cached
+                recomputed += 1
+            summaries.append(cached[1])
+        
+        return {
+            "partitions": summaries,
+            "total": len(ids),
+            "singletons": sum(1 for pid in ids if len(self.partitions.members[pid]) == 1),
+            "recomputed": recomputed
+        }
+    
+    def _summarize_partition(self, partition_id: str) -> Dict[str, Any]:
+        types: Dict[str, int] = {}
+        clients: Dict[str, int] = {}
+        open_tasks = 0
+        members = self.partitions.members[partition_id]
+        for node in filter(None, map(self.graph.get_node, members)):
+            types[node.type.value] = types.get(node.type.value, 0) + 1
+            client = node.data.get("client")
+            if isinstance(client, str):
+                clients[client] = clients.get(client, 0) + 1
+            if node.type == EntityType.TASK and node.status not in CriticalPathScheduler.DONE_STATUSES:
+                open_tasks += 1
+        top_clients = sorted(clients, key=lambda c: -clients[c])[:3]
+        return {
+            "partition_id": partition_id,
+            "label": top_clients[0] if top_clients else max(types, key=types.get, default=partition_id),
+            "size": len(members),
+            "types": types,
+            "clients": top_clients,
+            "open_tasks": open_tasks,
+            "urgent": sum(1 for m in members if m in self.scheduler.current and self.scheduler.current[m])
+        }
+    
+    def _index_derived(self, node: ContextNode, text: bool = True):
+        """Entity, semantic, dedupe and text indexes for a node written elsewhere"""
+        self._register(node)
+        self.semantic_index.add(node.id, node.data)
+        if "content_hash" in node.data:
+            self.seen.add(node.data["content_hash"], node.id)
+        if text and node.type == EntityType.DOCUMENT:
+            self.text_index.add(node.id, self._email_text(node))
+    
+    @staticmethod
+    def _email_text(node: ContextNode) -> str:
+        return "\n".join(str(node.data.get(k, "")) for k in ("subject", "from", "content"))
+    
+    def search_emails(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """BM25-ranked search over ingested email subjects, senders and content.
+        
+        Archived emails are read from the cold tier in place; only opening one brings it back.
+        """
+        results = []
+        for node_id, score in self.text_index.search(query, limit):
+            node = self.graph.read_node(node_id) if self.tiered else self.graph.get_node(node_id)
+            if node:
+                result = {"node": node.to_dict(), "score": score}
+                if self.tiered and node_id in self.graph.archived:
+                    result["archived"] = True
+                results.append(result)
+        return results
+    
+    def save_state(self, path: str):
+        """Persist graph, text index, memory, learner and rules to a JSON file"""
+        state = {
+            "saved_at": datetime.now().isoformat(),
+            "nodes": [n.to_dict() for n in self.graph.iter_nodes()],
+            "edges": [e.to_dict() for e in self.graph.iter_edges()],
+            "text_index": self.text_index.to_dict(),
+            "memory": self.memory.to_dict(),
+            "learner": self.learner.to_dict(),
+            "rules": [rule.definition for rule in self.rules.rules.values()]
+        }
+        
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f, ensure_ascii=False, default=str)
+        os.replace(tmp_path, path)
+        logger.info(f"Saved state to {path}: {len(state['nodes'])} nodes, {len(state['edges'])} edges")
+    
+    def load_state(self, path: str) -> bool:
+        """Load state written by save_state; returns False when no state file exists"""
+        if not os.path.exists(path):
+            return False
+        
+        with open(path, encoding="utf-8") as f:
+            state = json.load(f)
+        
+        # Edges were persisted, so indexes are rebuilt without a relationship pass
+        self.graph.bulk_load(
+            (ContextNode.from_dict(n) for n in state.get("nodes", [])),
+            (ContextEdge.from_dict(e) for e in state.get("edges", []))
+        )
+        self.rebuild_indexes(InvertedIndex.from_dict(state["text_index"]) if "text_index" in state else None)
+        if "memory" in state:
+            self.memory.load_dict(state["memory"])
+        if "learner" in state:
+            self._set_learner(PatternLearner.from_dict(state["learner"]))
+        for definition in state.get("rules", []):
+            try:
+                self.add_rule(definition)
+            except ValueError as e:
+                logger.warning(f"Skipping saved rule: {e}")
+        
+        logger.info(f"Loaded state from {path}: {self.graph.node_count()} nodes, {self.graph.edge_count()} edges")
+        return True
     
     async def decide(self) -> Dict[str, Any]:
         """Make decisions based on current state"""
         analysis = self.decision_engine.analyze_situation({
-            "graph_state": len(self.graph.nodes),
+            "graph_state": self.graph.node_count(),
             "memory_state": len(self.memory.short_term)
         })
         
@@ -407,37 +2166,172 @@ class LifeOrchestrator:
             "confidence": 0.85
         }
     
+    def plan_day(self, budget_hours: Optional[float] = None, blocks: Optional[List[Dict[str, Any]]] = None,
+                 day_start: Optional[datetime] = None, day_end: Optional[datetime] = None,
+                 time_limit: float = 0.05) -> Dict[str, Any]:
+        """Pack urgent, central and low-slack work into today's free time.
+        
+        `blocks` are extra busy periods ({"start", "end", "title"}); events in the graph
+        that fall on the day are busy as well. The budget defaults to all free time.
+        Without an explicit day, once today's working hours are over (or today is not a
+        working day) the plan is for the next working day. A given day that has already
+        ended gets an empty plan with a reason.
+        """
+        now = datetime.now()
+        if day_start is None:
+            day_start = now.replace(hour=PLAN_DAY_HOURS[0], minute=0, second=0, microsecond=0)
+            if day_end is None:
+                while day_start.weekday() not in PLAN_WORK_DAYS or \
+                        now >= day_start.replace(hour=PLAN_DAY_HOURS[1]):
+                    day_start += timedelta(days=1)
+        day_end = day_end or day_start.replace(hour=PLAN_DAY_HOURS[1], minute=0, second=0, microsecond=0)
+        reason = None
+        if day_end <= now:
+            reason = "The planned day is already over"
+            day_start = day_end
+        elif day_start < now:
+            # Planning mid-day: only what is left of it, from the next five-minute mark
+            day_start = min(day_end, now.replace(second=0, microsecond=0) + timedelta(minutes=5 - now.minute % 5))
+        
+        busy = []
+        for block in blocks or []:
+            start, end = parse_time(block.get("start")), parse_time(block.get("end"))
+            if start and end and start < end:
+                busy.append((start, end, block.get("title", "busy")))
+        for item_id, start, end, kind in self.intervals.overlapping(day_start, day_end):
+            if kind == EntityType.EVENT.value:
+                event = self.graph.get_node(item_id)
+                busy.append((start, end, event.data.get("title", item_id) if event else item_id))
+        windows = free_windows(day_start, day_end, [(s, e) for s, e, _ in busy])
+        free_minutes = int(sum((e - s).total_seconds() for s, e in windows) // 60)
+        budget = free_minutes if budget_hours is None else min(free_minutes, int(budget_hours * 60))
+        
+        candidates = self._plan_candidates(now)
+        plan = pack(candidates, windows, budget, time_limit)
+        for slot in plan["slots"]:
+            node = self.graph.get_node(slot["item_id"])
+            slot["title"] = node.data.get("title", node.id) if node else slot["item_id"]
+        
+        return {
+            "day_start": day_start,
+            "day_end": day_end,
+            "budget_minutes": budget,
+            "free_minutes": free_minutes,
+            "busy": [{"start": s, "end": e, "title": t} for s, e, t in sorted(busy, key=lambda b: b[0])],
+            **plan,
+            **({"reason": reason} if reason else {})
+        }
+    
+    def _plan_candidates(self, now: datetime) -> List[Candidate]:
+        """Open tasks, and urgent items that are not tasks, valued by urgency, slack and centrality"""
+        timestamp = now.timestamp()
+        paths = self.critical_path
+        urgency = self.scheduler.current
+        candidates = []
+        for task_id, seconds in paths.duration.items():
+            value, reasons = 1.0, []
+            if task_id in urgency and urgency[task_id] in PLAN_URGENCY_VALUE:
+                value += PLAN_URGENCY_VALUE[urgency[task_id]]
+                reasons.append(urgency[task_id])
+            slack = paths.slack(task_id, timestamp)
+            if slack is not None:
+                if slack <= 0:
+                    value += PLAN_NO_SLACK_VALUE
+                    reasons.append("no slack")
+                else:
+                    value += PLAN_NO_SLACK_VALUE / (1 + slack / 24)
+            importance = self.centrality.score(task_id)
+            value += math.log1p(importance)
+            if importance >= 2:
+                reasons.append("others depend on it")
+            deadline = paths.deadline.get(task_id)
+            candidates.append(Candidate(
+                item_id=task_id,
+                minutes=max(5, round(seconds / 60)),
+                value=value,
+                deadline=datetime.fromtimestamp(deadline) if deadline is not None else None,
+                blockers=tuple(paths.open_blockers(task_id)),
+                reasons=reasons
+            ))
+        
+        for item_id in self.scheduler.items_in("overdue", "critical"):
+            if item_id not in paths.duration:
+                candidates.append(Candidate(
+                    item_id=item_id,
+                    minutes=PLAN_ITEM_MINUTES,
+                    value=1.0 + PLAN_URGENCY_VALUE[urgency[item_id]],
+                    reasons=[urgency[item_id]]
+                ))
+        return candidates
+    
     async def act(self, decision: Dict[str, Any]) -> Dict[str, Any]:
-        """Execute actions based on decisions"""
+        """Hand recommended actions to the executor; returns at once with each action's current status"""
         actions_taken = []
         
         for recommendation in decision.get("analysis", {}).get("recommended_actions", []):
-            action_result = {
-                "action": recommendation["action"],
-                "status": "simulated",  # In real system, would execute
-                "timestamp": datetime.now().isoformat()
-            }
-            actions_taken.append(action_result)
+            record = self.actions.submit(recommendation)
+            actions_taken.append(self.action_view(record))
             
-            # Store action in episodic memory
-            self.memory.episodic.append(action_result)
+            self._recent_actions[record["action"]] = (record["kind"], record["client"])
+            self._recent_actions.move_to_end(record["action"])
+            if len(self._recent_actions) > 1000:
+                self._recent_actions.popitem(last=False)
         
         return {"actions_taken": actions_taken}
     
+    def register_action_handler(self, kind: str, handler: Handler, **policy: Any):
+        """Execute actions of a kind with handler; policy takes ActionPolicy fields (concurrency, timeout, ...)"""
+        self.actions.register(kind, handler, ActionPolicy(**policy) if policy else None)
+    
+    @staticmethod
+    def action_view(record: Dict[str, Any]) -> Dict[str, Any]:
+        return {k: v for k, v in record.items() if k not in ("payload", "submitted")}
+    
+    def _on_action_result(self, record: Dict[str, Any]):
+        # Store the outcome in episodic memory
+        view = self.action_view(record)
+        self.memory.episodic.append(view)
+        self._share(f"memory:episodic:{record['id']}", {"episodic": [view]})
+    
     async def learn(self, feedback: Dict[str, Any]):
         """Learn from feedback and update patterns"""
         # Extract patterns from feedback
         if "success" in feedback:
             pattern_key = f"pattern_{datetime.now().date()}"
             
-            if pattern_key not in self.memory.patterns:
-                self.memory.patterns[pattern_key] = []
-            
-            self.memory.patterns[pattern_key].append({
+            entry = {
                 "action": feedback.get("action"),
                 "success": feedback["success"],
-                "context": feedback.get("context", {})
-            })
+                "context": feedback.get("context", {}),
+                "timestamp": datetime.now().isoformat()
+            }
+            self.memory.add_pattern(pattern_key, entry)
+            if self.shared:
+                # One capped value for every worker, appended to under the write lock
+                def add_pattern(stored: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+                    memory = MemoryBank()
+                    memory.load_dict(stored or {})
+                    memory.add_pattern(pattern_key, entry)
+                    return {"patterns": memory.patterns}
+                
+                self.graph.update_shared("memory:patterns", add_pattern)
+            
+            action = feedback.get("action")
+            known_kind, known_client = self._recent_actions.get(action, (None, None))
+            context = feedback.get("context") or {}
+            kind = feedback.get("kind") or known_kind or "other"
+            client = feedback.get("client") or context.get("client") or known_client
+            if not self.shared:
+                self.learner.observe(kind, bool(feedback["success"]), action=action, client=client)
+                return
+            
+            # Other workers learn too: fold the feedback into the stored counters under the write lock
+            def observe(stored: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+                learner = PatternLearner.from_dict(stored) if stored else self.learner
+                learner.observe(kind, bool(feedback["success"]), action=action, client=client)
+                return learner.to_dict()
+            
+            self._set_learner(PatternLearner.from_dict(self.graph.update_shared("learner", observe)))
     
     async def process_message(self, message: str, context: Dict[str, Any]) -> Dict[str, Any]:
         """Main entry point for processing user messages"""
@@ -465,8 +2359,8 @@ class LifeOrchestrator:
             "decision": decision,
             "actions": actions,
             "graph_state": {
-                "nodes": len(self.graph.nodes),
-                "edges": len(self.graph.edges)
+                "nodes": self.graph.node_count(),
+                "edges": self.graph.edge_count()
             },
             "memory_state": {
                 "short_term": len(self.memory.short_term),
@@ -492,10 +2386,22 @@ class LifeOrchestrator:
         
         return response
 
-# Create global instance
-orchestrator = LifeOrchestrator()
+# Shared instance for process_request, built on first use so importing this module stays cheap
+_default_orchestrator: Optional[LifeOrchestrator] = None
+
+def _shared_orchestrator() -> LifeOrchestrator:
+    global _default_orchestrator
+    if _default_orchestrator is None:
+        _default_orchestrator = LifeOrchestrator()
+    return _default_orchestrator
+
+def __getattr__(name: str):
+    # `from life_orchestrator import orchestrator` still works, without an instance per import
+    if name == "orchestrator":
+        return _shared_orchestrator()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # FastAPI integration
 async def process_request(message: str, context: Dict = None) -> Dict:
     """Process incoming request through orchestrator"""
-    return await orchestrator.process_message(message, context or {})
+    return await _shared_orchestrator().process_message(message, context or {})
@@ -0,0 +1,249 @@
+"""
+Mailbox Import - Streams local mbox files and Maildir folders into the graph
+============================================================================
+An mbox file is memory-mapped and split on its "From " separator lines; a
+Maildir folder is listed with scandir and read one message file at a time,
+so neither is ever loaded whole. Raw messages are parsed into the payloads
+/ingest/email accepts by a pool of worker processes, with a bounded number
+of batches in flight, and each parsed batch goes to
+LifeOrchestrator.ingest_emails. The importer's memory stays flat however
+large the archive is; progress and throughput are reported per batch.
+"""
+
+import os
+import re
+import sys
+import mmap
+import time
+import asyncio
+import logging
+import argparse
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from email import message_from_bytes, policy
+from email.utils import parsedate_to_datetime
+from typing import Dict, Any, List, Iterator, Optional, Tuple, Callable
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 500
+# Parsed bodies are cut to this many characters; the text index and extraction gain little beyond it
+MAX_CONTENT_CHARS = 20000
+MAILDIR_FOLDERS = ("cur", "new")
+
+# mboxrd quoting: body lines starting with ">From ", ">>From ", ... lose one ">"
+QUOTED_FROM = re.compile(rb"^>(>*From )", re.MULTILINE)
+HTML_TAG = re.compile(r"<[^>]+>")
+
+# ==================== Readers ====================
+
+def iter_mbox(path: str) -> Iterator[Tuple[bytes, int]]:
+    """Raw messages of an mbox file with the offset each one ends at"""
+    with open(path, "rb") as f:
+        try:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty file
+            return
+        with data:
+            size = len(data)
+            start = 0 if data[:5] == b"From " else data.find(b"\nFrom ") + 1
+            if start == 0 and data[:5] != b"From ":
+                return
+            while start < size:
+                # Skip the envelope line; the message runs up to the next separator
+                body = data.find(b"\n", start) + 1
+                if body == 0:
+                    return
+                end = data.find(b"\nFrom ", body - 1)
+                end = size if end < 0 else end + 1
+                yield data[body:end], end
+                start = end
+
+def iter_maildir(path: str) -> Iterator[Tuple[bytes, int]]:
+    """Raw messages of a Maildir folder with the bytes read so far"""
+    consumed = 0
+    for folder in MAILDIR_FOLDERS:
+        directory = os.path.join(path, folder)
+        if not os.path.isdir(directory):
+            continue
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if not entry.is_file() or entry.name.startswith("."):
+                    continue
+                with open(entry.path, "rb") as f:
+                    raw = f.read()
+                consumed += len(raw)
+                yield raw, consumed
+
+def source_size(path: str) -> int:
+    """Bytes to read, for progress; a Maildir is stat-ed but not read"""
+    if not os.path.isdir(path):
+        return os.path.getsize(path)
+    total = 0
+    for folder in MAILDIR_FOLDERS:
+        directory = os.path.join(path, folder)
+        if os.path.isdir(directory):
+            with os.scandir(directory) as entries:
+                total += sum(e.stat().st_size for e in entries if e.is_file() and not e.name.startswith("."))
+    return total
+
+def _raw_batches(path: str, batch_size: int) -> Iterator[Tuple[List[bytes], int]]:
+    messages = iter_maildir(path) if os.path.isdir(path) else iter_mbox(path)
+    batch, position = [], 0
+    for raw, position in messages:
+        batch.append(raw)
+        if len(batch) >= batch_size:
+            yield batch, position
+            batch = []
+    if batch:
+        yield batch, position
+
+# ==================== Parsing ====================
+
+def parse_message(raw: bytes, quoted: bool = False) -> Optional[Dict[str, Any]]:
+    """An email payload as /ingest/email takes it, or None when the message cannot be parsed"""
+    try:
+        if quoted:
+            raw = QUOTED_FROM.sub(rb"\1", raw)
+        message = message_from_bytes(raw, policy=policy.default)
+        part = message.get_body(preferencelist=("plain", "html"))
+        content = part.get_content() if part is not None else ""
+        if part is not None and part.get_content_type() == "text/html":
+            content = HTML_TAG.sub(" ", content)
+        payload = {
+            "subject": str(message.get("subject", "") or ""),
+            "from": str(message.get("from", "") or ""),
+            "content": content.strip()[:MAX_CONTENT_CHARS]
+        }
+        if message.get("date"):
+            try:
+                payload["received"] = parsedate_to_datetime(str(message["date"])).isoformat()
+            except (TypeError, ValueError):
+                pass
+        if message.get("message-id"):
+            payload["message_id"] = str(message["message-id"]).strip()
+        return payload
+    except Exception:
+        return None
+
+def parse_batch(raws: List[bytes], quoted: bool = False) -> List[Optional[Dict[str, Any]]]:
+    """Worker-process entry point: one call per batch keeps pickling overhead low"""
+    return [parse_message(raw, quoted) for raw in raws]
+
+# ==================== Import ====================
+
+async def import_mailbox(orchestrator, path: str, workers: Optional[int] = None, batch_size: int = BATCH_SIZE,
+                         progress: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+    """Stream an mbox file or Maildir folder into the orchestrator; returns the final progress"""
+    if not os.path.exists(path):
+        raise FileNotFoundError(path)
+    workers = workers or min(4, os.cpu_count() or 1)
+    mbox = not os.path.isdir(path)
+    status: Dict[str, Any] = {
+        "source": path,
+        "format": "mbox" if mbox else "maildir",
+        "bytes_total": source_size(path),
+        "bytes_read": 0,
+        "messages": 0,
+        "ingested": 0,
+        "duplicates": 0,
+        "failed": 0,
+        "insights": 0,
+        "elapsed_s": 0.0,
+        "messages_per_s": 0.0,
+        "mb_per_s": 0.0,
+        "done": False
+    }
+    started = time.perf_counter()
+    loop = asyncio.get_running_loop()
+    batches = _raw_batches(path, batch_size)
+
+    async def finish(job: asyncio.Future, position: int):
+        parsed = await job
+        emails = [p for p in parsed if p is not None]
+        result = await orchestrator.ingest_emails(emails) if emails else {"ingested": 0, "duplicates": 0, "insights": []}
+        elapsed = time.perf_counter() - started
+        status["bytes_read"] = position
+        status["messages"] += len(parsed)
+        status["failed"] += len(parsed) - len(emails)
+        status["ingested"] += result["ingested"]
+        status["duplicates"] += result["duplicates"]
+        status["insights"] += len(result["insights"])
+        status["elapsed_s"] = round(elapsed, 2)
+        status["messages_per_s"] = round(status["messages"] / elapsed, 1) if elapsed else 0.0
+        status["mb_per_s"] = round(position / elapsed / 2 ** 20, 2) if elapsed else 0.0
+        if progress:
+            progress(dict(status))
+
+    # Reading and parsing overlap with ingest, but only a few batches are ever held at once
+    pending: deque = deque()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        while True:
+            batch = await asyncio.to_thread(next, batches, None)
+            if batch is None:
+                break
+            raws, position = batch
+            pending.append((loop.run_in_executor(pool, parse_batch, raws, mbox), position))
+            if len(pending) >= workers * 2:
+                await finish(*pending.popleft())
+        while pending:
+            await finish(*pending.popleft())
+
+    status["done"] = True
+    status["bytes_read"] = status["bytes_total"] if mbox else status["bytes_read"]
+    if progress:
+        progress(dict(status))
+    logger.info(
+        f"Imported {status['ingested']} emails ({status['duplicates']} duplicates, {status['failed']} unreadable) "
+        f"from {path} in {status['elapsed_s']}s"
+    )
+    return status
+
+# ==================== CLI ====================
+
+def _print_progress(status: Dict[str, Any]):
+    share = status["bytes_read"] / status["bytes_total"] * 100 if status["bytes_total"] else 100.0
+    print(
+        f"\r{share:5.1f}%  {status['messages']} messages  {status['ingested']} new  "
+        f"{status['messages_per_s']} msg/s  {status['mb_per_s']} MB/s",
+        end="\n" if status["done"] else "", file=sys.stderr, flush=True
+    )
+
+async def _run(args) -> Dict[str, Any]:
+    from life_orchestrator import LifeOrchestrator
+    if args.db:
+        from sqlite_store import SQLiteGraphStore
+        orchestrator = LifeOrchestrator(graph=SQLiteGraphStore(args.db))
+        orchestrator.rebuild_indexes()
+    else:
+        orchestrator = LifeOrchestrator()
+        orchestrator.load_state(args.state)
+    status = await import_mailbox(
+        orchestrator, args.source, workers=args.workers, batch_size=args.batch_size,
+        progress=None if args.quiet else _print_progress
+    )
+    if args.state:
+        orchestrator.save_state(args.state)
+    return status
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Import an mbox file or Maildir folder into orchestrator state")
+    parser.add_argument("source", help="mbox file or Maildir folder (with cur/ and new/)")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--state", help="JSON state file written by save_state; created if missing")
+    target.add_argument("--db", help="SQLite graph database")
+    parser.add_argument("--workers", type=int, default=None, help="Parser processes (default: up to 4)")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="Messages per ingest batch")
+    parser.add_argument("--quiet", action="store_true", help="No progress line")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    status = asyncio.run(_run(args))
+    print(
+        f"import: {status['ingested']} emails, {status['duplicates']} duplicates, {status['failed']} unreadable "
+        f"in {status['elapsed_s']}s ({status['messages_per_s']} msg/s)"
+    )
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,198 @@
+"""
+Memory Report - Approximate sizes of in-memory structures and allocation diffs
+==============================================================================
+deep_size walks the objects a structure holds and adds up sys.getsizeof.
+Containers longer than the sample size are measured on evenly spaced items
+and extrapolated, so a report over a large graph costs milliseconds rather
+than a full walk. Functions, classes, modules, event loops and futures are
+not followed: they lead back to the whole application, not to the data.
+
+AllocationTracker starts and stops tracemalloc, keeps a few snapshots and
+diffs them, which points at the source lines that allocated the growth.
+"""
+
+import gc
+import os
+import sys
+import types
+import asyncio
+import sqlite3
+import itertools
+import tracemalloc
+import logging
+from collections import OrderedDict, deque
+from datetime import datetime
+from enum import Enum
+from typing import Dict, Any, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Container items measured before extrapolating
+SAMPLE_SIZE = 200
+MAX_DEPTH = 64
+MAX_SNAPSHOTS = 4
+
+ATOMIC = (str, bytes, bytearray, int, float, complex, bool, type(None), datetime)
+OPAQUE = (
+    type, types.ModuleType, types.FunctionType, types.MethodType, types.BuiltinFunctionType,
+    asyncio.AbstractEventLoop, asyncio.Future, sqlite3.Connection, Enum
+)
+SEQUENCES = (list, tuple, set, frozenset, deque)
+
+# ==================== Sizes ====================
+
+def _sampled(items, length: int, sample: int):
+    """Evenly spaced items and the factor that scales their total to the whole container"""
+    if length <= sample:
+        return items, 1.0
+    step = length // sample
+    return itertools.islice(items, 0, None, step), length / len(range(0, length, step))
+
+def deep_size(obj: Any, sample: int = SAMPLE_SIZE, seen: Optional[Set[int]] = None) -> int:
+    """Approximate bytes reachable from obj; objects already in `seen` are not counted again"""
+    seen = set() if seen is None else seen
+
+    def size(o: Any, depth: int) -> float:
+        if id(o) in seen or isinstance(o, OPAQUE):
+            return 0
+        seen.add(id(o))
+        total = sys.getsizeof(o)
+        if isinstance(o, ATOMIC) or depth >= MAX_DEPTH:
+            return total
+        if isinstance(o, dict):
+            items, scale = _sampled(iter(o.items()), len(o), sample)
+            return total + scale * sum(size(k, depth + 1) + size(v, depth + 1) for k, v in items)
+        if isinstance(o, SEQUENCES):
+            items, scale = _sampled(iter(o), len(o), sample)
+            return total + scale * sum(size(item, depth + 1) for item in items)
+        if hasattr(o, "__dict__"):
+            total += size(vars(o), depth + 1)
+        for name in getattr(type(o), "__slots__", ()):
+            total += size(getattr(o, name, None), depth + 1)
+        return total
+
+    return int(size(obj, 0))
+
+def _count(obj: Any) -> Optional[int]:
+    try:
+        return len(obj)
+    except TypeError:
+        return None
+
+def measure(structures: Dict[str, Any], sample: int = SAMPLE_SIZE,
+            exclude: Tuple[Any, ...] = ()) -> List[Dict[str, Any]]:
+    """Size and item count of each named structure, largest first.
+
+    Each structure is walked on its own, so objects shared between two (an
+    edge in both the edge list and the adjacency lists) count in both.
+    Within a sampled container, objects its items share are scaled up with
+    the sample, so heavily shared structures read somewhat high.
+    """
+    report = []
+    for name, obj in structures.items():
+        seen = {id(o) for o in exclude}
+        report.append({"name": name, "count": _count(obj), "bytes": deep_size(obj, sample, seen)})
+    report.sort(key=lambda entry: -entry["bytes"])
+    return report
+
+def process_memory() -> Dict[str, Any]:
+    """Resident set size now and at its peak, where the platform reports them"""
+    usage: Dict[str, Any] = {"rss_bytes": None, "peak_rss_bytes": None, "gc_objects": len(gc.get_objects())}
+    try:
+        with open("/proc/self/statm") as f:
+            usage["rss_bytes"] = int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Kilobytes on Linux, bytes on macOS
+        usage["peak_rss_bytes"] = peak if sys.platform == "darwin" else peak * 1024
+    except ImportError:
+        pass
+    return usage
+
+# ==================== Allocation tracking ====================
+
+class AllocationTracker:
+    """tracemalloc snapshots taken on demand and compared by source line"""
+
+    GROUPINGS = ("lineno", "filename", "traceback")
+
+    def __init__(self, max_snapshots: int = MAX_SNAPSHOTS):
+        self.max_snapshots = max_snapshots
+        self.snapshots: "OrderedDict[int, Tuple[datetime, tracemalloc.Snapshot]]" = OrderedDict()
+        self._ids = itertools.count(1)
+
+    def start(self, frames: int = 1) -> Dict[str, Any]:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(max(1, frames))
+            logger.info(f"tracemalloc started with {frames} frames")
+        return self.status()
+
+    def stop(self) -> Dict[str, Any]:
+        """Stop tracing; snapshots taken so far can no longer be compared with the live heap"""
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+            logger.info("tracemalloc stopped")
+        return self.status()
+
+    def status(self) -> Dict[str, Any]:
+        tracing = tracemalloc.is_tracing()
+        current, peak = tracemalloc.get_traced_memory() if tracing else (0, 0)
+        return {
+            "tracing": tracing,
+            "frames": tracemalloc.get_traceback_limit() if tracing else None,
+            "traced_bytes": current,
+            "traced_peak_bytes": peak,
+            "overhead_bytes": tracemalloc.get_tracemalloc_memory() if tracing else 0,
+            "snapshots": [{"id": sid, "taken_at": taken.isoformat()} for sid, (taken, _) in self.snapshots.items()]
+        }
+
+    def _take(self) -> tracemalloc.Snapshot:
+        if not tracemalloc.is_tracing():
+            raise ValueError("tracemalloc is not running; start it first")
+        return tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<unknown>")
+        ))
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Keep a snapshot of traced allocations; the oldest goes once more than max_snapshots are held"""
+        snapshot = self._take()
+        sid = next(self._ids)
+        self.snapshots[sid] = (datetime.now(), snapshot)
+        while len(self.snapshots) > self.max_snapshots:
+            self.snapshots.popitem(last=False)
+        return {"id": sid, "taken_at": self.snapshots[sid][0].isoformat(),
+                "traced_bytes": sum(stat.size for stat in snapshot.statistics("filename"))}
+
+    def diff(self, since: int, until: Optional[int] = None, group_by: str = "lineno",
+             limit: int = 25) -> Dict[str, Any]:
+        """Largest allocation changes between two kept snapshots, or since one of them until now"""
+        if group_by not in self.GROUPINGS:
+            raise ValueError(f"group_by must be one of {', '.join(self.GROUPINGS)}")
+        for sid in (since, until):
+            if sid is not None and sid not in self.snapshots:
+                raise KeyError(sid)
+        before_at, before = self.snapshots[since]
+        after_at, after = self.snapshots[until] if until is not None else (datetime.now(), self._take())
+
+        stats = after.compare_to(before, group_by)
+        return {
+            "since": {"id": since, "taken_at": before_at.isoformat()},
+            "until": {"id": until, "taken_at": after_at.isoformat()},
+            "size_diff_bytes": sum(stat.size_diff for stat in stats),
+            "count_diff": sum(stat.count_diff for stat in stats),
+            "top": [
+                {
+                    "location": [f"{frame.filename}:{frame.lineno}" for frame in stat.traceback],
+                    "size_diff_bytes": stat.size_diff,
+                    "size_bytes": stat.size,
+                    "count_diff": stat.count_diff,
+                    "count": stat.count
+                }
+                for stat in stats[:max(1, limit)]
+            ]
+        }
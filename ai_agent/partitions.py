@@ -0,0 +1,132 @@
+"""
+Graph Partitions - Connected components maintained as the graph changes
+=======================================================================
+Edges are merged into components with union-find (union by size, path
+halving), so adding nodes and edges is near O(1). Removing a node may split
+its component, which union-find cannot undo; the component is marked dirty
+and only it is re-partitioned by a breadth-first walk on the next read.
+
+Every component carries a stamp that changes whenever something inside it
+does, so work done per partition can be cached and redone only for the
+partitions a mutation touched.
+"""
+
+import itertools
+from collections import deque
+from typing import Dict, List, Set, Optional
+
+class PartitionIndex:
+    """Fed by the orchestrator's graph listener, like the task clusterer"""
+
+    def __init__(self):
+        self._stamps = itertools.count(1)
+        self.clear()
+
+    def __len__(self):
+        self.refresh()
+        return len(self.members)
+
+    def clear(self):
+        self.adjacency: Dict[str, Set[str]] = {}
+        self._parent: Dict[str, str] = {}
+        self.members: Dict[str, Set[str]] = {}
+        self.stamps: Dict[str, int] = {}
+        self._dirty: Set[str] = set()
+        # Removed ids stay in the union-find forest until their component is re-partitioned
+        self._removed: Set[str] = set()
+
+    # ---------- updates ----------
+
+    def add_node(self, node_id: str):
+        if node_id in self._removed:
+            self.refresh()
+        if node_id not in self._parent:
+            self._parent[node_id] = node_id
+            self.adjacency[node_id] = set()
+            self.members[node_id] = {node_id}
+            self.stamps[node_id] = next(self._stamps)
+
+    def add_edge(self, a: str, b: str):
+        if a == b:
+            return
+        self.add_node(a)
+        self.add_node(b)
+        self.adjacency[a].add(b)
+        self.adjacency[b].add(a)
+        root_a, root_b = self._find(a), self._find(b)
+        if root_a == root_b:
+            return
+        if len(self.members[root_a]) < len(self.members[root_b]):
+            root_a, root_b = root_b, root_a
+        self._parent[root_b] = root_a
+        self.members[root_a] |= self.members.pop(root_b)
+        del self.stamps[root_b]
+        self.stamps[root_a] = next(self._stamps)
+        if root_b in self._dirty:
+            self._dirty.discard(root_b)
+            self._dirty.add(root_a)
+
+    def touch(self, node_id: str):
+        """Something about the node changed; its partition's cached work is stale"""
+        if node_id in self._parent and node_id not in self._removed:
+            self.stamps[self._find(node_id)] = next(self._stamps)
+
+    def remove_node(self, node_id: str):
+        if node_id not in self._parent or node_id in self._removed:
+            return
+        root = self._find(node_id)
+        for other in self.adjacency.pop(node_id, ()):
+            self.adjacency[other].discard(node_id)
+        self.members[root].discard(node_id)
+        self.stamps[root] = next(self._stamps)
+        self._removed.add(node_id)
+        self._dirty.add(root)
+
+    # ---------- union-find ----------
+
+    def _find(self, node_id: str) -> str:
+        parent = self._parent
+        while parent[node_id] != node_id:
+            parent[node_id] = parent[parent[node_id]]
+            node_id = parent[node_id]
+        return node_id
+
+    def refresh(self):
+        """Re-partition the components that lost nodes since the last refresh"""
+        if not self._dirty:
+            return
+        for root in self._dirty:
+            remaining = self.members.pop(root, set())
+            self.stamps.pop(root, None)
+            while remaining:
+                start = remaining.pop()
+                component = {start}
+                queue = deque([start])
+                while queue:
+                    for other in self.adjacency[queue.popleft()]:
+                        if other in remaining:
+                            remaining.discard(other)
+                            component.add(other)
+                            queue.append(other)
+                for node_id in component:
+                    self._parent[node_id] = start
+                self.members[start] = component
+                self.stamps[start] = next(self._stamps)
+        for node_id in self._removed:
+            del self._parent[node_id]
+        self._dirty = set()
+        self._removed = set()
+
+    # ---------- reads ----------
+
+    def partition_of(self, node_id: str) -> Optional[str]:
+        """Id of the node's partition: one of its members, stable until the partition changes shape"""
+        self.refresh()
+        return self._find(node_id) if node_id in self._parent else None
+
+    def partitions(self, min_size: int = 1) -> List[str]:
+        """Partition ids, largest first"""
+        self.refresh()
+        ids = [root for root, members in self.members.items() if len(members) >= min_size]
+        ids.sort(key=lambda root: -len(self.members[root]))
+        return ids
@@ -0,0 +1,120 @@
+"""
+Day Planner - Packs candidate work into the free time of one day
+================================================================
+Free windows are the working day minus calendar blocks. Candidates are
+taken in order of value per minute (the greedy knapsack heuristic) and each
+goes into the earliest window where it fits after its blockers finish, so
+deadline-bound work lands early in the day. Candidates whose blockers are
+not planned yet are retried after the others. The search stops at a time
+limit and returns the best plan found so far.
+"""
+
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Dict, Any, List, Tuple, Optional
+
+Interval = Tuple[datetime, datetime]
+
+@dataclass
+class Candidate:
+    item_id: str
+    minutes: int
+    value: float
+    deadline: Optional[datetime] = None
+    # Items that must be planned, and finished, before this one can start
+    blockers: Tuple[str, ...] = ()
+    reasons: List[str] = field(default_factory=list)
+
+def free_windows(day_start: datetime, day_end: datetime, busy: List[Interval]) -> List[Interval]:
+    """The day minus the busy intervals, in order"""
+    windows = []
+    cursor = day_start
+    for start, end in sorted(busy):
+        if end <= cursor or start >= day_end:
+            continue
+        if start > cursor:
+            windows.append((cursor, start))
+        cursor = max(cursor, end)
+    if cursor < day_end:
+        windows.append((cursor, day_end))
+    return windows
+
+def pack(candidates: List[Candidate], windows: List[Interval], budget_minutes: int,
+         time_limit: float = 0.05) -> Dict[str, Any]:
+    """Greedy packing of candidates into windows within the minute budget.
+
+    Ordering by value per minute alone can fill the budget with small items and
+    leave no room for one that is worth more than all of them, so ordering by
+    value is tried as well and the more valuable plan wins.
+    """
+    started = time.perf_counter()
+    deadline = started + time_limit
+    fitting = [c for c in candidates if 0 < c.minutes <= budget_minutes]
+    best = None
+    for key in (lambda c: -c.value / c.minutes, lambda c: -c.value):
+        order = sorted(fitting, key=lambda c: (key(c), c.deadline or datetime.max))
+        plan = _pack_once(order, list(windows), budget_minutes, deadline)
+        if best is None or plan["total_value"] > best["total_value"]:
+            best = plan
+        if plan["truncated"]:
+            break
+
+    best["total_value"] = round(best["total_value"], 3)
+    best["considered"] = len(candidates)
+    best["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 2)
+    return best
+
+def _pack_once(order: List[Candidate], windows: List[Interval], budget_minutes: int,
+               deadline: float) -> Dict[str, Any]:
+    placed: Dict[str, Tuple[datetime, datetime]] = {}
+    slots: List[Dict[str, Any]] = []
+    remaining = budget_minutes
+    total_value = 0.0
+    truncated = False
+
+    while order and remaining > 0 and not truncated:
+        deferred = []
+        for i, candidate in enumerate(order):
+            if i % 256 == 0 and time.perf_counter() > deadline:
+                truncated = True
+                break
+            if candidate.minutes > remaining:
+                continue
+            if any(b not in placed for b in candidate.blockers):
+                deferred.append(candidate)
+                continue
+            ready = max((placed[b][1] for b in candidate.blockers), default=None)
+            length = timedelta(minutes=candidate.minutes)
+            for w, (start, end) in enumerate(windows):
+                begin = max(start, ready) if ready else start
+                if begin + length <= end:
+                    finish = begin + length
+                    # Keep what is left on either side of the slot
+                    windows[w:w + 1] = [gap for gap in ((start, begin), (finish, end)) if gap[0] < gap[1]]
+                    placed[candidate.item_id] = (begin, finish)
+                    remaining -= candidate.minutes
+                    total_value += candidate.value
+                    slots.append({
+                        "item_id": candidate.item_id,
+                        "start": begin,
+                        "end": finish,
+                        "minutes": candidate.minutes,
+                        "value": round(candidate.value, 3),
+                        "reasons": candidate.reasons,
+                        "late": candidate.deadline is not None and finish > candidate.deadline
+                    })
+                    break
+        if len(deferred) == len(order):
+            # Nothing left can have its blockers planned
+            break
+        order = deferred
+
+    slots.sort(key=lambda s: s["start"])
+    return {
+        "slots": slots,
+        "planned_minutes": budget_minutes - remaining,
+        "total_value": total_value,
+        "free_windows": [{"start": s, "end": e} for s, e in windows],
+        "truncated": truncated
+    }
@@ -0,0 +1,72 @@
+"""
+Response Cache - Single-flight, version-keyed caching for hot read endpoints
+===========================================================================
+Dashboards poll the same endpoints at the same moment. Concurrent requests
+for the same (endpoint, version) share one in-flight computation, and the
+serialized body is reused until the version changes or a short TTL passes.
+ETags are derived from the version alone, so a client that already holds
+the current representation gets a 304 without anything being computed.
+"""
+
+import time
+import asyncio
+import hashlib
+import logging
+from typing import Dict, Any, Tuple, Callable, Awaitable, Optional
+
+logger = logging.getLogger(__name__)
+
+class ResponseCache:
+    def __init__(self, ttl_seconds: float = 2.0):
+        self.ttl_seconds = ttl_seconds
+        self._entries: Dict[str, Tuple[Any, float, bytes]] = {}
+        self._inflight: Dict[Tuple[str, Any], asyncio.Future] = {}
+        self.stats = {"hits": 0, "misses": 0, "coalesced": 0, "not_modified": 0}
+
+    @staticmethod
+    def etag(name: str, version: Any) -> str:
+        digest = hashlib.blake2b(f"{name}:{version!r}".encode(), digest_size=12).hexdigest()
+        return f'W/"{digest}"'
+
+    def not_modified(self, name: str, version: Any, if_none_match: Optional[str]) -> bool:
+        """True when the client's If-None-Match already names the current version"""
+        if not if_none_match:
+            return False
+        current = self.etag(name, version)
+        if if_none_match.strip() == "*" or current in (tag.strip() for tag in if_none_match.split(",")):
+            self.stats["not_modified"] += 1
+            return True
+        return False
+
+    async def get(self, name: str, version: Any, compute: Callable[[], Awaitable[bytes]]) -> bytes:
+        """Serialized body for (name, version), computing it at most once per version and TTL"""
+        entry = self._entries.get(name)
+        if entry is not None and entry[0] == version and time.monotonic() - entry[1] < self.ttl_seconds:
+            self.stats["hits"] += 1
+            return entry[2]
+
+        key = (name, version)
+        pending = self._inflight.get(key)
+        if pending is not None:
+            self.stats["coalesced"] += 1
+            # shield: one cancelled waiter must not cancel the computation for the others
+            return await asyncio.shield(pending)
+
+        self.stats["misses"] += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            body = await compute()
+            self._entries[name] = (version, time.monotonic(), body)
+            future.set_result(body)
+            return body
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Waiters get the error; consume it here so an unobserved future is not logged
+            future.exception()
+            raise
+        finally:
+            del self._inflight[key]
@@ -0,0 +1,524 @@
+"""
+Rule Engine - Declarative triggers matched incrementally as the graph changes
+=============================================================================
+A rule is a list of conditions on nodes (or edges) and an action:
+
+    {"name": "escalate_debt",
+     "when": [
+         {"as": "debt", "type": "deadline",
+          "where": [["amount", ">", 5000], ["deadline", "within_days", 7], ["client", "==", "?client"]]},
+         {"as": "mail", "type": "document", "where": [["client", "==", "?client"]]}
+     ],
+     "then": {"action": "escalate", "message": "{debt.title} is due soon and {mail.from} wrote"}}
+
+Rules are compiled into a Rete network. The literal tests of a condition
+form an alpha memory, shared by every rule with the same condition and
+filed under its fact type, so a changed fact is only tested against
+conditions on its own type. Variables ("?client") join conditions: each
+join keeps the partial matches so far (its beta memory) hashed on the
+joined value, so a new fact only meets the partial matches it can
+complete. An ingest costs work in proportion to the facts it changed and
+the matches they make, not to rules times nodes.
+
+Time tests such as within_days are evaluated when a fact is asserted. Node
+facts carry their urgency bucket and the orchestrator re-asserts them when
+it changes, and also at the moment each within_days window in the network
+opens on one of their attributes (time_windows lists them). Edge facts are
+tested only when the edge is added.
+"""
+
+import re
+import logging
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Dict, Any, List, Set, Tuple, Optional, Callable, Iterable
+
+logger = logging.getLogger(__name__)
+
+# A fact is a node or an edge flattened to attributes
+Fact = Tuple[str, Dict[str, Any]]
+Token = Tuple[str, ...]
+
+# Matches already reported, so a fact that is updated but still matches does not fire again
+MAX_FIRED = 50000
+
+TEMPLATE_FIELD = re.compile(r"\{(\w+)\.(\w+)\}")
+
+def _as_time(value: Any) -> Optional[datetime]:
+    if isinstance(value, datetime):
+        moment = value
+    elif isinstance(value, str):
+        try:
+            moment = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    else:
+        return None
+    return moment.astimezone().replace(tzinfo=None) if moment.tzinfo else moment
+
+def _within_days(value: Any, days: Any) -> bool:
+    """Due in at most `days` days; overdue counts"""
+    moment = _as_time(value)
+    return moment is not None and moment <= datetime.now() + timedelta(days=float(days))
+
+def _ordered(compare: Callable[[Any, Any], bool]) -> Callable[[Any, Any], bool]:
+    """Numeric comparison that accepts numbers stored as strings"""
+    def test(value: Any, expected: Any) -> bool:
+        if isinstance(expected, (int, float)) and isinstance(value, str):
+            value = float(value)
+        return compare(value, expected)
+    return test
+
+OPERATORS: Dict[str, Callable[[Any, Any], bool]] = {
+    "==": lambda value, expected: value == expected,
+    "!=": lambda value, expected: value != expected,
+    ">": _ordered(lambda value, expected: value > expected),
+    ">=": _ordered(lambda value, expected: value >= expected),
+    "<": _ordered(lambda value, expected: value < expected),
+    "<=": _ordered(lambda value, expected: value <= expected),
+    "in": lambda value, expected: value in expected,
+    "contains": lambda value, expected: str(expected).lower() in str(value).lower(),
+    "within_days": _within_days
+}
+
+def _passes(attrs: Dict[str, Any], attr: str, op: str, expected: Any) -> bool:
+    value = attrs.get(attr)
+    if op == "exists":
+        return (value is not None) == bool(expected)
+    if value is None:
+        return False
+    try:
+        return OPERATORS[op](value, expected)
+    except (TypeError, ValueError):
+        return False
+
+def _key(value: Any) -> Any:
+    """Hashable join key; unhashable values join by their text"""
+    try:
+        hash(value)
+        return value
+    except TypeError:
+        return repr(value)
+
+def _variable(value: Any) -> Optional[str]:
+    return value[1:] if isinstance(value, str) and value.startswith("?") and len(value) > 1 else None
+
+# ==================== Network ====================
+
+class _Alpha:
+    """Facts of one kind and type passing one set of literal tests"""
+
+    def __init__(self, kind: str, fact_type: Optional[str], tests: Tuple[Tuple[str, str, Any], ...]):
+        self.kind = kind
+        self.type = fact_type
+        self.tests = tests
+        self.facts: Dict[str, Dict[str, Any]] = {}
+        # attribute -> value -> fact ids, for the joins that probe this memory
+        self.indexes: Dict[str, Dict[Any, Set[str]]] = {}
+        self.successors: List[Tuple["_Rule", int]] = []
+
+    def matches(self, attrs: Dict[str, Any]) -> bool:
+        return all(_passes(attrs, attr, op, expected) for attr, op, expected in self.tests)
+
+    def index_on(self, attr: str):
+        if attr not in self.indexes:
+            index: Dict[Any, Set[str]] = {}
+            for fact_id, attrs in self.facts.items():
+                index.setdefault(_key(attrs.get(attr)), set()).add(fact_id)
+            self.indexes[attr] = index
+
+    def add(self, fact_id: str, attrs: Dict[str, Any]):
+        self.facts[fact_id] = attrs
+        for attr, index in self.indexes.items():
+            index.setdefault(_key(attrs.get(attr)), set()).add(fact_id)
+
+    def remove(self, fact_id: str):
+        attrs = self.facts.pop(fact_id)
+        for attr, index in self.indexes.items():
+            key = _key(attrs.get(attr))
+            bucket = index.get(key)
+            if bucket is not None:
+                bucket.discard(fact_id)
+                if not bucket:
+                    del index[key]
+
+class _Condition:
+    def __init__(self, alias: str, alpha: _Alpha, joins: List[Tuple[str, int, str]]):
+        self.alias = alias
+        self.alpha = alpha
+        # (attribute here, offset back to where the variable was bound or 0 for this fact, attribute there);
+        # a join to an earlier condition sorts first and is the one hashed
+        self.joins = joins
+        self.hash = joins[0] if joins and joins[0][1] < 0 else None
+
+class _Rule:
+    def __init__(self, definition: Dict[str, Any], conditions: List[_Condition]):
+        self.definition = definition
+        self.name: str = definition["name"]
+        self.then: Dict[str, Any] = definition.get("then", {})
+        self.conditions = conditions
+        # Partial matches ending at each position -> their join key for the next position
+        self.beta: List[Dict[Token, Any]] = [{} for _ in conditions]
+        self.left_index: List[Dict[Any, Set[Token]]] = [{} for _ in conditions]
+        self.by_fact: Dict[str, Set[Tuple[int, Token]]] = {}
+
+# ==================== Engine ====================
+
+class RuleEngine:
+    """Fed by the orchestrator's graph listener, like the task clusterer"""
+
+    def __init__(self):
+        self.rules: "OrderedDict[str, _Rule]" = OrderedDict()
+        self._alphas: Dict[Tuple, _Alpha] = {}
+        self._alphas_by_type: Dict[Tuple[str, Optional[str]], List[_Alpha]] = {}
+        self.fired: "OrderedDict[Tuple[str, Token], None]" = OrderedDict()
+        self.clear_facts()
+
+    def __len__(self):
+        return len(self.rules)
+
+    def clear_facts(self):
+        """Forget every fact and match; rules stay compiled"""
+        self.facts: Dict[str, Dict[str, Any]] = {}
+        self._memberships: Dict[str, List[_Alpha]] = {}
+        self._owners: Dict[str, Set[str]] = {}
+        # Node id -> stored edge facts touching it, dropped with the node
+        self._edges_of: Dict[str, Set[str]] = {}
+        for alpha in self._alphas.values():
+            alpha.facts.clear()
+            for index in alpha.indexes.values():
+                index.clear()
+        for rule in self.rules.values():
+            rule.beta = [{} for _ in rule.conditions]
+            rule.left_index = [{} for _ in rule.conditions]
+            rule.by_fact = {}
+
+    # ---------- rules ----------
+
+    def add_rule(self, definition: Dict[str, Any],
+                 source: Callable[[str, Optional[str]], Iterable[Fact]]) -> Dict[str, Any]:
+        """Compile a rule (replacing one of the same name) and match it against existing facts.
+
+        `source(kind, type)` yields the current facts for conditions no other rule
+        shares yet. Matches that already hold are not fired.
+        """
+        rule = self._compile(definition)
+        if rule.name in self.rules:
+            self.remove_rule(rule.name)
+
+        for position, condition in enumerate(rule.conditions):
+            alpha = condition.alpha
+            key = (alpha.kind, alpha.type, alpha.tests)
+            if key not in self._alphas:
+                self._alphas[key] = alpha
+                self._alphas_by_type.setdefault((alpha.kind, alpha.type), []).append(alpha)
+                for fact_id, attrs in source(alpha.kind, alpha.type):
+                    if alpha.matches(attrs):
+                        attrs = self._store(fact_id, alpha.kind, attrs)
+                        alpha.add(fact_id, attrs)
+                        self._memberships[fact_id].append(alpha)
+            alpha.successors.append((rule, position))
+            if condition.hash:
+                alpha.index_on(condition.hash[0])
+        self.rules[rule.name] = rule
+
+        matched: List[Token] = []
+        for fact_id in list(rule.conditions[0].alpha.facts):
+            self._right_activate(rule, 0, fact_id, matched)
+        for token in matched:
+            self._remember(rule.name, token)
+        logger.info(f"Rule {rule.name} compiled: {len(rule.conditions)} conditions, {len(matched)} current matches")
+        return self.describe(rule.name)
+
+    def remove_rule(self, name: str) -> bool:
+        rule = self.rules.pop(name, None)
+        if rule is None:
+            return False
+        for fact_id in rule.by_fact:
+            owners = self._owners.get(fact_id)
+            if owners is not None:
+                owners.discard(name)
+        for condition in rule.conditions:
+            alpha = condition.alpha
+            alpha.successors = [(r, p) for r, p in alpha.successors if r is not rule]
+            if alpha.successors or (alpha.kind, alpha.type, alpha.tests) not in self._alphas:
+                continue
+            # Last user of the condition: drop its memory and any fact no other condition holds
+            del self._alphas[(alpha.kind, alpha.type, alpha.tests)]
+            self._alphas_by_type[(alpha.kind, alpha.type)].remove(alpha)
+            for fact_id in alpha.facts:
+                memberships = self._memberships[fact_id]
+                memberships.remove(alpha)
+                if not memberships:
+                    self._forget(fact_id)
+            alpha.facts = {}
+            alpha.indexes = {}
+        return True
+
+    def _compile(self, definition: Dict[str, Any]) -> _Rule:
+        name = definition.get("name")
+        conditions = definition.get("when")
+        if not isinstance(name, str) or not name:
+            raise ValueError("Rule needs a name")
+        if not isinstance(conditions, list) or not conditions:
+            raise ValueError(f"Rule {name} needs at least one condition in 'when'")
+
+        bound: Dict[str, Tuple[int, str]] = {}
+        compiled = []
+        fresh: Dict[Tuple, _Alpha] = {}
+        for position, condition in enumerate(conditions):
+            kind = "edge" if "edge" in condition else "node"
+            fact_type = condition.get(kind) if kind == "edge" else condition.get("type")
+            alias = condition.get("as", f"_{position}")
+            literal, joins = [], []
+            for test in condition.get("where", []):
+                if not isinstance(test, (list, tuple)) or len(test) not in (2, 3):
+                    raise ValueError(f"Rule {name}: test {test!r} is not [attribute, operator, value]")
+                attr, op, expected = (test[0], test[1], test[2]) if len(test) == 3 else (test[0], test[1], True)
+                if op != "exists" and op not in OPERATORS:
+                    raise ValueError(f"Rule {name}: unknown operator {op!r}")
+                variable = _variable(expected)
+                if variable is None:
+                    if op == "in" and isinstance(expected, list):
+                        expected = tuple(expected)
+                    literal.append((attr, op, _key(expected)))
+                elif op != "==":
+                    raise ValueError(f"Rule {name}: variables only join with '=='")
+                elif variable not in bound:
+                    bound[variable] = (position, attr)
+                else:
+                    at, there = bound[variable]
+                    # Joins to earlier conditions are stored with negative offsets so they sort first
+                    joins.append((attr, at - position if at < position else 0, there))
+            joins.sort(key=lambda j: j[1])
+            tests = tuple(sorted(literal, key=repr))
+            key = (kind, fact_type, tests)
+            alpha = self._alphas.get(key) or fresh.setdefault(key, _Alpha(kind, fact_type, tests))
+            compiled.append(_Condition(alias, alpha, joins))
+
+        then = definition.get("then", {})
+        if not isinstance(then, dict) or not then.get("action"):
+            raise ValueError(f"Rule {name} needs an action in 'then'")
+        if not isinstance(then.get("priority", 1), int):
+            raise ValueError(f"Rule {name}: priority must be 1, 2 or 3")
+        return _Rule(definition, compiled)
+
+    # ---------- facts ----------
+
+    def assert_fact(self, fact_id: str, kind: str, fact_type: str, attrs: Dict[str, Any],
+                    fire: bool = True) -> List[Dict[str, Any]]:
+        """Add or replace a fact; returns the activations of matches it completed"""
+        if fact_id in self.facts:
+            self._retract(fact_id)
+        entered = [
+            alpha
+            for key in ((kind, fact_type), (kind, None))
+            for alpha in self._alphas_by_type.get(key, ())
+            if alpha.matches(attrs)
+        ]
+        if not entered:
+            return []
+
+        self._store(fact_id, kind, attrs)
+        for alpha in entered:
+            alpha.add(fact_id, attrs)
+            self._memberships[fact_id].append(alpha)
+
+        activations = []
+        for alpha in entered:
+            for rule, position in alpha.successors:
+                matched: List[Token] = []
+                self._right_activate(rule, position, fact_id, matched)
+                for token in matched:
+                    if self._remember(rule.name, token) and fire:
+                        activations.append(self._activation(rule, token))
+        return activations
+
+    def retract_fact(self, fact_id: str):
+        """Drop a fact that left the graph, with the edges that touch it"""
+        for edge_id in self._edges_of.pop(fact_id, ()):
+            attrs = self.facts.get(edge_id)
+            if attrs is None:
+                continue
+            self._retract(edge_id)
+            other = attrs.get("to") if attrs.get("from") == fact_id else attrs.get("from")
+            edges = self._edges_of.get(other)
+            if edges is not None:
+                edges.discard(edge_id)
+                if not edges:
+                    del self._edges_of[other]
+        if fact_id in self.facts:
+            self._retract(fact_id)
+
+    def _store(self, fact_id: str, kind: str, attrs: Dict[str, Any]) -> Dict[str, Any]:
+        """Keep a fact held by some memory; a fact already kept keeps its attributes"""
+        if fact_id in self.facts:
+            return self.facts[fact_id]
+        self.facts[fact_id] = attrs
+        self._memberships[fact_id] = []
+        if kind == "edge":
+            for end in (attrs.get("from"), attrs.get("to")):
+                self._edges_of.setdefault(end, set()).add(fact_id)
+        return attrs
+
+    def _forget(self, fact_id: str):
+        attrs = self.facts.pop(fact_id)
+        del self._memberships[fact_id]
+        self._owners.pop(fact_id, None)
+        for end in (attrs.get("from"), attrs.get("to")):
+            if end in self._edges_of:
+                self._edges_of[end].discard(fact_id)
+
+    def _retract(self, fact_id: str):
+        for alpha in self._memberships.get(fact_id, ()):
+            alpha.remove(fact_id)
+        for name in self._owners.pop(fact_id, ()):
+            rule = self.rules[name]
+            for position, token in rule.by_fact.pop(fact_id, ()):
+                self._drop_token(rule, position, token, fact_id)
+        self.facts.pop(fact_id, None)
+        self._memberships.pop(fact_id, None)
+
+    def _drop_token(self, rule: _Rule, position: int, token: Token, removed: str):
+        key = rule.beta[position].pop(token, None)
+        if key is not None:
+            bucket = rule.left_index[position].get(key)
+            if bucket is not None:
+                bucket.discard(token)
+                if not bucket:
+                    del rule.left_index[position][key]
+        for fact_id in token:
+            if fact_id != removed:
+                entries = rule.by_fact.get(fact_id)
+                if entries is not None:
+                    entries.discard((position, token))
+
+    # ---------- matching ----------
+
+    def _joins(self, rule: _Rule, position: int, left: Token, fact_id: str) -> bool:
+        if fact_id in left:
+            return False
+        attrs = self.facts[fact_id]
+        for attr, offset, there in rule.conditions[position].joins:
+            value = attrs.get(attr)
+            other = attrs if offset == 0 else self.facts[left[position + offset]]
+            if value is None or _key(value) != _key(other.get(there)):
+                return False
+        return True
+
+    def _right_activate(self, rule: _Rule, position: int, fact_id: str, matched: List[Token]):
+        """A fact entered the memory at `position`; extend the partial matches before it"""
+        if position == 0:
+            lefts: Iterable[Token] = [()]
+        else:
+            condition = rule.conditions[position]
+            if condition.hash:
+                key = _key(self.facts[fact_id].get(condition.hash[0]))
+                lefts = rule.left_index[position - 1].get(key, ()) if key is not None else ()
+            else:
+                lefts = rule.beta[position - 1]
+        for left in list(lefts):
+            if self._joins(rule, position, left, fact_id):
+                self._extend(rule, position, left + (fact_id,), matched)
+
+    def _extend(self, rule: _Rule, position: int, token: Token, matched: List[Token]):
+        """Record a partial match and push it through the rest of the rule"""
+        if token in rule.beta[position]:
+            return
+        for fact_id in token:
+            rule.by_fact.setdefault(fact_id, set()).add((position, token))
+            self._owners.setdefault(fact_id, set()).add(rule.name)
+
+        if position == len(rule.conditions) - 1:
+            rule.beta[position][token] = None
+            matched.append(token)
+            return
+
+        following = rule.conditions[position + 1]
+        if following.hash is None:
+            rule.beta[position][token] = None
+            candidates: Iterable[str] = following.alpha.facts
+        else:
+            attr, offset, there = following.hash
+            key = _key(self.facts[token[position + 1 + offset]].get(there))
+            rule.beta[position][token] = key
+            if key is None:
+                return
+            rule.left_index[position].setdefault(key, set()).add(token)
+            candidates = following.alpha.indexes[attr].get(key, ())
+        for fact_id in list(candidates):
+            if self._joins(rule, position + 1, token, fact_id):
+                self._extend(rule, position + 1, token + (fact_id,), matched)
+
+    def _remember(self, name: str, token: Token) -> bool:
+        """Record a complete match; False when it was reported before"""
+        key = (name, token)
+        if key in self.fired:
+            return False
+        self.fired[key] = None
+        if len(self.fired) > MAX_FIRED:
+            self.fired.popitem(last=False)
+        return True
+
+    # ---------- reads ----------
+
+    def time_windows(self) -> Dict[str, Set[float]]:
+        """Node attribute -> the day counts within_days tests it with, over every compiled condition"""
+        windows: Dict[str, Set[float]] = {}
+        for alpha in self._alphas.values():
+            if alpha.kind != "node":
+                continue
+            for attr, op, expected in alpha.tests:
+                if op != "within_days":
+                    continue
+                try:
+                    windows.setdefault(attr, set()).add(float(expected))
+                except (TypeError, ValueError):
+                    pass
+        return windows
+
+    def _activation(self, rule: _Rule, token: Token) -> Dict[str, Any]:
+        matched = {c.alias: fact_id for c, fact_id in zip(rule.conditions, token)}
+
+        def field(match) -> str:
+            fact_id = matched.get(match.group(1))
+            value = self.facts[fact_id].get(match.group(2)) if fact_id in self.facts else None
+            return "" if value is None else str(value)
+
+        return {
+            "type": "rule_fired",
+            "rule": rule.name,
+            "action": rule.then["action"],
+            "message": TEMPLATE_FIELD.sub(field, rule.then.get("message", rule.name)),
+            "priority": min(max(int(rule.then.get("priority", 1)), 1), 3),
+            "matched": matched,
+            "fired_at": datetime.now().isoformat()
+        }
+
+    def matches(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """Complete matches that still hold, across all rules"""
+        found = []
+        for rule in self.rules.values():
+            for token in rule.beta[-1]:
+                found.append(self._activation(rule, token))
+                if len(found) >= limit:
+                    return found
+        return found
+
+    def describe(self, name: str) -> Optional[Dict[str, Any]]:
+        rule = self.rules.get(name)
+        if rule is None:
+            return None
+        return {
+            **rule.definition,
+            "matches": len(rule.beta[-1]),
+            "partial_matches": [len(memory) for memory in rule.beta[:-1]]
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "rules": len(self.rules),
+            "conditions": len(self._alphas),
+            "facts": len(self.facts),
+            "partial_matches": sum(len(m) for r in self.rules.values() for m in r.beta)
+        }
@@ -0,0 +1,182 @@
+"""
+Deadline Scheduler - Fires events when items cross urgency buckets
+==================================================================
+Every tracked deadline contributes one future event per bucket boundary
+(e.g. "critical" four days before, "overdue" one day before). Events sit in
+a min-heap keyed by due time, so finding what changed costs O(log n) per
+transition instead of a scan over every node.
+"""
+
+import heapq
+import asyncio
+import itertools
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, Any, List, Tuple, Optional, Callable
+
+logger = logging.getLogger(__name__)
+
+Transition = Dict[str, Any]
+
+class DeadlineScheduler:
+    """Tracks the urgency bucket of each item and emits a transition when it changes.
+
+    `buckets` maps a name to how long before the deadline it starts, e.g.
+    [("critical", timedelta(days=4)), ("overdue", timedelta(days=1))].
+    """
+
+    # Upper bound on a single sleep, so wall-clock jumps are noticed
+    MAX_SLEEP_SECONDS = 300
+
+    def __init__(self, buckets: List[Tuple[str, timedelta]],
+                 on_transition: Optional[Callable[[Transition], None]] = None):
+        # Widest lead time first: that bucket is entered first
+        self.buckets = sorted(buckets, key=lambda b: b[1], reverse=True)
+        self.on_transition = on_transition
+        self.current: Dict[str, str] = {}
+        self.deadlines: Dict[str, datetime] = {}
+        self._heap: List[Tuple[datetime, int, str, str]] = []
+        # Generation and live heap entries of each item with events still pending; other entries are stale
+        self._generation: Dict[str, int] = {}
+        self._pending: Dict[str, int] = {}
+        # Generations are never reused, so an entry left from an earlier schedule can never look live
+        self._generations = itertools.count(1)
+        self._stale = 0
+        self._wakeup: Optional[asyncio.Event] = None
+
+    def __len__(self):
+        return len(self.deadlines)
+
+    def bucket_for(self, deadline: datetime, now: datetime) -> Optional[str]:
+        remaining = deadline - now
+        bucket = None
+        for name, lead in self.buckets:
+            if remaining < lead:
+                bucket = name
+        return bucket
+
+    def set_buckets(self, buckets: List[Tuple[str, timedelta]]):
+        """Replace the bucket boundaries; tracked items are re-placed without transitions"""
+        self.buckets = sorted(buckets, key=lambda b: b[1], reverse=True)
+        now = datetime.now()
+        for item_id, deadline in list(self.deadlines.items()):
+            self.schedule(item_id, deadline, now, notify=False)
+
+    def schedule(self, item_id: str, deadline: datetime, now: Optional[datetime] = None, notify: bool = True):
+        """Track (or re-track) an item; earlier events for it are invalidated.
+
+        With notify=False the item's current bucket is set without a transition,
+        for callers that already account for where the item stands now.
+        """
+        now = now or datetime.now()
+        self._invalidate(item_id)
+        self.deadlines[item_id] = deadline
+
+        self._set_bucket(item_id, self.bucket_for(deadline, now), now, notify)
+
+        generation = next(self._generations)
+        next_due = self._heap[0][0] if self._heap else None
+        pending = 0
+        for name, lead in self.buckets:
+            due = deadline - lead
+            if due > now:
+                heapq.heappush(self._heap, (due, generation, item_id, name))
+                pending += 1
+        if pending:
+            self._generation[item_id] = generation
+            self._pending[item_id] = pending
+
+        if self._wakeup and self._heap and (next_due is None or self._heap[0][0] < next_due):
+            self._wakeup.set()
+
+    def unschedule(self, item_id: str):
+        """Stop tracking an item; its pending heap entries become stale and are skipped"""
+        if item_id in self.deadlines:
+            self._invalidate(item_id)
+            del self.deadlines[item_id]
+            self.current.pop(item_id, None)
+
+    def _invalidate(self, item_id: str):
+        self._generation.pop(item_id, None)
+        self._stale += self._pending.pop(item_id, 0)
+        if self._stale > 1024 and self._stale * 2 > len(self._heap):
+            # Mostly dead entries: rebuild rather than let rescheduling grow the heap forever
+            self._heap = [e for e in self._heap if self._generation.get(e[2]) == e[1]]
+            heapq.heapify(self._heap)
+            self._stale = 0
+
+    def _consume(self, item_id: str):
+        """One live entry left the heap; forget the generation with the last one"""
+        self._pending[item_id] -= 1
+        if not self._pending[item_id]:
+            del self._pending[item_id]
+            del self._generation[item_id]
+
+    def advance(self, now: Optional[datetime] = None) -> List[Transition]:
+        """Fire every event due by `now`"""
+        now = now or datetime.now()
+        fired = []
+        while self._heap and self._heap[0][0] <= now:
+            due, generation, item_id, name = heapq.heappop(self._heap)
+            if self._generation.get(item_id) != generation:
+                self._stale -= 1
+                continue
+            self._consume(item_id)
+            transition = self._set_bucket(item_id, name, due)
+            if transition:
+                fired.append(transition)
+        return fired
+
+    def _set_bucket(self, item_id: str, bucket: Optional[str], at: datetime,
+                    notify: bool = True) -> Optional[Transition]:
+        previous = self.current.get(item_id)
+        if bucket == previous:
+            return None
+
+        if bucket is None:
+            self.current.pop(item_id, None)
+        else:
+            self.current[item_id] = bucket
+
+        transition = {
+            "item_id": item_id,
+            "from": previous,
+            "to": bucket,
+            "deadline": self.deadlines[item_id].isoformat(),
+            "at": at.isoformat()
+        }
+        if self.on_transition and notify:
+            self.on_transition(transition)
+        return transition
+
+    def items_in(self, *buckets: str) -> List[str]:
+        """Ids currently in any of the given buckets, soonest deadline first"""
+        return sorted(
+            (item_id for item_id, bucket in self.current.items() if bucket in buckets),
+            key=lambda item_id: self.deadlines[item_id]
+        )
+
+    def next_due(self) -> Optional[datetime]:
+        while self._heap and self._generation.get(self._heap[0][2]) != self._heap[0][1]:
+            heapq.heappop(self._heap)
+            self._stale -= 1
+        return self._heap[0][0] if self._heap else None
+
+    async def run(self):
+        """Sleep until the next transition is due, fire it, repeat"""
+        self._wakeup = asyncio.Event()
+        logger.info(f"Deadline scheduler started with {len(self.deadlines)} tracked items")
+        try:
+            while True:
+                self.advance()
+                next_due = self.next_due()
+                timeout = self.MAX_SLEEP_SECONDS
+                if next_due is not None:
+                    timeout = min(timeout, max(0.0, (next_due - datetime.now()).total_seconds()))
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            self._wakeup = None
@@ -5,32 +5,129 @@ FastAPI Server for Life Orchestrator
 
 import os
 import sys
+import hmac
 import json
+import time
+import uuid
+from contextlib import asynccontextmanager
 from datetime import datetime
 from typing import Dict, Any, Optional, List
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request, Response, WebSocket, WebSocketDisconnect
+from fastapi.encoders import jsonable_encoder
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 import uvicorn
 import asyncio
+import logging
 
 # Add current directory to path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-# Import the Life Orchestrator
+logger = logging.getLogger(__name__)
+
+# Import the Life Orchestrator; it is constructed in the lifespan hook, not at import
 try:
-    from life_orchestrator import LifeOrchestrator, ContextNode, EntityType
-    orchestrator = LifeOrchestrator()
-    print("✅ Life Orchestrator loaded successfully")
+    from life_orchestrator import (
+        LifeOrchestrator, ContextGraph, ContextNode, EntityType, RelationType, encode_cursor, decode_cursor, parse_time
+    )
 except ImportError as e:
     print(f"⚠️ Failed to import Life Orchestrator: {e}")
-    orchestrator = None
+    LifeOrchestrator = None
+
+from response_cache import ResponseCache
+from mail_import import import_mailbox, BATCH_SIZE as MAILBOX_BATCH_SIZE
+from memory_report import AllocationTracker, SAMPLE_SIZE, measure, process_memory
+
+orchestrator: Optional["LifeOrchestrator"] = None
+
+# Optional on-disk state; unset means the graph lives only in memory
+STATE_PATH = os.getenv("ORCHESTRATOR_STATE_PATH")
+
+# Optional cold tier for archived nodes; unset means nothing is archived
+COLD_PATH = os.getenv("ORCHESTRATOR_COLD_PATH")
+
+# Bearer token required by the /admin endpoints; unset leaves them disabled
+ADMIN_TOKEN = os.getenv("ORCHESTRATOR_ADMIN_TOKEN")
+
+# Mailbox imports read server-local files, confined to this directory
+MAILBOX_ROOT = os.path.abspath(os.getenv("MAILBOX_IMPORT_ROOT", "mail"))
+
+# Progress of mailbox imports started through the API, by import id
+mailbox_imports: Dict[str, Dict[str, Any]] = {}
+_mailbox_tasks: Dict[str, asyncio.Task] = {}
+
+# Polled endpoints share computations and serve cached bodies for this long per version
+response_cache = ResponseCache(ttl_seconds=float(os.getenv("RESPONSE_CACHE_TTL", "2")))
+
+# tracemalloc snapshots taken through /admin/memory
+allocations = AllocationTracker()
+
+# Startup progress, reported by /ready
+startup: Dict[str, Any] = {"ready": False, "error": None, "started_at": None, "ready_at": None}
+
+# Reachable while state is still loading; everything else answers 503 until ready
+ALWAYS_AVAILABLE = {"/", "/health", "/ready", "/docs", "/redoc", "/openapi.json"}
+
+def _build_orchestrator() -> "LifeOrchestrator":
+    graph = None
+    # ORCHESTRATOR_BACKEND=sqlite keeps the graph on disk instead of in memory
+    if os.getenv("ORCHESTRATOR_BACKEND", "memory") == "sqlite":
+        from sqlite_store import SQLiteGraphStore
+        graph = SQLiteGraphStore(os.getenv("ORCHESTRATOR_DB_PATH", "orchestrator.db"))
+    # ORCHESTRATOR_COLD_PATH archives finished and stale nodes to a SQLite file behind the graph
+    if COLD_PATH:
+        from sqlite_store import SQLiteGraphStore
+        from tiering import TieredGraph
+        graph = TieredGraph(graph if graph is not None else ContextGraph(), SQLiteGraphStore(COLD_PATH))
+    return LifeOrchestrator(graph=graph)
+
+def _load(instance: "LifeOrchestrator"):
+    """Blocking state load, run in a worker thread"""
+    if STATE_PATH:
+        instance.load_state(STATE_PATH)
+    else:
+        if instance.graph.node_count():
+            # Persistent backend: the graph is already there, only derived indexes need building
+            instance.rebuild_indexes()
+        if instance.shared:
+            # Rules, feedback and memory other workers wrote to the same database
+            instance.load_shared()
+
+async def _warm_up(instance: "LifeOrchestrator"):
+    try:
+        await asyncio.to_thread(_load, instance)
+        await instance.start()
+        startup["ready"] = True
+        startup["ready_at"] = datetime.now().isoformat()
+        logger.info("Life Orchestrator ready")
+    except Exception as e:
+        startup["error"] = str(e)
+        logger.error(f"Life Orchestrator failed to start: {e}")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global orchestrator
+    warm_up = None
+    if LifeOrchestrator is not None:
+        orchestrator = _build_orchestrator()
+        startup["started_at"] = datetime.now().isoformat()
+        # Serve liveness and readiness immediately; the graph loads in the background
+        warm_up = asyncio.create_task(_warm_up(orchestrator))
+    yield
+    if warm_up and not warm_up.done():
+        # Let a half-finished load complete so saving cannot overwrite state with a partial graph
+        await warm_up
+    if orchestrator and startup["ready"]:
+        await orchestrator.stop()
+        if STATE_PATH:
+            orchestrator.save_state(STATE_PATH)
 
 # Create FastAPI app
 app = FastAPI(
     title="Life Orchestrator API",
     description="Intelligent Life Management System",
-    version="2.0.0"
+    version="2.0.0",
+    lifespan=lifespan
 )
 
 # Configure CORS
@@ -42,6 +139,36 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.middleware("http")
+async def require_ready(request: Request, call_next):
+    if not startup["ready"] and orchestrator is not None and request.url.path not in ALWAYS_AVAILABLE:
+        return Response(
+            content=json.dumps({"error": "Orchestrator is starting", "ready": False, "detail": startup["error"]}),
+            status_code=503,
+            media_type="application/json",
+            headers={"Retry-After": "1"}
+        )
+    return await call_next(request)
+
+@app.middleware("http")
+async def require_admin_token(request: Request, call_next):
+    if request.url.path.startswith("/admin/") or request.url.path == "/admin":
+        if not ADMIN_TOKEN:
+            return Response(
+                content=json.dumps({"error": "Admin endpoints are disabled; set ORCHESTRATOR_ADMIN_TOKEN"}),
+                status_code=403,
+                media_type="application/json"
+            )
+        supplied = request.headers.get("authorization", "").encode()
+        if not hmac.compare_digest(supplied, f"Bearer {ADMIN_TOKEN}".encode()):
+            return Response(
+                content=json.dumps({"error": "Admin token required"}),
+                status_code=401,
+                media_type="application/json",
+                headers={"WWW-Authenticate": "Bearer"}
+            )
+    return await call_next(request)
+
 # Request models
 class ChatRequest(BaseModel):
     message: str
@@ -53,6 +180,76 @@ class TaskRequest(BaseModel):
 class EmailRequest(BaseModel):
     email: Dict[str, Any]
 
+class EmailBatchRequest(BaseModel):
+    emails: List[Dict[str, Any]]
+
+class MailboxImportRequest(BaseModel):
+    path: str
+    workers: Optional[int] = None
+    batch_size: int = MAILBOX_BATCH_SIZE
+
+class ActionRequest(BaseModel):
+    kind: str
+    action: str
+    client: Optional[str] = None
+    params: Dict[str, Any] = {}
+    idempotency_key: Optional[str] = None
+
+class StatusRequest(BaseModel):
+    status: str
+
+class ExpandRequest(BaseModel):
+    hops: int = 1
+    relation_types: Optional[List[str]] = None
+
+class QueryRequest(BaseModel):
+    types: Optional[List[str]] = None
+    statuses: Optional[List[str]] = None
+    deadline_from: Optional[datetime] = None
+    deadline_to: Optional[datetime] = None
+    attributes: Optional[Dict[str, Any]] = None
+    expand: Optional[ExpandRequest] = None
+    limit: int = 50
+    cursor: Optional[str] = None
+    # Also match archived nodes, read from the cold tier without bringing them back
+    include_archived: bool = False
+
+class CalendarBlock(BaseModel):
+    start: datetime
+    end: datetime
+    title: Optional[str] = "busy"
+
+class PlanRequest(BaseModel):
+    budget_hours: Optional[float] = None
+    blocks: List[CalendarBlock] = []
+    day_start: Optional[datetime] = None
+    day_end: Optional[datetime] = None
+
+def _parse_enums(enum_cls, values: Optional[List[str]]):
+    """Map raw strings to enum members, rejecting unknown values with a 400"""
+    if not values:
+        return None
+    try:
+        return [enum_cls(v) for v in values]
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+def _render(payload: Dict[str, Any]) -> bytes:
+    return json.dumps(jsonable_encoder(payload), ensure_ascii=False).encode("utf-8")
+
+async def _cached_response(request: Request, name: str, version: Any, compute) -> Response:
+    """Serve a polled endpoint through the response cache, answering 304 for a current ETag"""
+    etag = response_cache.etag(name, version)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if response_cache.not_modified(name, version, request.headers.get("if-none-match")):
+        return Response(status_code=304, headers=headers)
+    
+    async def render():
+        return _render(await compute())
+    
+    body = await response_cache.get(name, version, render)
+    return Response(content=body, media_type="application/json", headers=headers)
+
 # ==================== API Endpoints ====================
 
 @app.get("/")
@@ -61,34 +258,59 @@ async def root():
         "status": "active",
         "service": "Life Orchestrator",
         "version": "2.0.0",
-        "orchestrator_ready": orchestrator is not None
+        "orchestrator_ready": orchestrator is not None and startup["ready"]
     }
 
-@app.get("/health")
-async def health():
+async def _health_payload() -> Dict[str, Any]:
     graph_stats = {}
     memory_stats = {}
+    ingest_stats = {}
     
-    if orchestrator:
+    if orchestrator and startup["ready"]:
         graph_stats = {
-            "nodes": len(orchestrator.graph.nodes),
-            "edges": len(orchestrator.graph.edges),
-            "node_types": list(orchestrator.graph.index.keys())
+            "nodes": orchestrator.graph.node_count(),
+            "edges": orchestrator.graph.edge_count(),
+            "node_types": list(orchestrator.graph.type_counts().keys())
         }
+        if orchestrator.tiered:
+            graph_stats["archived"] = len(orchestrator.graph.archived)
         memory_stats = {
             "short_term": len(orchestrator.memory.short_term),
             "long_term": len(orchestrator.memory.long_term),
             "patterns": len(orchestrator.memory.patterns)
         }
+        ingest_stats = {
+            "tracked_payloads": len(orchestrator.seen),
+            "duplicates_skipped": orchestrator.seen.hits
+        }
     
     return {
         "status": "healthy",
         "timestamp": datetime.now().isoformat(),
         "orchestrator_active": orchestrator is not None,
+        "ready": startup["ready"],
         "graph": graph_stats,
-        "memory": memory_stats
+        "memory": memory_stats,
+        "ingest": ingest_stats
     }
 
+@app.get("/health")
+async def health(request: Request):
+    """Liveness; answers while state is still loading"""
+    if not orchestrator or not startup["ready"]:
+        return await _health_payload()
+    
+    version = (orchestrator.state_version(), len(orchestrator.seen), orchestrator.seen.hits)
+    return await _cached_response(request, "health", version, _health_payload)
+
+@app.get("/ready")
+async def ready():
+    """Readiness: 200 once state is loaded and background work has started, 503 before"""
+    body = {**startup, "orchestrator_active": orchestrator is not None}
+    if not startup["ready"]:
+        return Response(content=json.dumps(body), status_code=503, media_type="application/json")
+    return body
+
 @app.post("/chat")
 async def chat(request: ChatRequest):
     """Main chat endpoint"""
@@ -138,19 +360,96 @@ async def ingest_email(request: EmailRequest):
     except Exception as e:
         return {"success": False, "error": str(e)}
 
-@app.get("/state")
-async def get_state():
-    """Get current system state"""
+@app.post("/ingest/emails")
+async def ingest_emails(request: EmailBatchRequest):
+    """Ingest a batch of emails with a single relationship pass"""
+    if not orchestrator:
+        return {"error": "Orchestrator not initialized"}
+    
+    try:
+        result = await orchestrator.ingest_emails(request.emails)
+        return {"success": True, **result}
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+
+@app.post("/ingest/mailbox")
+async def ingest_mailbox(request: MailboxImportRequest):
+    """Start streaming an mbox file or Maildir folder under MAILBOX_IMPORT_ROOT into the graph"""
+    if not orchestrator:
+        return {"error": "Orchestrator not initialized"}
+    
+    path = os.path.abspath(os.path.join(MAILBOX_ROOT, request.path))
+    if os.path.commonpath([path, MAILBOX_ROOT]) != MAILBOX_ROOT:
+        raise HTTPException(status_code=400, detail="Path must be inside the mailbox import root")
+    if not os.path.exists(path):
+        raise HTTPException(status_code=404, detail=f"Mailbox {request.path} not found")
+    if request.batch_size < 1:
+        raise HTTPException(status_code=400, detail="batch_size must be positive")
+    
+    import_id = uuid.uuid4().hex[:12]
+    mailbox_imports[import_id] = {"source": request.path, "done": False, "error": None}
+    
+    def report(status: Dict[str, Any]):
+        mailbox_imports[import_id].update(status, source=request.path)
+    
+    async def run():
+        try:
+            await import_mailbox(orchestrator, path, workers=request.workers,
+                                 batch_size=min(request.batch_size, 5000), progress=report)
+        except Exception as e:
+            logger.error(f"Mailbox import {import_id} failed: {e}")
+            mailbox_imports[import_id].update(done=True, error=str(e))
+        finally:
+            _mailbox_tasks.pop(import_id, None)
+    
+    _mailbox_tasks[import_id] = asyncio.create_task(run())
+    return {"import_id": import_id, **mailbox_imports[import_id]}
+
+@app.get("/ingest/mailbox/{import_id}")
+async def mailbox_import_progress(import_id: str):
+    """Progress and throughput of a mailbox import"""
+    if import_id not in mailbox_imports:
+        raise HTTPException(status_code=404, detail=f"Import {import_id} not found")
+    return mailbox_imports[import_id]
+
+@app.get("/search/emails")
+async def search_emails(q: str, limit: int = 10):
+    """Full-text search over ingested emails, ranked by BM25"""
+    if not orchestrator:
+        return {"error": "Orchestrator not initialized"}
+    
+    results = orchestrator.search_emails(q, limit=max(1, min(limit, 100)))
+    return {"query": q, "results": results, "count": len(results)}
+
+@app.get("/search/semantic")
+async def search_semantic(q: str, limit: int = 10):
+    """Nodes closest in meaning to the query text"""
+    if not orchestrator:
+        return {"error": "Orchestrator not initialized"}
+    
+    results = orchestrator.semantic_search(q, limit=max(1, min(limit, 100)))
+    return {"query": q, "results": results, "count": len(results)}
+
+@app.get("/nodes/{node_id}/similar")
+async def similar_nodes(node_id: str, limit: int = 5):
+    """Suggested RELATED links: similar nodes not yet connected to this one"""
     if not orchestrator:
         return {"error": "Orchestrator not initialized"}
     
+    if not orchestrator.graph.has_node(node_id):
+        raise HTTPException(status_code=404, detail=f"Node {node_id} not found")
+    
+    return {"node_id": node_id, "suggestions": orchestrator.suggest_related(node_id, k=max(1, min(limit, 50)))}
+
+async def _state_payload() -> Dict[str, Any]:
     decision = await orchestrator.decide()
     
     return {
         "graph": {
-            "nodes": len(orchestrator.graph.nodes),
-            "edges": len(orchestrator.graph.edges),
-            "index": {k.value: len(v) for k, v in orchestrator.graph.index.items()}
+            "nodes": orchestrator.graph.node_count(),
+            "edges": orchestrator.graph.edge_count(),
+            "index": {k.value: v for k, v in orchestrator.graph.type_counts().items()},
+            "most_central": orchestrator.centrality.top(5)
         },
         "memory": {
             "short_term": len(orchestrator.memory.short_term),
@@ -162,6 +461,408 @@ async def get_state():
         "timestamp": datetime.now().isoformat()
     }
 
+@app.get("/state")
+async def get_state(request: Request):
+    """Get current system state; concurrent and repeated polls share one computation"""
+    if not orchestrator:
+        return {"error": "Orchestrator not initialized"}
+    
+    return await _cached_response(request, "state", orchestrator.state_version(), _state_payload)
+
+@app.post("/plan")
+async def plan_day(request: PlanRequest):
+    """Pack today's most valuable work into the free time around calendar blocks"""
+    if not orchestrator:
+        return {"error": "Orchestrator not initialized"}
+    
+    if request.budget_hours is not None and request.budget_hours <= 0:
+        raise HTTPException(status_code=400, detail="budget_hours must be positive")
+    
+    return orchestrator.plan_day(
+        budget_hours=request.budget_hours,
+        blocks=[block.model_dump() for block in request.blocks],
+        day_start=parse_time(request.day_start),
+        day_end=parse_time(request.day_end)
+    )
+
+@app.get("/plan")
+async def plan_day_default(budget_hours: Optional[float] = None):
+    """Today's plan (the next working day's after hours) with no calendar blocks beyond the events in the graph"""
+    return await plan_day(PlanRequest(budget_hours=budget_hours))
+
+@app.post("/query")
+async def query_graph(request: QueryRequest):
+    """Filter graph nodes with cursor pagination and optional neighborhood expansion"""
+    if not orchestrator:
+        return {"error": "Orchestrator not initialized"}
+    
+    if not 1 <= request.limit <= 500:
+        raise HTTPException(status_code=400, detail="limit must be between 1 and 500")
+    if request.include_archived and not orchestrator.tiered:
+        raise HTTPException(status_code=400, detail="include_archived needs ORCHESTRATOR_COLD_PATH")
+    
+    filters = {"include_archived": True} if request.include_archived else {}
+    try:
+        page = orchestrator.graph.query(
+            types=_parse_enums(EntityType, request.types),
+            statuses=request.statuses,
+            # Stored deadlines are naive local time; offsets and "Z" are converted to match
+            deadline_from=parse_time(request.deadline_from),
+            deadline_to=parse_time(request.deadline_to),
+            attributes=request.attributes,
+            limit=request.limit,
+            cursor=request.cursor,
+            **filters
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    result = {
+        "nodes": [n.to_dict() for n in page["nodes"]],
+        "next_cursor": page["next_cursor"]
+    }
+    if request.include_archived:
+        result["archived"] = page["archived"]
+    
+    if request.expand:
+        neighborhood = orchestrator.graph.expand(
+            [n.id for n in page["nodes"]],
+            hops=min(request.expand.hops, 5),
+            relation_types=_parse_enums(RelationType, request.expand.relation_types)
+        )
+        result["neighborhood"] = {
+            "nodes": [n.to_dict() for n in neighborhood["nodes"]],
+            "edges": [e.to_dict() for e in neighborhood["edges"]]
+        }
+    
+    return result
+
+@app.get("/nodes/{node_id}/neighbors")
+async def node_neighbors(node_id: str, hops: int = 1, relation_types: Optional[str] = None,
+                         limit: int = 50, cursor: Optional[str] = None):
+    """Paginated N-hop neighborhood of a single node"""
+    if not orchestrator:
+        return {"error": "Orchestrator not initialized"}
+    
+    node = orchestrator.graph.get_node(node_id)
+    if node is None:
+        raise HTTPException(status_code=404, detail=f"Node {node_id} not found")
+    
+    relations = _parse_enums(RelationType, relation_types.split(",") if relation_types else None)
+    neighborhood = orchestrator.graph.expand([node_id], hops=min(hops, 5), relation_types=relations)
+    
+    try:
+        after = decode_cursor(cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    nodes = sorted(neighborhood["nodes"], key=lambda n: n.id)
+    if after is not None:
+        nodes = [n for n in nodes if n.id > after]
+    page = nodes[:limit]
+    page_ids = {n.id for n in page} | {node_id}
+    
+    return {
+        "node": node.to_dict(),
+        "nodes": [n.to_dict() for n in page],
+        "edges": [e.to_dict() for e in neighborhood["edges"]
+                  if e.from_node in page_ids and e.to_node in page_ids],
+        "next_cursor": encode_cursor(page[-1].id) if len(nodes) > limit else None
+    }
+
+@app.post("/nodes/{node_id}/status")
+async def set_node_status(node_id: str, request: StatusRequest):
+    """Mark a task or deadline done, completed or cancelled (or reopen it); done items leave the plan"""
+    if not orchestrator:
+        return {"error": "Orchestrator not initialized"}
+    
+    node = orchestrator.set_status(node_id, request.status)
+    if node is None:
+        raise HTTPException(status_code=404, detail=f"Node {node_id} not found")
+    return node.to_dict()
+
+@app.get("/partitions")
+async def list_partitions(request: Request, min_size: int = 2, limit: int = 50):
+    """Connected parts of the graph (clients, debts, bureaucracy...) with a summary of each"""
+    if not orchestrator:
+        return {"error": "Orchestrator not initialized"}
+    
+    min_size, limit = max(1, min_size), max(1, min(limit, 500))
+    
+    async def compute():
+        return orchestrator.partition_summaries(min_size=min_size, limit=limit)
+    
+    return await _cached_response(
+        request, f"partitions:{min_size}:{limit}", orchestrator.state_version(), compute
+    )
+
+@app.get("/nodes/{node_id}/partition")
+async def node_partition(node_id: str, limit: int = 100):
+    """The partition a node belongs to and its members"""
+    if not orchestrator:
+        return {"error": "Orchestrator not initialized"}
+    
+    partition_id = orchestrator.partitions.partition_of(node_id)
+    if partition_id is None:
+        raise HTTPException(status_code=404, detail=f"Node {node_id} not found")
+    
+    members = sorted(orchestrator.partitions.members[partition_id])
+    return {
+        "partition_id": partition_id,
+        "size": len(members),
+        "members": members[:max(1, limit)]
+    }
+
+def _require_cold_tier():
+    if not orchestrator.tiered:
+        raise HTTPException(status_code=501, detail="No cold tier configured (set ORCHESTRATOR_COLD_PATH)")
+    return orchestrator.graph
+
+@app.get("/archive")
+async def archive_stats():
+    """Nodes and edges in the hot graph and in the cold tier, with archival counters"""
+    if not orchestrator:
+        return {"error": "Orchestrator not initialized"}
+    
+    return _require_cold_tier().stats()
+
+@app.post("/archive/run")
+async def run_archival():
+    """Archive finished and stale nodes now instead of waiting for the hourly sweep"""
+    if not orchestrator:
+        return {"error": "Orchestrator not initialized"}
+    
+    _require_cold_tier()
+    return orchestrator.archive_inactive()
+
+def _require_history():
+    if orchestrator.graph.history is None:
+        raise HTTPException(status_code=501, detail="The configured graph backend does not keep history")
+    return orchestrator.graph.history
+
+@app.get("/history/as-of")
+async def graph_as_of(timestamp: datetime, types: Optional[str] = None,
+                      limit: int = 50, cursor: Optional[str] = None):
+    """Nodes as they were at a point in time, paginated like /query"""
+    if not orchestrator:
+        return {"error": "Orchestrator not initialized"}
+    
+    # History is kept in naive local time
+    timestamp = parse_time(timestamp)
+    # History covers the hot graph only: archiving drops a node's versions, and reading it must not rehydrate it
+    snapshot = _require_history().snapshot(getattr(orchestrator.graph, "hot", orchestrator.graph), timestamp)
+    try:
+        page = snapshot.query(
+            types=_parse_enums(EntityType, types.split(",") if types else None),
+            limit=max(1, min(limit, 500)),
+            cursor=cursor
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    return {
+        "timestamp": timestamp.isoformat(),
+        "graph": {"nodes": len(snapshot.nodes), "edges": len(snapshot.edges)},
+        "nodes": [n.to_dict() for n in page["nodes"]],
+        "next_cursor": page["next_cursor"]
+    }
+
+@app.get("/history/diff")
+async def graph_diff(start: datetime, end: Optional[datetime] = None):
+    """What changed in the graph between two points in time"""
+    if not orchestrator:
+        return {"error": "Orchestrator not initialized"}
+    
+    return _require_history().diff(parse_time(start), parse_time(end) or datetime.now())
+
+@app.get("/nodes/{node_id}/history")
+async def node_history(node_id: str):
+    """Every recorded version of a node"""
+    if not orchestrator:
+        return {"error": "Orchestrator not initialized"}
+    
+    versions = _require_history().versions(node_id)
+    if not versions:
+        raise HTTPException(status_code=404, detail=f"Node {node_id} not found")
+    return {"node_id": node_id, "versions": versions}
+
+@app.get("/notifications")
+async def get_notifications(limit: int = 50):
+    """Most recent urgency transitions raised by the deadline scheduler, and rule firings"""
+    if not orchestrator:
+        return {"error": "Orchestrator not initialized"}
+    
+    recent = list(orchestrator.notifications)[-max(1, min(limit, 500)):]
+    next_due = orchestrator.scheduler.next_due()
+    return {
+        "notifications": list(reversed(recent)),
+        "tracked_deadlines": len(orchestrator.scheduler),
+        "next_transition": next_due.isoformat() if next_due else None
+    }
+
+@app.get("/rules")
+async def list_rules():
+    """User rules with how many matches each currently holds"""
+    if not orchestrator:
+        return {"error": "Orchestrator not initialized"}
+    
+    return {
+        "rules": [orchestrator.rules.describe(name) for name in orchestrator.rules.rules],
+        "stats": orchestrator.rules.stats()
+    }
+
+@app.post("/rules")
+async def add_rule(definition: Dict[str, Any]):
+    """Add or replace a rule: conditions under "when" and an action under "then" (see rules.py)"""
+    if not orchestrator:
+        return {"error": "Orchestrator not initialized"}
+    
+    try:
+        return orchestrator.add_rule(definition)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.delete("/rules/{name}")
+async def remove_rule(name: str):
+    if not orchestrator:
+        return {"error": "Orchestrator not initialized"}
+    
+    if not orchestrator.remove_rule(name):
+        raise HTTPException(status_code=404, detail=f"Rule {name} not found")
+    return {"success": True}
+
+@app.post("/actions")
+async def submit_action(request: ActionRequest, http_request: Request):
+    """Queue an action; an Idempotency-Key header (or field) makes resubmissions return the first record"""
+    if not orchestrator:
+        return {"error": "Orchestrator not initialized"}
+    
+    key = http_request.headers.get("idempotency-key") or request.idempotency_key
+    record = orchestrator.actions.submit(request.model_dump(exclude={"idempotency_key"}), idempotency_key=key)
+    return orchestrator.action_view(record)
+
+@app.get("/actions")
+async def list_actions(limit: int = 50, status: Optional[str] = None):
+    """Recent actions, newest first, with executor counters"""
+    if not orchestrator:
+        return {"error": "Orchestrator not initialized"}
+    
+    records = orchestrator.actions.recent(limit=max(1, min(limit, 500)), status=status)
+    return {
+        "actions": [orchestrator.action_view(r) for r in records],
+        "stats": orchestrator.actions.stats()
+    }
+
+@app.get("/actions/{action_id}")
+async def get_action(action_id: str):
+    if not orchestrator:
+        return {"error": "Orchestrator not initialized"}
+    
+    record = orchestrator.actions.records.get(action_id)
+    if record is None:
+        raise HTTPException(status_code=404, detail=f"Action {action_id} not found")
+    return orchestrator.action_view(record)
+
+@app.get("/admin/memory")
+async def memory_usage(sample: int = SAMPLE_SIZE):
+    """Approximate deep size and item count of each orchestrator structure, largest first.
+    
+    Containers longer than `sample` are measured on a sample and extrapolated;
+    objects shared between structures count in each of them.
+    """
+    if not orchestrator:
+        return {"error": "Orchestrator not initialized"}
+    
+    structures = orchestrator.memory_structures()
+    structures["server.response_cache"] = response_cache
+    structures["server.mailbox_imports"] = mailbox_imports
+    started = time.perf_counter()
+    report = measure(structures, sample=max(10, min(sample, 100000)), exclude=(orchestrator,))
+    return {
+        "process": process_memory(),
+        "structures": report,
+        "structures_bytes": sum(entry["bytes"] for entry in report),
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+        "tracemalloc": allocations.status()
+    }
+
+@app.post("/admin/memory/tracemalloc/start")
+async def start_tracemalloc(frames: int = 1):
+    """Start tracing allocations; more frames attribute them better but cost more memory"""
+    return allocations.start(max(1, min(frames, 50)))
+
+@app.post("/admin/memory/tracemalloc/stop")
+async def stop_tracemalloc():
+    return allocations.stop()
+
+@app.post("/admin/memory/snapshots")
+async def take_memory_snapshot():
+    """Keep a tracemalloc snapshot to diff against later"""
+    try:
+        return allocations.snapshot()
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.get("/admin/memory/snapshots/{since}/diff")
+async def diff_memory_snapshots(since: int, until: Optional[int] = None, group_by: str = "lineno", limit: int = 25):
+    """Allocation growth by source line between two snapshots, or from one snapshot until now"""
+    try:
+        return allocations.diff(since, until, group_by=group_by, limit=min(limit, 500))
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=f"Snapshot {e.args[0]} not found")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.websocket("/ws")
+async def live_updates(websocket: WebSocket, topics: Optional[str] = None):
+    """Stream coalesced graph, urgency and recommendation deltas.
+    
+    `topics` is a comma-separated subset of nodes,edges,urgency,recommendations.
+    A {"type": "resync"} message means deltas were dropped and /state should be refetched.
+    """
+    await websocket.accept()
+    if not orchestrator:
+        await websocket.close(code=1011, reason="Orchestrator not initialized")
+        return
+    if not startup["ready"]:
+        await websocket.close(code=1013, reason="Orchestrator is starting")
+        return
+    
+    subscriber = orchestrator.feed.subscribe(topics.split(",") if topics else None)
+    await websocket.send_json({
+        "type": "hello",
+        "seq": orchestrator.feed.sequence,
+        "topics": sorted(subscriber.topics),
+        "graph": {"nodes": orchestrator.graph.node_count(), "edges": orchestrator.graph.edge_count()}
+    })
+    
+    async def pump():
+        while True:
+            await websocket.send_text(await subscriber.next())
+    
+    async def drain():
+        # Incoming messages are ignored; receiving is how a disconnect is noticed
+        while True:
+            await websocket.receive_text()
+    
+    tasks = [asyncio.create_task(pump()), asyncio.create_task(drain())]
+    try:
+        await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        for task in tasks:
+            task.cancel()
+        orchestrator.feed.unsubscribe(subscriber)
+
+@app.get("/learn/patterns")
+async def learned_patterns(limit: int = 20):
+    """Decayed success rates the decision engine ranks recommendations with"""
+    if not orchestrator:
+        return {"error": "Orchestrator not initialized"}
+    
+    return orchestrator.learner.summary(limit=max(1, min(limit, 200)))
+
 @app.post("/learn")
 async def learn_from_feedback(feedback: Dict[str, Any]):
     """Submit feedback for learning"""
@@ -177,9 +878,26 @@ async def learn_from_feedback(feedback: Dict[str, Any]):
 if __name__ == "__main__":
     host = os.getenv("SMART_SERVER_HOST", "0.0.0.0")
     port = int(os.getenv("SMART_SERVER_PORT", "8000"))
+    workers = int(os.getenv("SMART_SERVER_WORKERS", "1"))
+    
+    if workers > 1:
+        # Workers are separate processes: they can only share the graph, rules, feedback and memory
+        # through the SQLite store, and a JSON state file would be overwritten by whichever worker exits last
+        if os.getenv("ORCHESTRATOR_BACKEND", "memory") != "sqlite":
+            raise SystemExit("SMART_SERVER_WORKERS > 1 requires ORCHESTRATOR_BACKEND=sqlite")
+        if STATE_PATH:
+            raise SystemExit("ORCHESTRATOR_STATE_PATH cannot be used with SMART_SERVER_WORKERS > 1")
+        if COLD_PATH:
+            # Each worker would keep its own idea of which nodes are archived
+            raise SystemExit("ORCHESTRATOR_COLD_PATH cannot be used with SMART_SERVER_WORKERS > 1")
     
+    logging.basicConfig(level=logging.INFO)
     print("🚀 Starting Life Orchestrator Server...")
-    print(f"📡 API available at: http://{host}:{port}")
+    print(f"📡 API available at: http://{host}:{port} ({workers} worker{'s' if workers > 1 else ''})")
     print(f"📚 Documentation: http://{host}:{port}/docs")
     
-    uvicorn.run(app, host=host, port=port, log_level="info")
+    if workers > 1:
+        # Multiple workers need an import string so each process builds its own app
+        uvicorn.run("smart_server:app", host=host, port=port, workers=workers, log_level="info")
+    else:
+        uvicorn.run(app, host=host, port=port, log_level="info")
@@ -0,0 +1,555 @@
+"""
+SQLite Graph Store - On-disk GraphStore implementation
+======================================================
+Nodes and edges live in a single SQLite file with indexes on the columns the
+orchestrator filters by (type, status, client, deadline, edge endpoints), so
+graphs larger than RAM can be queried without loading them. A small LRU of
+decoded nodes keeps hot reads cheap.
+
+Every write also appends to a change log in the same transaction. Several
+processes (uvicorn workers) can open one database file: each polls the log
+for changes made by the others and replays them to its own listeners, so
+in-memory indexes built on top of the store stay in step. State that is not
+part of the graph (rules, learned feedback, memory) goes through the same log
+as JSON values in a small key/value table.
+"""
+
+import json
+import uuid
+import sqlite3
+import logging
+from contextlib import contextmanager
+from collections import OrderedDict
+from dataclasses import replace
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Callable, Iterable, Iterator, Set, Tuple
+
+from life_orchestrator import (
+    ContextNode, ContextEdge, EntityType, RelationType,
+    parse_deadline, encode_cursor, decode_cursor, expand_neighborhood
+)
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS nodes (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    id TEXT NOT NULL UNIQUE,
+    type TEXT NOT NULL,
+    status TEXT NOT NULL,
+    confidence REAL NOT NULL,
+    client TEXT,
+    deadline TEXT,
+    data TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_nodes_type ON nodes(type, id);
+CREATE INDEX IF NOT EXISTS idx_nodes_status ON nodes(status);
+CREATE INDEX IF NOT EXISTS idx_nodes_client ON nodes(client, seq);
+CREATE INDEX IF NOT EXISTS idx_nodes_deadline ON nodes(deadline) WHERE deadline IS NOT NULL;
+
+CREATE TABLE IF NOT EXISTS edges (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    from_node TEXT NOT NULL,
+    to_node TEXT NOT NULL,
+    type TEXT NOT NULL,
+    strength REAL NOT NULL,
+    metadata TEXT NOT NULL,
+    created_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_edges_from ON edges(from_node);
+CREATE INDEX IF NOT EXISTS idx_edges_to ON edges(to_node);
+CREATE INDEX IF NOT EXISTS idx_edges_type ON edges(type);
+
+CREATE TABLE IF NOT EXISTS changes (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    origin TEXT NOT NULL,
+    event TEXT NOT NULL,
+    node_id TEXT,
+    edge_seq INTEGER,
+    payload TEXT
+);
+
+CREATE TABLE IF NOT EXISTS shared (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+# Change log entries kept for workers that fall behind; older ones are pruned
+CHANGE_LOG_LIMIT = 100000
+
+NODE_COLUMNS = "id, type, status, confidence, data, created_at, updated_at"
+EDGE_COLUMNS = "from_node, to_node, type, strength, metadata, created_at"
+
+# Reused encoder: json.dumps builds a new one per call, which dominates bulk inserts
+_encode = json.JSONEncoder(ensure_ascii=False, default=str).encode
+
+def _deadline_key(value: Optional[datetime]) -> Optional[str]:
+    # Fixed-width timestamps so text ordering in SQL equals time ordering
+    return value.isoformat(timespec="microseconds") if value else None
+
+class SQLiteGraphStore:
+    """GraphStore backed by a SQLite database file"""
+
+    history = None
+
+    def __init__(self, path: str, cache_size: int = 10000):
+        self.path = path
+        # Writers in other processes hold the lock briefly; wait for it rather than fail
+        self.conn = sqlite3.connect(path, isolation_level=None, check_same_thread=False, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self.origin = uuid.uuid4().hex
+        # The change log sequence is shared by every process, so versions agree across workers
+        self.version = self.conn.execute("SELECT COALESCE(MAX(seq), 0) FROM changes").fetchone()[0]
+        self._last_seen = self.version
+        self._writes = 0
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, ContextNode]" = OrderedDict()
+        self._listeners: List[Callable[[str, Any], None]] = []
+        logger.info(f"SQLite graph store opened at {path}: {self.node_count()} nodes")
+
+    def close(self):
+        self.conn.close()
+
+    def subscribe(self, listener: Callable[[str, Any], None]):
+        self._listeners.append(listener)
+
+    def _notify(self, event: str, payload: Any, seq: int):
+        self.version = max(self.version, seq)
+        for listener in self._listeners:
+            listener(event, payload)
+
+    # ---------- transactions and change log ----------
+
+    @contextmanager
+    def _transaction(self):
+        # IMMEDIATE takes the write lock up front, so concurrent writers queue instead of deadlocking
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        self.conn.execute("COMMIT")
+
+    def _log(self, event: str, node_id: Optional[str] = None, edge_seq: Optional[int] = None,
+             payload: Optional[str] = None) -> int:
+        """Append to the change log; must run inside the write transaction"""
+        seq = self.conn.execute(
+            "INSERT INTO changes (origin, event, node_id, edge_seq, payload) VALUES (?, ?, ?, ?, ?)",
+            (self.origin, event, node_id, edge_seq, payload)
+        ).lastrowid
+        self._writes += 1
+        if self._writes % 1000 == 0:
+            self.conn.execute("DELETE FROM changes WHERE seq <= ?", (seq - CHANGE_LOG_LIMIT,))
+        return seq
+
+    def poll_changes(self, limit: int = 5000) -> List[Tuple[str, Any]]:
+        """Replay writes made by other processes since the last poll to this store's listeners"""
+        rows = self.conn.execute(
+            "SELECT seq, origin, event, node_id, edge_seq, payload FROM changes WHERE seq > ? ORDER BY seq LIMIT ?",
+            (self._last_seen, limit)
+        ).fetchall()
+        if not rows:
+            return []
+
+        if rows[0][0] != self._last_seen + 1:
+            oldest = self.conn.execute("SELECT MIN(seq) FROM changes").fetchone()[0]
+            if oldest > self._last_seen + 1:
+                # Fell behind the pruned log: everything derived from the store must be rebuilt
+                self._last_seen = rows[-1][0]
+                self._cache.clear()
+                self._notify("bulk_loaded", None, rows[-1][0])
+                return [("bulk_loaded", None)]
+
+        replayed = []
+        for seq, origin, event, node_id, edge_seq, payload in rows:
+            self._last_seen = seq
+            if origin == self.origin:
+                continue
+            if node_id is not None:
+                self._cache.pop(node_id, None)
+            if event in ("node_added", "node_updated"):
+                item = self.get_node(node_id)
+                if item is None:
+                    # Removed again later in the log; that entry reports it
+                    continue
+            elif event == "node_removed":
+                item = ContextNode.from_dict(json.loads(payload))
+            elif event == "edge_added":
+                row = self.conn.execute(f"SELECT {EDGE_COLUMNS} FROM edges WHERE seq = ?", (edge_seq,)).fetchone()
+                if row is None:
+                    continue
+                item = self._to_edge(row)
+            elif event == "shared_changed":
+                # Listeners read the current value with get_shared
+                item = payload
+            else:
+                self._cache.clear()
+                item = None
+            self._notify(event, item, seq)
+            replayed.append((event, item))
+        return replayed
+
+    # ---------- shared state ----------
+
+    def get_shared(self, key: str) -> Any:
+        row = self.conn.execute("SELECT value FROM shared WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def iter_shared(self, prefix: str = "") -> Iterator[Tuple[str, Any]]:
+        """Shared values whose key starts with prefix, oldest write first"""
+        rows = self.conn.execute(
+            "SELECT key, value FROM shared WHERE substr(key, 1, ?) = ? ORDER BY rowid", (len(prefix), prefix)
+        ).fetchall()
+        for key, value in rows:
+            yield key, json.loads(value)
+
+    def update_shared(self, key: str, update: Callable[[Any], Any]) -> Any:
+        """Replace a shared value with update(current) under the write lock; None deletes it.
+
+        Other processes see a shared_changed event carrying the key on their next poll.
+        """
+        with self._transaction():
+            value = update(self.get_shared(key))
+            if value is None:
+                self.conn.execute("DELETE FROM shared WHERE key = ?", (key,))
+            else:
+                self.conn.execute("INSERT OR REPLACE INTO shared (key, value) VALUES (?, ?)", (key, _encode(value)))
+            seq = self._log("shared_changed", payload=key)
+        # Local listeners already hold the value; only the version moves
+        self.version = max(self.version, seq)
+        return value
+
+    def put_shared(self, key: str, value: Any):
+        self.update_shared(key, lambda current: value)
+
+    # ---------- row mapping ----------
+
+    @staticmethod
+    def _node_row(node: ContextNode):
+        client = node.data.get("client")
+        return (
+            node.id, node.type.value, node.status, node.confidence,
+            client if isinstance(client, (str, int, float)) else None,
+            _deadline_key(parse_deadline(node)),
+            _encode(node.data),
+            node.created_at.isoformat(), node.updated_at.isoformat()
+        )
+
+    def _to_node(self, row) -> ContextNode:
+        node = ContextNode(
+            id=row[0],
+            type=EntityType(row[1]),
+            status=row[2],
+            confidence=row[3],
+            data=json.loads(row[4]),
+            created_at=datetime.fromisoformat(row[5]),
+            updated_at=datetime.fromisoformat(row[6])
+        )
+        self._remember(node)
+        return node
+
+    @staticmethod
+    def _edge_row(edge: ContextEdge):
+        return (
+            edge.from_node, edge.to_node, edge.type.value, edge.strength,
+            _encode(edge.metadata), edge.created_at.isoformat()
+        )
+
+    @staticmethod
+    def _to_edge(row) -> ContextEdge:
+        return ContextEdge(
+            from_node=row[0],
+            to_node=row[1],
+            type=RelationType(row[2]),
+            strength=row[3],
+            metadata=json.loads(row[4]),
+            created_at=datetime.fromisoformat(row[5])
+        )
+
+    def _remember(self, node: ContextNode):
+        self._cache[node.id] = node
+        self._cache.move_to_end(node.id)
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    # ---------- nodes ----------
+
+    def add_node(self, node: ContextNode):
+        with self._transaction():
+            # Read inside the transaction: another process may have written this id since our cache saw it
+            row = self.conn.execute("SELECT created_at, updated_at FROM nodes WHERE id = ?", (node.id,)).fetchone()
+            if row is not None:
+                node.created_at = datetime.fromisoformat(row[0])
+                if node.updated_at <= datetime.fromisoformat(row[1]):
+                    node.updated_at = datetime.now()
+                # Delete and re-insert so seq reflects the latest write
+                self.conn.execute("DELETE FROM nodes WHERE id = ?", (node.id,))
+            self.conn.execute(
+                "INSERT INTO nodes (id, type, status, confidence, client, deadline, data, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                self._node_row(node)
+            )
+            event = "node_updated" if row is not None else "node_added"
+            seq = self._log(event, node_id=node.id)
+        self._remember(node)
+        self._notify(event, node, seq)
+
+    def update_node(self, node_id: str, data: Optional[Dict[str, Any]] = None,
+                    status: Optional[str] = None, confidence: Optional[float] = None) -> ContextNode:
+        current = self.get_node(node_id)
+        if current is None:
+            raise KeyError(node_id)
+        updated = replace(
+            current,
+            data={**current.data, **(data or {})},
+            status=status if status is not None else current.status,
+            confidence=confidence if confidence is not None else current.confidence,
+            updated_at=datetime.now()
+        )
+        self.add_node(updated)
+        return updated
+
+    def remove_node(self, node_id: str) -> Optional[ContextNode]:
+        node = self.get_node(node_id)
+        if node is None:
+            return None
+        with self._transaction():
+            self.conn.execute("DELETE FROM nodes WHERE id = ?", (node_id,))
+            self.conn.execute("DELETE FROM edges WHERE from_node = ? OR to_node = ?", (node_id, node_id))
+            seq = self._log("node_removed", node_id=node_id, payload=_encode(node.to_dict()))
+        self._cache.pop(node_id, None)
+        self._notify("node_removed", node, seq)
+        return node
+
+    def remove_nodes(self, node_ids: Iterable[str], record_removal: bool = True) -> List[ContextNode]:
+        """Remove many nodes in one transaction; there is no history to record removals in"""
+        nodes = [node for node in map(self.get_node, node_ids) if node is not None]
+        if not nodes:
+            return []
+        seqs = []
+        with self._transaction():
+            for node in nodes:
+                self.conn.execute("DELETE FROM nodes WHERE id = ?", (node.id,))
+                self.conn.execute("DELETE FROM edges WHERE from_node = ? OR to_node = ?", (node.id, node.id))
+                seqs.append(self._log("node_removed", node_id=node.id, payload=_encode(node.to_dict())))
+        for node, seq in zip(nodes, seqs):
+            self._cache.pop(node.id, None)
+            self._notify("node_removed", node, seq)
+        return nodes
+
+    def detach_node(self, node_id: str,
+                    take_edge: Callable[[ContextEdge], bool]) -> Tuple[Optional[ContextNode], List[ContextEdge]]:
+        """Remove a node and the edges take_edge selects, returning both; its other edges stay stored"""
+        node = self.get_node(node_id)
+        if node is None:
+            return None, []
+        rows = self.conn.execute(
+            f"SELECT seq, {EDGE_COLUMNS} FROM edges WHERE from_node = ? OR to_node = ?", (node_id, node_id)
+        ).fetchall()
+        taken = [(row[0], edge) for row in rows for edge in (self._to_edge(row[1:]),) if take_edge(edge)]
+        with self._transaction():
+            self.conn.execute("DELETE FROM nodes WHERE id = ?", (node_id,))
+            self.conn.executemany("DELETE FROM edges WHERE seq = ?", [(seq,) for seq, _ in taken])
+            seq = self._log("node_removed", node_id=node_id, payload=_encode(node.to_dict()))
+        self._cache.pop(node_id, None)
+        self._notify("node_removed", node, seq)
+        return node, [edge for _, edge in taken]
+
+    def get_node(self, node_id: str) -> Optional[ContextNode]:
+        cached = self._cache.get(node_id)
+        if cached is not None:
+            self._cache.move_to_end(node_id)
+            return cached
+        row = self.conn.execute(f"SELECT {NODE_COLUMNS} FROM nodes WHERE id = ?", (node_id,)).fetchone()
+        return self._to_node(row) if row else None
+
+    def has_node(self, node_id: str) -> bool:
+        if node_id in self._cache:
+            return True
+        return self.conn.execute("SELECT 1 FROM nodes WHERE id = ?", (node_id,)).fetchone() is not None
+
+    def iter_nodes(self, types: Optional[List[EntityType]] = None) -> Iterator[ContextNode]:
+        """Streams rows in insertion order without materializing the whole table"""
+        if types:
+            marks = ",".join("?" * len(types))
+            cursor = self.conn.execute(
+                f"SELECT {NODE_COLUMNS} FROM nodes WHERE type IN ({marks}) ORDER BY seq",
+                [t.value for t in types]
+            )
+        else:
+            cursor = self.conn.execute(f"SELECT {NODE_COLUMNS} FROM nodes ORDER BY seq")
+        while True:
+            rows = cursor.fetchmany(1000)
+            if not rows:
+                break
+            for row in rows:
+                yield self._to_node(row)
+
+    def node_count(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM nodes").fetchone()[0]
+
+    def type_counts(self) -> Dict[EntityType, int]:
+        rows = self.conn.execute("SELECT type, COUNT(*) FROM nodes GROUP BY type").fetchall()
+        return {EntityType(t): count for t, count in rows}
+
+    def find_by_attribute(self, key: str, value: Any, limit: Optional[int] = None) -> List[ContextNode]:
+        """Nodes whose data[key] == value, most recently written first"""
+        if key == "client":
+            sql = f"SELECT {NODE_COLUMNS} FROM nodes WHERE client = ? ORDER BY seq DESC"
+        else:
+            sql = f"SELECT {NODE_COLUMNS} FROM nodes WHERE json_extract(data, '$.' || ?) = ? ORDER BY seq DESC"
+        params: List[Any] = [value] if key == "client" else [key, value]
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [self._to_node(row) for row in self.conn.execute(sql, params)]
+
+    def deadline_range(self, start: Optional[datetime] = None, end: Optional[datetime] = None,
+                       limit: Optional[int] = None, descending: bool = False) -> List[ContextNode]:
+        clauses, params = ["deadline IS NOT NULL"], []
+        if start:
+            clauses.append("deadline >= ?")
+            params.append(_deadline_key(start))
+        if end:
+            clauses.append("deadline <= ?")
+            params.append(_deadline_key(end))
+        sql = f"SELECT {NODE_COLUMNS} FROM nodes WHERE {' AND '.join(clauses)} " \
+              f"ORDER BY deadline {'DESC' if descending else 'ASC'}"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [self._to_node(row) for row in self.conn.execute(sql, params)]
+
+    # ---------- edges ----------
+
+    def add_edge(self, edge: ContextEdge):
+        with self._transaction():
+            edge_seq = self.conn.execute(
+                f"INSERT INTO edges ({EDGE_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?)", self._edge_row(edge)
+            ).lastrowid
+            seq = self._log("edge_added", edge_seq=edge_seq)
+        self._notify("edge_added", edge, seq)
+
+    def iter_edges(self, relation_types: Optional[List[RelationType]] = None) -> Iterator[ContextEdge]:
+        if relation_types:
+            marks = ",".join("?" * len(relation_types))
+            cursor = self.conn.execute(
+                f"SELECT {EDGE_COLUMNS} FROM edges WHERE type IN ({marks}) ORDER BY seq",
+                [t.value for t in relation_types]
+            )
+        else:
+            cursor = self.conn.execute(f"SELECT {EDGE_COLUMNS} FROM edges ORDER BY seq")
+        while True:
+            rows = cursor.fetchmany(1000)
+            if not rows:
+                break
+            for row in rows:
+                yield self._to_edge(row)
+
+    def edge_count(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM edges").fetchone()[0]
+
+    def neighbors(self, node_id: str, relation_types: Optional[List[RelationType]] = None) -> List[ContextEdge]:
+        sql = f"SELECT {EDGE_COLUMNS} FROM edges WHERE from_node = ? " \
+              f"UNION ALL SELECT {EDGE_COLUMNS} FROM edges WHERE to_node = ? AND from_node != ?"
+        edges = [self._to_edge(row) for row in self.conn.execute(sql, (node_id, node_id, node_id))]
+        if relation_types:
+            edges = [e for e in edges if e.type in relation_types]
+        return edges
+
+    def linked_ids(self, node_id: str) -> Set[str]:
+        rows = self.conn.execute(
+            "SELECT to_node FROM edges WHERE from_node = ? UNION SELECT from_node FROM edges WHERE to_node = ?",
+            (node_id, node_id)
+        )
+        return {row[0] for row in rows}
+
+    def bulk_load(self, nodes: Iterable[ContextNode], edges: Iterable[ContextEdge]):
+        """Batched inserts in one transaction; existing ids are overwritten, existing edges skipped"""
+        def batches(items, to_row, size=5000):
+            batch = []
+            for item in items:
+                batch.append(to_row(item))
+                if len(batch) >= size:
+                    yield batch
+                    batch = []
+            if batch:
+                yield batch
+
+        with self._transaction():
+            for batch in batches(nodes, self._node_row):
+                self.conn.executemany(
+                    "INSERT OR REPLACE INTO nodes "
+                    "(id, type, status, confidence, client, deadline, data, created_at, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    batch
+                )
+            for batch in batches(edges, self._edge_row):
+                # Edges that already exist (same endpoints and type) are skipped, so loads can be repeated
+                self.conn.executemany(
+                    f"INSERT INTO edges ({EDGE_COLUMNS}) SELECT ?, ?, ?, ?, ?, ? WHERE NOT EXISTS "
+                    "(SELECT 1 FROM edges WHERE from_node = ?1 AND to_node = ?2 AND type = ?3)",
+                    batch
+                )
+            seq = self._log("bulk_loaded")
+        self._cache.clear()
+        self._notify("bulk_loaded", None, seq)
+
+    # ---------- traversal and queries ----------
+
+    def expand(self, node_ids: List[str], hops: int = 1,
+               relation_types: Optional[List[RelationType]] = None) -> Dict[str, Any]:
+        return expand_neighborhood(self, node_ids, hops, relation_types)
+
+    def query(self, types: Optional[List[EntityType]] = None,
+              statuses: Optional[List[str]] = None,
+              deadline_from: Optional[datetime] = None,
+              deadline_to: Optional[datetime] = None,
+              attributes: Optional[Dict[str, Any]] = None,
+              limit: int = 50,
+              cursor: Optional[str] = None) -> Dict[str, Any]:
+        """Same contract as ContextGraph.query, evaluated in SQL"""
+        clauses, params = [], []
+        after = decode_cursor(cursor)
+        if after is not None:
+            clauses.append("id > ?")
+            params.append(after)
+        if types:
+            clauses.append(f"type IN ({','.join('?' * len(types))})")
+            params.extend(t.value for t in types)
+        if statuses:
+            clauses.append(f"status IN ({','.join('?' * len(statuses))})")
+            params.extend(statuses)
+        if deadline_from:
+            clauses.append("deadline >= ?")
+            params.append(_deadline_key(deadline_from))
+        if deadline_to:
+            clauses.append("deadline <= ?")
+            params.append(_deadline_key(deadline_to))
+        if deadline_from or deadline_to:
+            clauses.append("deadline IS NOT NULL")
+        for key, expected in (attributes or {}).items():
+            column = "client" if key == "client" else "json_extract(data, ?)"
+            if column != "client":
+                params.append(f"$.{key}")
+            values = expected if isinstance(expected, list) else [expected]
+            clauses.append(f"{column} IN ({','.join('?' * len(values))})")
+            params.extend(values)
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self.conn.execute(
+            f"SELECT {NODE_COLUMNS} FROM nodes {where} ORDER BY id LIMIT ?",
+            params + [limit + 1]
+        ).fetchall()
+
+        page = [self._to_node(row) for row in rows[:limit]]
+        return {
+            "nodes": page,
+            "next_cursor": encode_cursor(page[-1].id) if len(rows) > limit else None
+        }
@@ -0,0 +1,62 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta
+
+from bulk_io import main
+from life_orchestrator import LifeOrchestrator
+
+def saved_state(path):
+    orchestrator = LifeOrchestrator()
+    due = (datetime.now() + timedelta(days=10)).isoformat()
+    asyncio.run(orchestrator.perceive({"deadline": {"id": "tax", "title": "Annual tax report", "deadline": due}}))
+    orchestrator.memory.store("preference", {"channel": "email"})
+    orchestrator.save_state(str(path))
+    return orchestrator
+
+def test_state_file_keeps_memory(tmp_path):
+    original = saved_state(tmp_path / "state.json")
+    restored = LifeOrchestrator()
+    assert restored.load_state(str(tmp_path / "state.json"))
+    assert restored.memory.recall("preference") == {"channel": "email"}
+    assert set(restored.memory.long_term) == set(original.memory.long_term)
+
+def test_memory_survives_export_and_import_between_state_files(tmp_path):
+    original = saved_state(tmp_path / "source.json")
+    main(["export", str(tmp_path / "dump.logd"), "--state", str(tmp_path / "source.json")])
+    main(["import", str(tmp_path / "dump.logd"), "--state", str(tmp_path / "target.json")])
+
+    restored = LifeOrchestrator()
+    restored.load_state(str(tmp_path / "target.json"))
+    assert restored.graph.node_count() == original.graph.node_count()
+    assert restored.memory.recall("preference") == {"channel": "email"}
+
+def test_import_into_database_warns_that_memory_is_dropped(tmp_path, caplog):
+    saved_state(tmp_path / "source.json")
+    main(["export", str(tmp_path / "dump.logd"), "--state", str(tmp_path / "source.json")])
+    with caplog.at_level(logging.WARNING, logger="bulk_io"):
+        main(["import", str(tmp_path / "dump.logd"), "--db", str(tmp_path / "graph.db")])
+    assert any("memory entries" in record.getMessage() for record in caplog.records)
+
+def test_importing_the_same_dump_twice_changes_nothing(tmp_path):
+    original = saved_state(tmp_path / "source.json")
+    asyncio.run(original.perceive({"task": {"id": "return", "title": "File the annual tax report"}}))
+    original.memory.episodic.append({"id": "action_1", "status": "done"})
+    original.memory.patterns["pattern_today"] = [{"action": "call", "success": True}] * 2
+    original.save_state(str(tmp_path / "source.json"))
+    assert original.graph.edge_count() > 0
+    main(["export", str(tmp_path / "dump.logd"), "--state", str(tmp_path / "source.json")])
+
+    for target in (["--state", str(tmp_path / "target.json")], ["--db", str(tmp_path / "graph.db")]):
+        main(["import", str(tmp_path / "dump.logd"), *target])
+        main(["import", str(tmp_path / "dump.logd"), *target])
+
+    restored = LifeOrchestrator()
+    restored.load_state(str(tmp_path / "target.json"))
+    assert restored.graph.node_count() == original.graph.node_count()
+    assert restored.graph.edge_count() == original.graph.edge_count()
+    assert restored.memory.episodic == original.memory.episodic
+    assert restored.memory.patterns == original.memory.patterns
+
+    from sqlite_store import SQLiteGraphStore
+    store = SQLiteGraphStore(str(tmp_path / "graph.db"))
+    assert (store.node_count(), store.edge_count()) == (original.graph.node_count(), original.graph.edge_count())
@@ -0,0 +1,68 @@
+import random
+
+from centrality import CentralityIndex, FORWARD, REVERSE
+
+RELATIONS = ["blocks", "requires", "related", "depends_on", "enables", "mentioned"]
+
+def brute_force(nodes, edges, damping):
+    """Scores by power iteration over the weighted links, dangling rank dropped, normalized to mean 1"""
+    out = {n: {} for n in nodes}
+    for a, b, relation, strength in edges:
+        pairs = [(a, b)] if relation in FORWARD else [(b, a)] if relation in REVERSE else [(a, b), (b, a)]
+        for x, y in pairs:
+            out[x][y] = out[x].get(y, 0.0) + strength
+    rank = {n: 1 - damping for n in nodes}
+    for _ in range(500):
+        following = {n: 1 - damping for n in nodes}
+        for x, links in out.items():
+            total = sum(links.values())
+            for y, w in links.items():
+                following[y] += damping * rank[x] * w / total
+        rank = following
+    total = sum(rank.values())
+    return {n: r * len(nodes) / total for n, r in rank.items()}
+
+def test_push_pagerank_matches_power_iteration_under_random_changes():
+    rng = random.Random(13)
+    index = CentralityIndex(tolerance=1e-10)
+    nodes, edges = set(), []
+    ids = [f"n{i}" for i in range(30)]
+    for step in range(400):
+        action = rng.random()
+        if action < 0.15:
+            node = rng.choice(ids)
+            index.add_node(node)
+            nodes.add(node)
+        elif action < 0.85:
+            a, b = rng.sample(ids, 2)
+            relation, strength = rng.choice(RELATIONS), rng.choice([0.5, 1.0, 2.0])
+            index.add_edge(a, b, relation, strength)
+            nodes.update((a, b))
+            edges.append((a, b, relation, strength))
+        else:
+            node = rng.choice(ids)
+            index.remove_node(node)
+            nodes.discard(node)
+            edges = [e for e in edges if node not in e[:2]]
+
+        if step % 20 == 19 and nodes:
+            expected = brute_force(nodes, edges, index.damping)
+            for node in nodes:
+                assert abs(index.score(node) - expected[node]) < 1e-6, f"step {step}, {node}"
+
+def test_default_tolerance_keeps_the_ranking():
+    rng = random.Random(2)
+    index = CentralityIndex()
+    nodes, edges = set(), []
+    for _ in range(300):
+        a, b = rng.sample([f"n{i}" for i in range(60)], 2)
+        relation = rng.choice(RELATIONS)
+        index.add_edge(a, b, relation)
+        nodes.update((a, b))
+        edges.append((a, b, relation, 1.0))
+    expected = brute_force(nodes, edges, index.damping)
+    for node in nodes:
+        # Error bound: tolerance / (1 - damping) relative to the total, scaled by the node count
+        assert abs(index.score(node) - expected[node]) < 1e-4 / (1 - index.damping) * len(nodes)
+    top = [entry["node_id"] for entry in index.top(5)]
+    assert top[0] == max(expected, key=expected.get)
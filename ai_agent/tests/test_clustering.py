@@ -0,0 +1,89 @@
+import random
+from datetime import datetime, timedelta
+
+from clustering import TaskClusterer
+
+WORDS = ["invoice", "client", "report", "tax", "renew", "insurance", "car", "bank", "call", "send", "march", "april"]
+
+def brute_force(clusterer, tasks, deps):
+    """Components of the 'could be handled together' relation, recomputed over every pair of open tasks"""
+    open_tasks = sorted(t for t, (_, _, _, status) in tasks.items() if status not in clusterer.DONE_STATUSES)
+    size = clusterer.deadline_window_days
+    signatures = {t: clusterer._minhash(tasks[t][0]) for t in open_tasks}
+    rows = clusterer.rows
+
+    def linked(a, b):
+        signals = set()
+        _, client_a, deadline_a, _ = tasks[a]
+        _, client_b, deadline_b, _ = tasks[b]
+        if client_a and client_a == client_b:
+            if deadline_a and deadline_b:
+                da, db = deadline_a.toordinal(), deadline_b.toordinal()
+                if da // size == db // size or (da + size // 2) // size == (db + size // 2) // size:
+                    signals.add("client")
+            elif not deadline_a and not deadline_b:
+                signals.add("client")
+        if {b_ for t, b_ in deps if t == a} & {b_ for t, b_ in deps if t == b}:
+            signals.add("blocker")
+        sa, sb = signatures[a], signatures[b]
+        if sa and sb and any(sa[i * rows:(i + 1) * rows] == sb[i * rows:(i + 1) * rows] for i in range(clusterer.bands)):
+            if clusterer._similarity(sa, sb) >= clusterer.text_threshold:
+                signals.add("lsh")
+        return signals
+
+    parent = {t: t for t in open_tasks}
+
+    def find(t):
+        while parent[t] != t:
+            t = parent[t]
+        return t
+
+    edge_signals = []
+    for i, a in enumerate(open_tasks):
+        for b in open_tasks[i + 1:]:
+            signals = linked(a, b)
+            if signals:
+                parent[find(b)] = find(a)
+                edge_signals.append((a, signals))
+    groups = {}
+    for t in open_tasks:
+        groups.setdefault(find(t), set()).add(t)
+    signals = {}
+    for a, s in edge_signals:
+        signals.setdefault(find(a), set()).update(s)
+    return {frozenset(members): frozenset(signals.get(root, ())) for root, members in groups.items()}
+
+def test_incremental_clusters_match_brute_force_under_random_changes():
+    rng = random.Random(21)
+    clusterer = TaskClusterer()
+    tasks, deps = {}, set()
+    ids = [f"t{i}" for i in range(25)]
+    base = datetime(2030, 1, 1)
+    for step in range(500):
+        action = rng.random()
+        if action < 0.6:
+            task = rng.choice(ids)
+            text = " ".join(rng.sample(WORDS, rng.randint(1, 4)))
+            client = rng.choice(["acme", "globex", None])
+            deadline = base + timedelta(days=rng.randint(0, 12)) if rng.random() < 0.6 else None
+            status = "done" if rng.random() < 0.1 else "active"
+            tasks[task] = (text, client, deadline, status)
+            clusterer.update(task, text, client=client, deadline=deadline, status=status)
+        elif action < 0.8:
+            task, blocker = rng.sample(ids, 2)
+            deps.add((task, blocker))
+            clusterer.add_dependency(task, blocker)
+        else:
+            node = rng.choice(ids)
+            clusterer.remove(node)
+            tasks.pop(node, None)
+            deps = {(t, b) for t, b in deps if node not in (t, b)}
+
+        expected = brute_force(clusterer, tasks, deps)
+        labels = {"client": "same client and deadline window", "blocker": "shared dependency",
+                  "lsh": "similar description"}
+        actual = {
+            frozenset(c["task_ids"]): frozenset(k for k, label in labels.items() if label in c["signals"])
+            for c in clusterer.clusters(min_size=1)
+        }
+        assert actual == expected, f"step {step}"
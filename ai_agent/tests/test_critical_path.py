@@ -0,0 +1,91 @@
+import math
+import random
+import asyncio
+from datetime import datetime, timedelta
+
+from critical_path import CriticalPathScheduler
+from life_orchestrator import LifeOrchestrator, ContextEdge, RelationType
+
+def brute_force(scheduler):
+    """Earliest starts and latest finishes recomputed from scratch over the open tasks"""
+    tasks = set(scheduler.duration)
+    earliest, latest = {}, {}
+
+    def early(t):
+        if t not in earliest:
+            earliest[t] = max((early(b) + scheduler.duration[b]
+                               for b in scheduler.blockers.get(t, ()) if b in tasks), default=0.0)
+        return earliest[t]
+
+    def late(t):
+        if t not in latest:
+            value = min((late(n) - scheduler.duration[n] for n in scheduler.blocked.get(t, ()) if n in tasks),
+                        default=math.inf)
+            latest[t] = min(value, scheduler.deadline.get(t, math.inf))
+        return latest[t]
+
+    for t in tasks:
+        early(t)
+        late(t)
+    return earliest, latest
+
+def test_incremental_matches_brute_force_on_random_dags():
+    rng = random.Random(7)
+    scheduler = CriticalPathScheduler()
+    base = datetime(2030, 1, 1)
+    ids = [f"t{i}" for i in range(60)]
+    for step in range(400):
+        task = rng.choice(ids)
+        action = rng.random()
+        if action < 0.5:
+            deadline = base + timedelta(hours=rng.randint(1, 500)) if rng.random() < 0.5 else None
+            scheduler.update(task, rng.uniform(0.5, 8), deadline, "done" if rng.random() < 0.1 else "active")
+        elif action < 0.9:
+            # Edges only from lower to higher index keep the network acyclic
+            a, b = sorted(rng.sample(range(len(ids)), 2))
+            scheduler.add_dependency(ids[b], ids[a])
+        else:
+            scheduler.remove(task)
+        if step % 20 == 0:
+            scheduler.refresh()
+            earliest, latest = brute_force(scheduler)
+            assert scheduler.earliest == earliest
+            assert scheduler.latest_finish == latest
+
+def test_cycle_members_have_no_schedule():
+    scheduler = CriticalPathScheduler()
+    due = datetime.now() + timedelta(hours=2)
+    scheduler.update("a", 3, due)
+    scheduler.update("b", 3, due)
+    scheduler.update("c", 1, due)
+    scheduler.add_dependency("a", "b")
+    scheduler.add_dependency("b", "a")
+    scheduler.add_dependency("c", "b")
+
+    assert scheduler.slack("a") is None
+    assert scheduler.info("b") is None
+    # Downstream of the cycle there is no earliest start either
+    assert scheduler.info("c") is None
+    assert scheduler.critical() == []
+    assert scheduler.critical_path() == []
+
+def test_cycle_does_not_break_decide_or_plan():
+    orchestrator = LifeOrchestrator()
+    due = (datetime.now() + timedelta(hours=3)).isoformat()
+    asyncio.run(orchestrator.perceive({"task": {"id": "a", "title": "A", "deadline": due}}))
+    asyncio.run(orchestrator.perceive({"task": {"id": "b", "title": "B", "deadline": due}}))
+    # Written straight to the graph, as a sync from another worker or a bulk import would
+    orchestrator.graph.add_edge(ContextEdge(from_node="task_a", to_node="task_b", type=RelationType.BLOCKS))
+    orchestrator.graph.add_edge(ContextEdge(from_node="task_b", to_node="task_a", type=RelationType.BLOCKS))
+
+    asyncio.run(orchestrator.decide())
+    orchestrator.plan_day()
+
+def test_ingest_skips_dependencies_that_close_a_cycle():
+    orchestrator = LifeOrchestrator()
+    asyncio.run(orchestrator.perceive({"task": {"id": "a", "title": "A"}}))
+    asyncio.run(orchestrator.perceive({"task": {"id": "b", "title": "B", "depends_on": ["task_a"]}}))
+    asyncio.run(orchestrator.perceive({"task": {"id": "a", "title": "A again", "depends_on": ["task_b"]}}))
+
+    blocks = list(orchestrator.graph.iter_edges([RelationType.BLOCKS]))
+    assert [(e.from_node, e.to_node) for e in blocks] == [("task_a", "task_b")]
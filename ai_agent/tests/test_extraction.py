@@ -0,0 +1,73 @@
+import random
+import asyncio
+from collections import Counter
+
+import extraction
+from extraction import AhoCorasick, EntityExtractor
+from life_orchestrator import LifeOrchestrator
+
+def test_generic_words_need_a_date_right_after_them():
+    extractor = EntityExtractor()
+    assert extractor.extract("Please pay until 15.3.2030")["mentions_deadline"]
+    assert extractor.extract("Payment due: 05/03/2030")["mentions_deadline"]
+    assert extractor.extract("יש לשלם עד ה-15.3.2030")["mentions_deadline"]
+    assert not extractor.extract("We are open until late. Meeting on 2030-03-05")["mentions_deadline"]
+    assert not extractor.extract("נתראה עד אז. פגישה ב 5.3.2030")["mentions_deadline"]
+    assert not extractor.extract("Payment due, call me")["mentions_deadline"]
+    assert extractor.extract("The deadline is next week")["mentions_deadline"]
+    assert extractor.extract("מועד אחרון להגשה")["mentions_deadline"]
+
+def brute_force(patterns, text):
+    text = text.lower()
+    found = []
+    for pattern in patterns:
+        start = text.find(pattern)
+        while start != -1:
+            end = start + len(pattern)
+            if (start == 0 or not text[start - 1].isalnum()) and (end == len(text) or not text[end].isalnum()):
+                found.append((start, end, pattern))
+            start = text.find(pattern, start + 1)
+    return sorted(found, key=lambda m: (m[1], m[0]))
+
+def test_batched_automaton_matches_brute_force():
+    rng = random.Random(3)
+    words = ["dan", "dana", "cohen", "dan cohen", "levi", "ana", "נועה", "נועה לוי", "לוי", "acme", "acme ltd"]
+    matcher = AhoCorasick()
+    added = []
+    for step in range(200):
+        word = rng.choice(words) + ("" if rng.random() < 0.5 else f" {rng.randint(0, 300)}")
+        matcher.add(word, word)
+        if word not in added:
+            added.append(word)
+        text = " ".join(rng.choice(words + ["and", "x", str(rng.randint(0, 300))]) for _ in range(12))
+        assert [(s, e, p) for s, e, p in matcher.find_all(text)] == brute_force(added, text), f"step {step}"
+
+def test_small_additions_do_not_rebuild_the_whole_dictionary(monkeypatch):
+    built = []
+    original = extraction._Automaton.__init__
+
+    def counting(self, patterns):
+        patterns = list(patterns)
+        built.append(len(patterns))
+        original(self, patterns)
+
+    monkeypatch.setattr(extraction._Automaton, "__init__", counting)
+    matcher = AhoCorasick()
+    for i in range(1000):
+        matcher.add(f"client {i}", i)
+    matcher.find_all("client 5")
+    built.clear()
+    for i in range(1000, 1010):
+        matcher.add(f"client {i}", i)
+        assert matcher.find_all(f"from client {i}") == [(5, 5 + len(f"client {i}"), i)]
+    # One build per search, each over the pending names only
+    assert len(built) == 10 and max(built) <= 10
+
+def test_reingested_email_does_not_link_the_same_pair_twice():
+    orchestrator = LifeOrchestrator()
+    email = {"id": "m1", "subject": "Invoice", "from": "dana@example.com", "content": "Please pay until 15.3.2030"}
+    asyncio.run(orchestrator.perceive({"email": email}))
+    asyncio.run(orchestrator.perceive({"email": {**email, "content": "Please pay until 15.3.2030, thanks"}}))
+
+    pairs = Counter(frozenset((e.from_node, e.to_node)) for e in orchestrator.graph.neighbors("email_m1"))
+    assert pairs and max(pairs.values()) == 1
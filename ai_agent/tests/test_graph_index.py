@@ -0,0 +1,61 @@
+import random
+from datetime import datetime, timedelta
+
+from life_orchestrator import ContextGraph, ContextNode, EntityType, parse_deadline
+
+TYPES = [EntityType.TASK, EntityType.DEADLINE, EntityType.DOCUMENT]
+
+def random_node(rng, number):
+    data = {"title": f"Item {number}"}
+    if rng.random() < 0.7:
+        data["client"] = rng.choice(["acme", "globex", "initech"])
+    if rng.random() < 0.6:
+        data["deadline"] = (datetime(2030, 1, 1) + timedelta(days=rng.randint(0, 20))).isoformat()
+    return ContextNode(id=f"n{rng.randint(0, 60):02d}", type=rng.choice(TYPES), data=data)
+
+def assert_indexes_match(graph):
+    """Every secondary index agrees with one rebuilt from the nodes"""
+    for node_type in TYPES:
+        expected = sorted(n.id for n in graph.nodes.values() if n.type == node_type)
+        assert graph.index.get(node_type, []) == expected
+    for client in ("acme", "globex", "initech"):
+        expected = {n.id for n in graph.nodes.values() if n.data.get("client") == client}
+        assert set(graph.attribute_index["client"].get(client, {})) == expected
+    expected = sorted((parse_deadline(n), n.id) for n in graph.nodes.values() if parse_deadline(n))
+    assert graph.deadlines == expected
+
+def test_indexes_follow_adds_updates_removes_and_bulk_loads():
+    rng = random.Random(5)
+    graph = ContextGraph()
+    for step in range(600):
+        action = rng.random()
+        if action < 0.6:
+            graph.add_node(random_node(rng, step))
+        elif action < 0.85:
+            graph.remove_node(f"n{rng.randint(0, 60):02d}")
+        else:
+            # Bulk loads may repeat ids, both among themselves and with the graph
+            graph.bulk_load([random_node(rng, step) for _ in range(rng.randint(1, 15))], [])
+        assert_indexes_match(graph)
+
+def test_query_pages_walk_every_match_in_id_order():
+    rng = random.Random(9)
+    graph = ContextGraph()
+    for step in range(200):
+        graph.add_node(random_node(rng, step))
+        if rng.random() < 0.2:
+            graph.remove_node(f"n{rng.randint(0, 60):02d}")
+
+    for types in (None, [EntityType.TASK], [EntityType.DOCUMENT, EntityType.TASK, EntityType.TASK]):
+        for attributes in (None, {"client": "acme"}):
+            expected = sorted(n.id for n in graph.nodes.values()
+                              if (not types or n.type in types)
+                              and (not attributes or n.data.get("client") == "acme"))
+            seen, cursor = [], None
+            while True:
+                page = graph.query(types=types, attributes=attributes, limit=4, cursor=cursor)
+                seen.extend(n.id for n in page["nodes"])
+                cursor = page["next_cursor"]
+                if cursor is None:
+                    break
+            assert seen == expected
@@ -0,0 +1,20 @@
+import asyncio
+
+import life_orchestrator
+from life_orchestrator import LifeOrchestrator, MemoryBank
+
+def test_feedback_memory_is_capped_while_the_learner_counts_everything(monkeypatch):
+    monkeypatch.setattr(life_orchestrator, "PATTERN_MEMORY_LIMIT", 20)
+    orchestrator = LifeOrchestrator()
+    for number in range(50):
+        asyncio.run(orchestrator.learn({"action": f"Call client {number}", "kind": "call", "success": number % 2 == 0}))
+
+    entries = [entry for day in orchestrator.memory.patterns.values() for entry in day]
+    assert len(entries) == 20
+    assert entries[-1]["action"] == "Call client 49"
+    assert orchestrator.learner.events == 50
+
+    # Loading more than the cap keeps only the newest
+    restored = MemoryBank()
+    restored.load_dict({"patterns": {"pattern_2030-01-01": [{"n": n} for n in range(30)]}})
+    assert restored.patterns["pattern_2030-01-01"] == [{"n": n} for n in range(10, 30)]
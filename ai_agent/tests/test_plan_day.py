@@ -0,0 +1,45 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+
+import life_orchestrator
+from life_orchestrator import LifeOrchestrator
+
+def freeze(monkeypatch, moment: datetime):
+    class Frozen(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return moment
+    monkeypatch.setattr(life_orchestrator, "datetime", Frozen)
+
+@pytest.fixture
+def orchestrator():
+    orchestrator = LifeOrchestrator()
+    asyncio.run(orchestrator.perceive({"task": {"id": "report", "title": "Write report"}}))
+    return orchestrator
+
+def test_evening_plan_rolls_to_the_next_working_day(monkeypatch, orchestrator):
+    # Tuesday 2030-01-01, after working hours
+    freeze(monkeypatch, datetime(2030, 1, 1, 19, 30))
+    plan = orchestrator.plan_day()
+    assert plan["day_start"] == datetime(2030, 1, 2, 9)
+    assert plan["day_end"] == datetime(2030, 1, 2, 18)
+    assert [slot["item_id"] for slot in plan["slots"]] == ["task_report"]
+
+def test_thursday_evening_skips_the_weekend(monkeypatch, orchestrator):
+    freeze(monkeypatch, datetime(2030, 1, 3, 18, 0))
+    plan = orchestrator.plan_day()
+    assert plan["day_start"] == datetime(2030, 1, 6, 9)
+
+def test_mid_day_plan_starts_now(monkeypatch, orchestrator):
+    freeze(monkeypatch, datetime(2030, 1, 1, 13, 2))
+    plan = orchestrator.plan_day()
+    assert plan["day_start"] == datetime(2030, 1, 1, 13, 5)
+    assert plan["day_end"] == datetime(2030, 1, 1, 18)
+
+def test_explicit_past_day_gets_an_empty_plan(monkeypatch, orchestrator):
+    freeze(monkeypatch, datetime(2030, 1, 1, 19, 30))
+    plan = orchestrator.plan_day(day_start=datetime(2030, 1, 1, 9), day_end=datetime(2030, 1, 1, 18))
+    assert plan["slots"] == [] and plan["free_minutes"] == 0
+    assert plan["reason"]
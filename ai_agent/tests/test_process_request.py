@@ -0,0 +1,13 @@
+import asyncio
+
+import life_orchestrator
+
+def test_process_request_builds_the_shared_orchestrator_on_first_use(monkeypatch):
+    monkeypatch.setattr(life_orchestrator, "_default_orchestrator", None)
+    result = asyncio.run(life_orchestrator.process_request("מה דחוף היום?"))
+    assert "response" in result
+    shared = life_orchestrator._default_orchestrator
+    assert shared is not None
+    assert life_orchestrator.orchestrator is shared
+    asyncio.run(life_orchestrator.process_request("ועוד משהו", {"source": "test"}))
+    assert life_orchestrator._default_orchestrator is shared
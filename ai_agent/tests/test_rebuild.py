@@ -0,0 +1,35 @@
+import asyncio
+from datetime import datetime, timedelta
+
+from life_orchestrator import LifeOrchestrator
+
+def test_rebuild_seeds_urgency_without_notifications_or_rule_firings():
+    source = LifeOrchestrator()
+    due = (datetime.now() + timedelta(days=2)).isoformat()
+    asyncio.run(source.perceive({"deadline": {"id": "rent", "title": "Rent", "deadline": due}}))
+
+    orchestrator = LifeOrchestrator()
+    orchestrator.add_rule({
+        "name": "critical_deadline",
+        "when": [{"type": "deadline", "where": [["urgency", "==", "critical"]]}],
+        "then": {"action": "notify"}
+    })
+    orchestrator.feed.subscribe()
+    orchestrator.graph.bulk_load(source.graph.iter_nodes(), source.graph.iter_edges())
+    orchestrator.rebuild_indexes()
+
+    assert orchestrator.scheduler.current == {"deadline_rent": "critical"}
+    assert list(orchestrator.notifications) == []
+    assert not orchestrator.feed._urgency and not orchestrator.feed._rules
+    # The rule still sees the urgency it was seeded with
+    assert orchestrator.rules.describe("critical_deadline")["matches"] == 1
+
+def test_later_transitions_still_notify():
+    orchestrator = LifeOrchestrator()
+    deadline = datetime.now() + timedelta(days=6)
+    asyncio.run(orchestrator.perceive({"deadline": {"id": "tax", "title": "Tax", "deadline": deadline.isoformat()}}))
+    orchestrator.rebuild_indexes()
+    assert list(orchestrator.notifications) == []
+
+    orchestrator.scheduler.advance(deadline - timedelta(days=4))
+    assert [n["to"] for n in orchestrator.notifications] == ["critical"]
@@ -0,0 +1,154 @@
+import random
+import asyncio
+import itertools
+from datetime import datetime, timedelta
+
+import rules
+from rules import RuleEngine, _passes, _variable
+from life_orchestrator import LifeOrchestrator
+
+# ---------- Rete network vs a brute-force scan ----------
+
+def brute_force(definitions, facts):
+    """Every complete match, found by trying each combination of facts against each rule"""
+    found = set()
+    for definition in definitions:
+        per_condition = []
+        for condition in definition["when"]:
+            kind = "edge" if "edge" in condition else "node"
+            fact_type = condition.get(kind) if kind == "edge" else condition.get("type")
+            literal = [t for t in condition.get("where", []) if _variable(t[2]) is None]
+            per_condition.append([
+                fact_id for fact_id, (k, t, attrs) in facts.items()
+                if k == kind and (fact_type is None or t == fact_type)
+                and all(_passes(attrs, *test) for test in literal)
+            ])
+        for combination in itertools.product(*per_condition):
+            if len(set(combination)) < len(combination):
+                continue
+            bound, ok = {}, True
+            for condition, fact_id in zip(definition["when"], combination):
+                attrs = facts[fact_id][2]
+                for attr, op, expected in condition.get("where", []):
+                    variable = _variable(expected)
+                    if variable is None:
+                        continue
+                    value = attrs.get(attr)
+                    if variable in bound and (value is None or value != bound[variable]):
+                        ok = False
+                    bound.setdefault(variable, value)
+            if ok:
+                found.add((definition["name"], combination))
+    return found
+
+def random_rule(rng, name):
+    conditions = []
+    for position in range(rng.randint(1, 3)):
+        if position and rng.random() < 0.3:
+            where = [["from", "==", "?n0"]] + ([["to", "==", "?n1"]] if rng.random() < 0.5 else [])
+            conditions.append({"as": f"c{position}", "edge": "blocks", "where": where})
+            continue
+        where = []
+        if rng.random() < 0.6:
+            where.append(["amount", rng.choice([">", "<=", "=="]), rng.randint(0, 10)])
+        if rng.random() < 0.4:
+            where.append(["tag", "in", rng.sample(["a", "b", "c"], 2)])
+        where.append(["client", "==", "?client"] if rng.random() < 0.7 else ["tag", "==", "?tag"])
+        where.append(["id", "==", f"?n{position}"])
+        conditions.append({"as": f"c{position}", "type": rng.choice(["task", "deadline", None]), "where": where})
+    return {"name": name, "when": conditions, "then": {"action": "notify"}}
+
+def test_rete_matches_brute_force_under_random_changes():
+    rng = random.Random(11)
+    engine = RuleEngine()
+    facts = {}
+    definitions = {}
+
+    def source(kind, fact_type):
+        for fact_id, (k, t, attrs) in list(facts.items()):
+            if k == kind and (fact_type is None or t == fact_type):
+                yield fact_id, attrs
+
+    nodes = [f"n{i}" for i in range(14)]
+    for step in range(600):
+        action = rng.random()
+        if action < 0.08 or not definitions:
+            name = f"rule{rng.randint(0, 5)}"
+            definitions[name] = random_rule(rng, name)
+            engine.add_rule(definitions[name], source)
+        elif action < 0.1:
+            name = rng.choice(sorted(definitions))
+            engine.remove_rule(name)
+            del definitions[name]
+        elif action < 0.7:
+            node = rng.choice(nodes)
+            attrs = {"id": node, "client": rng.choice(["x", "y", "z", None]),
+                     "tag": rng.choice(["a", "b", "c"]), "amount": rng.randint(0, 10)}
+            fact_type = rng.choice(["task", "deadline"])
+            facts[node] = ("node", fact_type, attrs)
+            engine.assert_fact(node, "node", fact_type, attrs)
+        elif action < 0.85:
+            a, b = rng.sample(nodes, 2)
+            if a in facts and b in facts:
+                fact_id = f"{a}|blocks|{b}"
+                facts[fact_id] = ("edge", "blocks", {"from": a, "to": b, "type": "blocks"})
+                engine.assert_fact(fact_id, "edge", "blocks", facts[fact_id][2])
+        else:
+            node = rng.choice(nodes)
+            engine.retract_fact(node)
+            facts.pop(node, None)
+            touching = [f for f, (k, _, attrs) in facts.items() if k == "edge" and node in (attrs["from"], attrs["to"])]
+            for fact_id in touching:
+                del facts[fact_id]
+
+        expected = brute_force(definitions.values(), facts)
+        actual = {(m["rule"], tuple(m["matched"].values())) for m in engine.matches(limit=10 ** 6)}
+        assert actual == expected, f"step {step}"
+
+# ---------- within_days windows ----------
+
+def freeze(monkeypatch, clock):
+    class Frozen(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return clock[0]
+    monkeypatch.setattr(rules, "datetime", Frozen)
+
+def test_within_days_fires_when_the_window_opens(monkeypatch):
+    clock = [datetime.now()]
+    freeze(monkeypatch, clock)
+    orchestrator = LifeOrchestrator()
+    orchestrator.add_rule({
+        "name": "week_out",
+        "when": [{"as": "d", "type": "deadline", "where": [["deadline", "within_days", 7]]}],
+        "then": {"action": "notify", "message": "{d.title} is due within a week"}
+    })
+    due = clock[0] + timedelta(days=10)
+    result = asyncio.run(orchestrator.perceive({"deadline": {"id": "visa", "title": "Visa renewal",
+                                                             "deadline": due.isoformat()}}))
+    assert result["insights"] == []
+
+    # Ten days out is neither of the urgency boundaries (4 and 1 days); only the rule's own timer sees day 7
+    clock[0] = due - timedelta(days=7) + timedelta(seconds=1)
+    assert orchestrator.scheduler.advance(clock[0]) == []
+    orchestrator.rule_timers.advance(clock[0])
+    fired = [n for n in orchestrator.notifications if n.get("type") == "rule_fired"]
+    assert [n["rule"] for n in fired] == ["week_out"]
+
+def test_rule_timers_follow_rule_removal_and_node_removal():
+    orchestrator = LifeOrchestrator()
+    due = (datetime.now() + timedelta(days=30)).isoformat()
+    asyncio.run(orchestrator.perceive({"deadline": {"id": "lease", "title": "Lease", "deadline": due}}))
+    orchestrator.add_rule({
+        "name": "fortnight",
+        "when": [{"type": "deadline", "where": [["deadline", "within_days", 14]]}],
+        "then": {"action": "notify"}
+    })
+    assert set(orchestrator.rule_timers.deadlines) == {("deadline_lease", "deadline")}
+
+    orchestrator.graph.remove_node("deadline_lease")
+    assert not orchestrator.rule_timers.deadlines
+    asyncio.run(orchestrator.perceive({"deadline": {"id": "lease", "title": "Lease", "deadline": due}}))
+    assert orchestrator.rule_timers.deadlines
+    orchestrator.remove_rule("fortnight")
+    assert not orchestrator.rule_timers.deadlines
@@ -0,0 +1,35 @@
+import random
+from datetime import datetime, timedelta
+
+from scheduler import DeadlineScheduler
+
+BUCKETS = [("critical", timedelta(days=4)), ("overdue", timedelta(days=1))]
+
+def test_buckets_match_brute_force_and_generations_do_not_pile_up():
+    rng = random.Random(11)
+    scheduler = DeadlineScheduler(BUCKETS)
+    now = datetime(2030, 1, 1)
+    for step in range(3000):
+        item = f"item{rng.randint(0, 40)}"
+        action = rng.random()
+        if action < 0.5:
+            # Half-hour offsets keep deadlines off the boundaries the clock steps land on
+            scheduler.schedule(item, now + timedelta(hours=rng.randint(-48, 240), minutes=30), now)
+        elif action < 0.65:
+            scheduler.unschedule(item)
+        else:
+            now += timedelta(hours=rng.randint(1, 12))
+            scheduler.advance(now)
+
+        expected = {item_id: scheduler.bucket_for(deadline, now) for item_id, deadline in scheduler.deadlines.items()}
+        assert scheduler.current == {k: v for k, v in expected.items() if v is not None}, f"step {step}"
+        # Only items with events still ahead of them keep a generation
+        assert set(scheduler._generation) == set(scheduler._pending) <= set(scheduler.deadlines)
+        assert scheduler._stale >= 0
+        assert all(due > now for due, generation, item_id, _ in scheduler._heap
+                   if scheduler._generation.get(item_id) == generation)
+
+    now += timedelta(days=30)
+    scheduler.advance(now)
+    assert scheduler._generation == {} and scheduler._pending == {}
+    assert set(scheduler.current.values()) <= {"overdue"}
@@ -0,0 +1,54 @@
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+
+import smart_server
+
+@pytest.fixture
+def client():
+    with TestClient(smart_server.app) as client:
+        while client.get("/ready").status_code != 200:
+            time.sleep(0.05)
+        yield client
+
+def test_query_accepts_timezone_aware_deadline_bounds(client):
+    due = (datetime.now() + timedelta(days=2)).replace(microsecond=0)
+    client.post("/ingest/task", json={"task": {"id": "tz", "title": "Report", "deadline": due.isoformat()}})
+
+    for bound in ("Z", "+00:00", "+03:00"):
+        response = client.post("/query", json={
+            "deadline_from": (due - timedelta(days=1)).isoformat() + bound,
+            "deadline_to": (due + timedelta(days=1)).isoformat() + bound
+        })
+        assert response.status_code == 200
+        assert [n["id"] for n in response.json()["nodes"]] == ["task_tz"]
+
+def test_history_accepts_timezone_aware_timestamps(client):
+    client.post("/ingest/task", json={"task": {"id": "h", "title": "Versioned"}})
+    now = datetime.now().astimezone()
+    later = (now + timedelta(minutes=1)).isoformat()
+
+    response = client.get("/history/as-of", params={"timestamp": later})
+    assert response.status_code == 200
+    assert "task_h" in [n["id"] for n in response.json()["nodes"]]
+
+    start = (now - timedelta(hours=1)).isoformat()
+    response = client.get("/history/diff", params={"start": start, "end": later})
+    assert response.status_code == 200
+    assert "task_h" in [n["id"] for n in response.json()["added"]]
+    response = client.get("/history/diff", params={"start": "2000-01-01T00:00:00Z"})
+    assert response.status_code == 200
+
+def test_admin_memory_endpoints_need_the_admin_token(client, monkeypatch):
+    monkeypatch.setattr(smart_server, "ADMIN_TOKEN", None)
+    assert client.get("/admin/memory").status_code == 403
+
+    monkeypatch.setattr(smart_server, "ADMIN_TOKEN", "s3cret")
+    assert client.get("/admin/memory").status_code == 401
+    assert client.post("/admin/memory/snapshots", headers={"Authorization": "Bearer wrong"}).status_code == 401
+
+    response = client.get("/admin/memory", params={"sample": 10}, headers={"Authorization": "Bearer s3cret"})
+    assert response.status_code == 200
+    assert response.json()["structures"]
@@ -0,0 +1,137 @@
+import random
+import asyncio
+import multiprocessing
+from datetime import datetime, timedelta
+
+import pytest
+
+import sqlite_store
+from life_orchestrator import LifeOrchestrator, ContextNode, EntityType
+from sqlite_store import SQLiteGraphStore
+
+def derived_state(orchestrator):
+    """What the in-memory indexes built from the store hold"""
+    centrality = orchestrator.centrality
+    return {
+        "deadlines": dict(orchestrator.scheduler.deadlines),
+        "clusters": orchestrator.clusterer.clusters(),
+        "durations": dict(orchestrator.critical_path.duration),
+        "blockers": {k: set(v) for k, v in orchestrator.critical_path.blockers.items() if v},
+        "intervals": sorted((item, start, end) for item, start, end, _ in
+                            orchestrator.intervals.overlapping(datetime(2000, 1, 1), datetime(2100, 1, 1))),
+        "documents": set(orchestrator.text_index.doc_numbers),
+        "centrality": {n: centrality.score(n) for n in centrality.estimate},
+        "nodes": orchestrator.graph.node_count(),
+        "edges": orchestrator.graph.edge_count()
+    }
+
+def assert_same_state(reader, fresh):
+    actual, expected = derived_state(reader), derived_state(fresh)
+    # Centrality is approximate; its error depends on the order updates arrived in
+    assert actual.pop("centrality") == pytest.approx(expected.pop("centrality"), rel=0.02)
+    assert actual == expected
+
+def random_writes(orchestrator, rng, steps):
+    base = datetime.now() + timedelta(days=1)
+    for _ in range(steps):
+        action = rng.random()
+        tasks = [n.id for n in orchestrator.graph.iter_nodes([EntityType.TASK])]
+        if action < 0.45:
+            task = {"id": f"t{rng.randint(0, 30)}", "title": rng.choice(["Send invoice", "Tax report", "Call bank"]),
+                    "client": rng.choice(["acme", "globex", None]),
+                    "deadline": (base + timedelta(days=rng.randint(0, 10))).isoformat()}
+            if tasks and rng.random() < 0.4:
+                task["depends_on"] = [rng.choice(tasks)]
+            asyncio.run(orchestrator.perceive({"task": task}))
+        elif action < 0.7:
+            asyncio.run(orchestrator.perceive({"email": {
+                "subject": rng.choice(["Invoice", "Meeting", "Tax"]) + f" {rng.randint(0, 99)}",
+                "from": rng.choice(["dana@example.com", "avi@example.com"]),
+                "content": rng.choice(["Please pay until 5.3.2031", "See you soon", "Report attached"])
+            }}))
+        elif action < 0.85 and tasks:
+            orchestrator.set_status(rng.choice(tasks), rng.choice(["done", "active"]))
+        elif tasks:
+            orchestrator.graph.remove_node(rng.choice(tasks))
+
+def test_replayed_changes_match_a_fresh_rebuild(tmp_path):
+    path = str(tmp_path / "graph.db")
+    writer = LifeOrchestrator(graph=SQLiteGraphStore(path))
+    reader = LifeOrchestrator(graph=SQLiteGraphStore(path))
+    rng = random.Random(17)
+    for _ in range(8):
+        random_writes(writer, rng, 15)
+        reader.sync_changes()
+        assert reader.graph.version == writer.graph.version
+
+        fresh = LifeOrchestrator(graph=SQLiteGraphStore(path))
+        fresh.rebuild_indexes()
+        assert_same_state(reader, fresh)
+
+def test_reader_behind_the_pruned_log_rebuilds(tmp_path, monkeypatch):
+    monkeypatch.setattr(sqlite_store, "CHANGE_LOG_LIMIT", 5)
+    path = str(tmp_path / "graph.db")
+    writer = LifeOrchestrator(graph=SQLiteGraphStore(path))
+    reader = LifeOrchestrator(graph=SQLiteGraphStore(path))
+    random_writes(writer, random.Random(4), 60)
+    # Force the periodic prune now rather than after a thousand writes
+    writer.graph.conn.execute("DELETE FROM changes WHERE seq <= ?", (writer.graph.version - 5,))
+
+    reader.sync_changes()
+    fresh = LifeOrchestrator(graph=SQLiteGraphStore(path))
+    fresh.rebuild_indexes()
+    assert_same_state(reader, fresh)
+
+def _write_from_another_process(path, count):
+    store = SQLiteGraphStore(path)
+    for i in range(count):
+        store.add_node(ContextNode(id=f"task_child{i}", type=EntityType.TASK,
+                                   data={"title": f"Child task {i}", "deadline": "2031-01-0%dT12:00:00" % (i % 9 + 1)}))
+    store.close()
+
+def test_writes_from_another_process_reach_the_listeners(tmp_path):
+    path = str(tmp_path / "graph.db")
+    reader = LifeOrchestrator(graph=SQLiteGraphStore(path))
+    child = multiprocessing.get_context("spawn").Process(target=_write_from_another_process, args=(path, 20))
+    child.start()
+    child.join(60)
+    assert child.exitcode == 0
+
+    assert reader.sync_changes() == 20
+    assert len(reader.critical_path.duration) == 20
+    assert len(reader.scheduler.deadlines) == 20
+    fresh = LifeOrchestrator(graph=SQLiteGraphStore(path))
+    fresh.rebuild_indexes()
+    assert_same_state(reader, fresh)
+
+def test_rules_feedback_and_memory_reach_the_other_worker(tmp_path):
+    path = str(tmp_path / "graph.db")
+    first = LifeOrchestrator(graph=SQLiteGraphStore(path))
+    second = LifeOrchestrator(graph=SQLiteGraphStore(path))
+    rule = {"name": "acme_tasks", "when": [{"type": "task", "where": [["client", "==", "acme"]]}],
+            "then": {"action": "notify", "message": "Check it"}}
+    first.add_rule(rule)
+    asyncio.run(first.learn({"action": "Call the bank", "kind": "call", "success": True}))
+    asyncio.run(second.learn({"action": "Call the bank", "kind": "call", "success": False}))
+    due = (datetime.now() + timedelta(days=3)).isoformat()
+    asyncio.run(first.perceive({"deadline": {"id": "vat", "title": "VAT return", "deadline": due}}))
+    first.sync_changes()
+    second.sync_changes()
+
+    for orchestrator in (first, second):
+        assert set(orchestrator.rules.rules) == {"acme_tasks"}
+        assert orchestrator.learner.events == 2
+        assert orchestrator.decision_engine.learner is orchestrator.learner
+        assert orchestrator.memory.recall("deadline_deadline_vat")["title"] == "VAT return"
+        assert sum(len(entries) for entries in orchestrator.memory.patterns.values()) == 2
+    assert first.learner.summary() == second.learner.summary()
+
+    second.remove_rule("acme_tasks")
+    first.sync_changes()
+    assert first.rules.rules == {}
+
+    # A worker started later picks everything up from the database
+    late = LifeOrchestrator(graph=SQLiteGraphStore(path))
+    late.load_shared()
+    assert late.learner.events == 2 and late.rules.rules == {}
+    assert late.memory.to_dict()["long_term"].keys() == first.memory.to_dict()["long_term"].keys()
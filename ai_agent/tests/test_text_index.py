@@ -0,0 +1,36 @@
+import random
+
+from text_index import COMPACT_FRACTION, InvertedIndex, tokenize
+
+def test_pointed_hebrew_tokenizes_like_unpointed():
+    assert tokenize("שָׁלוֹם עוֹלָם חֶשְׁבּוֹנִית") == tokenize("שלום עולם חשבונית")
+    assert "חשבונית" in tokenize("חֶשְׁבּוֹנִית")
+
+def test_maqaf_separates_words():
+    assert tokenize("בֵּית־סֵפֶר") == tokenize("בית ספר")
+
+def test_unpointed_query_finds_pointed_document():
+    index = InvertedIndex()
+    index.add("pointed", "שָׁלוֹם, מְצֹרֶפֶת הַחֶשְׁבּוֹנִית לְחֹדֶשׁ מַרְץ")
+    index.add("other", "פגישה ביום שלישי")
+    assert [doc_id for doc_id, _ in index.search("חשבונית")] == ["pointed"]
+
+def test_removed_slots_are_compacted_and_search_is_unchanged():
+    rng = random.Random(2)
+    words = ["invoice", "tax", "meeting", "bank", "חשבונית", "פגישה", "report", "lease"]
+    index = InvertedIndex()
+    texts = {}
+    for step in range(2000):
+        doc_id = f"d{rng.randint(0, 120)}"
+        if rng.random() < 0.3:
+            index.remove(doc_id)
+            texts.pop(doc_id, None)
+        else:
+            texts[doc_id] = " ".join(rng.choice(words) for _ in range(rng.randint(1, 8)))
+            index.add(doc_id, texts[doc_id])
+        assert index.removed_slots <= max(COMPACT_FRACTION * len(index), 64)
+        assert len(index.doc_ids) == len(index) + index.removed_slots
+
+    fresh = InvertedIndex.build(texts.items())
+    for word in words:
+        assert dict(index.search(word, 200)) == dict(fresh.search(word, 200))
@@ -0,0 +1,71 @@
+import asyncio
+from datetime import datetime, timedelta
+
+from life_orchestrator import LifeOrchestrator, ContextGraph
+from sqlite_store import SQLiteGraphStore
+from memory_report import deep_size
+from tiering import TieredGraph
+
+def tiered_orchestrator(tmp_path):
+    return LifeOrchestrator(graph=TieredGraph(ContextGraph(), SQLiteGraphStore(str(tmp_path / "cold.db"))))
+
+def test_status_from_ingest_reaches_the_node_and_done_tasks_are_archived(tmp_path):
+    orchestrator = tiered_orchestrator(tmp_path)
+    asyncio.run(orchestrator.perceive({"task": {"id": "open", "title": "Still going"}}))
+    asyncio.run(orchestrator.perceive({"task": {"id": "shipped", "title": "Release", "status": "done"}}))
+    assert orchestrator.graph.get_node("task_shipped").status == "done"
+    assert orchestrator.graph.get_node("task_open").status == "active"
+
+    result = orchestrator.archive_inactive(now=datetime.now() + timedelta(days=8))
+    assert result["archived"] == 1
+    assert orchestrator.graph.archived == {"task_shipped"}
+
+def test_set_status_marks_an_existing_task_done(tmp_path):
+    orchestrator = tiered_orchestrator(tmp_path)
+    asyncio.run(orchestrator.perceive({"task": {"id": "report", "title": "Quarterly report"}}))
+    node = orchestrator.set_status("task_report", "completed")
+    assert node.status == "completed" and node.data["status"] == "completed"
+    assert orchestrator.set_status("task_missing", "done") is None
+
+    orchestrator.archive_inactive(now=datetime.now() + timedelta(days=8))
+    assert "task_report" in orchestrator.graph.archived
+
+def test_search_reads_archived_emails_without_rehydrating(tmp_path):
+    orchestrator = tiered_orchestrator(tmp_path)
+    received = (datetime.now() - timedelta(days=200)).isoformat()
+    result = asyncio.run(orchestrator.perceive({"email": {
+        "subject": "Invoice for the kitchen renovation", "from": "builder@example.com",
+        "content": "Please find the invoice attached", "received": received
+    }}))
+    email_id = result["processed_nodes"][0].id
+
+    orchestrator.archive_inactive()
+    assert email_id in orchestrator.graph.archived
+
+    hits = orchestrator.search_emails("invoice")
+    assert [hit["node"]["id"] for hit in hits] == [email_id]
+    assert hits[0]["archived"] is True
+    assert email_id in orchestrator.graph.archived
+    assert orchestrator.graph.counts["rehydrated"] == 0
+
+    # Opening it is what brings it back
+    assert orchestrator.graph.get_node(email_id) is not None
+    assert email_id not in orchestrator.graph.archived
+    assert orchestrator.graph.counts["rehydrated"] == 1
+
+def test_archiving_drops_hot_history_of_the_archived_nodes(tmp_path):
+    orchestrator = tiered_orchestrator(tmp_path)
+    for number in range(40):
+        asyncio.run(orchestrator.perceive({"task": {"id": f"t{number}", "title": f"Closed item {number}",
+                                                    "client": "acme", "status": "done"}}))
+    history = orchestrator.graph.history
+    before = deep_size(history)
+
+    orchestrator.archive_inactive(now=datetime.now() + timedelta(days=8))
+    assert len(orchestrator.graph.archived) == 40
+    assert set(history.entries) == set(history.timestamps) == {n.id for n in orchestrator.graph.iter_nodes()}
+    assert all(node_id in history.entries for _, node_id in history.change_log)
+    assert all(e.from_node not in orchestrator.graph.archived and e.to_node not in orchestrator.graph.archived
+               for e in history.edge_log)
+    assert len(history.edge_times) == len(history.edge_log)
+    assert deep_size(history) < before / 2
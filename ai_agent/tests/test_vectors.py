@@ -0,0 +1,32 @@
+import random
+
+from vectors import SemanticIndex
+
+TEXTS = ["Invoice for March", "חשבונית לחודש מרץ", "Meeting with the accountant", "Tax report deadline",
+         "Renew the car insurance", "Call the bank about the mortgage", ""]
+
+def test_doc_freq_follows_reembedding_and_removal():
+    rng = random.Random(5)
+    index = SemanticIndex(dimensions=2 ** 12)
+    current = {}
+    for _ in range(300):
+        key = f"n{rng.randint(0, 15)}"
+        if rng.random() < 0.2:
+            index.remove(key)
+            current.pop(key, None)
+        else:
+            current[key] = rng.choice(TEXTS)
+            index.add(key, {"title": current[key]})
+
+    fresh = SemanticIndex(dimensions=2 ** 12)
+    for key, text in current.items():
+        fresh.add(key, {"title": text})
+    assert index.vectorizer.doc_freq == fresh.vectorizer.doc_freq
+    assert index.vectorizer.doc_count == fresh.vectorizer.doc_count
+    assert set(index.index.vectors) == {key for key, text in current.items() if text}
+
+def test_reembedding_the_same_text_gives_the_same_vector():
+    index = SemanticIndex()
+    index.add("other", {"title": "Meeting with the accountant"})
+    first = index.add("a", {"title": "Invoice for March"})
+    assert index.add("a", {"title": "Invoice for March"}) == first
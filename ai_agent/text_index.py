@@ -0,0 +1,189 @@
+"""
+Text Index - In-process full-text search for ingested documents
+===============================================================
+Inverted index with BM25 ranking. Tokenization is Unicode aware and
+normalizes Hebrew (niqqud, final letters, attached prefixes) so that
+mixed Hebrew/English mail can be searched with either language.
+"""
+
+import re
+import math
+import heapq
+from typing import Dict, Any, List, Tuple, Iterable, Optional
+
+# ==================== Tokenization ====================
+
+TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+# Niqqud and cantillation marks carry no meaning for search; maqaf, paseq and sof pasuq separate words
+HEBREW_MARKS = {code: None for code in range(0x0591, 0x05C8)}
+HEBREW_MARKS.update({ord(mark): " " for mark in "\u05be\u05c0\u05c3\u05c6"})
+HEBREW_FINALS = str.maketrans({"ך": "כ", "ם": "מ", "ן": "נ", "ף": "פ", "ץ": "צ"})
+HEBREW_PREFIXES = "והבכלמש"
+
+STOPWORDS = {
+    "the", "and", "for", "are", "was", "with", "this", "that", "you", "your",
+    "את", "של", "על", "עם", "זה", "גם", "כי", "אם", "לא", "אני", "הוא", "היא"
+}
+
+def _is_hebrew(token: str) -> bool:
+    return "א" <= token[0] <= "ת"
+
+def tokenize(text: str) -> List[str]:
+    """Split text into normalized search terms"""
+    terms = []
+    # Marks go before splitting: \w does not match them, so they would cut pointed words apart
+    for token in TOKEN_PATTERN.findall(text.lower().translate(HEBREW_MARKS)):
+        if len(token) < 2 or token in STOPWORDS:
+            continue
+
+        if _is_hebrew(token):
+            token = token.translate(HEBREW_FINALS)
+            terms.append(token)
+            # "והחשבונית" should also match "חשבונית"; strip up to two prefix letters
+            stripped = token
+            for _ in range(2):
+                if len(stripped) > 3 and stripped[0] in HEBREW_PREFIXES:
+                    stripped = stripped[1:]
+                    terms.append(stripped)
+        else:
+            terms.append(token)
+    return terms
+
+# ==================== Inverted Index ====================
+
+# Removed slots are compacted away once they pass this fraction of live documents
+COMPACT_FRACTION = 0.25
+COMPACT_MIN_SLOTS = 64
+
+class InvertedIndex:
+    """BM25-ranked inverted index, updated one document at a time"""
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.postings: Dict[str, Dict[int, int]] = {}
+        self.doc_ids: List[Optional[str]] = []
+        self.doc_numbers: Dict[str, int] = {}
+        self.doc_lengths: List[int] = []
+        self.doc_terms: List[Tuple[str, ...]] = []
+        self.total_length = 0
+        self.removed_slots = 0
+
+    def __len__(self):
+        return len(self.doc_numbers)
+
+    def add(self, doc_id: str, text: str):
+        """Index a document, replacing any previous version with the same id"""
+        if doc_id in self.doc_numbers:
+            self.remove(doc_id)
+
+        terms = tokenize(text)
+        frequencies: Dict[str, int] = {}
+        for term in terms:
+            frequencies[term] = frequencies.get(term, 0) + 1
+
+        doc_num = len(self.doc_ids)
+        self.doc_ids.append(doc_id)
+        self.doc_numbers[doc_id] = doc_num
+        self.doc_lengths.append(len(terms))
+        self.doc_terms.append(tuple(frequencies))
+        self.total_length += len(terms)
+
+        for term, tf in frequencies.items():
+            self.postings.setdefault(term, {})[doc_num] = tf
+
+    def remove(self, doc_id: str):
+        doc_num = self.doc_numbers.pop(doc_id, None)
+        if doc_num is None:
+            return
+
+        for term in self.doc_terms[doc_num]:
+            posting = self.postings.get(term)
+            if posting is not None:
+                posting.pop(doc_num, None)
+                if not posting:
+                    del self.postings[term]
+
+        # Slot is left empty so other document numbers stay stable until the next compaction
+        self.total_length -= self.doc_lengths[doc_num]
+        self.doc_ids[doc_num] = None
+        self.doc_lengths[doc_num] = 0
+        self.doc_terms[doc_num] = ()
+        self.removed_slots += 1
+        if self.removed_slots >= max(COMPACT_MIN_SLOTS, COMPACT_FRACTION * len(self.doc_numbers)):
+            self.compact()
+
+    def compact(self):
+        """Drop removed slots and renumber the remaining documents in order"""
+        live = [n for n, doc_id in enumerate(self.doc_ids) if doc_id is not None]
+        renumber = {old: new for new, old in enumerate(live)}
+        self.doc_ids = [self.doc_ids[n] for n in live]
+        self.doc_lengths = [self.doc_lengths[n] for n in live]
+        self.doc_terms = [self.doc_terms[n] for n in live]
+        self.doc_numbers = {doc_id: n for n, doc_id in enumerate(self.doc_ids)}
+        for term, posting in self.postings.items():
+            self.postings[term] = {renumber[n]: tf for n, tf in posting.items()}
+        self.removed_slots = 0
+
+    def search(self, query: str, limit: int = 10) -> List[Tuple[str, float]]:
+        """Return (doc_id, score) pairs ranked by BM25"""
+        doc_count = len(self.doc_numbers)
+        if doc_count == 0:
+            return []
+
+        avg_length = self.total_length / doc_count or 1.0
+        scores: Dict[int, float] = {}
+
+        for term in set(tokenize(query)):
+            posting = self.postings.get(term)
+            if not posting:
+                continue
+
+            idf = math.log(1 + (doc_count - len(posting) + 0.5) / (len(posting) + 0.5))
+            k1, b = self.k1, self.b
+            lengths = self.doc_lengths
+            for doc_num, tf in posting.items():
+                norm = k1 * (1 - b + b * lengths[doc_num] / avg_length)
+                scores[doc_num] = scores.get(doc_num, 0.0) + idf * tf * (k1 + 1) / (tf + norm)
+
+        best = heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+        return [(self.doc_ids[doc_num], round(score, 4)) for doc_num, score in best]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Compact serialization; removed slots are dropped and documents renumbered"""
+        live = [n for n, doc_id in enumerate(self.doc_ids) if doc_id is not None]
+        renumber = {old: new for new, old in enumerate(live)}
+        return {
+            "k1": self.k1,
+            "b": self.b,
+            "doc_ids": [self.doc_ids[n] for n in live],
+            "doc_lengths": [self.doc_lengths[n] for n in live],
+            "postings": {
+                term: [[renumber[n], tf] for n, tf in posting.items()]
+                for term, posting in self.postings.items()
+            }
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "InvertedIndex":
+        index = cls(k1=data.get("k1", 1.2), b=data.get("b", 0.75))
+        index.doc_ids = list(data["doc_ids"])
+        index.doc_numbers = {doc_id: n for n, doc_id in enumerate(index.doc_ids)}
+        index.doc_lengths = list(data["doc_lengths"])
+        index.total_length = sum(index.doc_lengths)
+
+        terms_by_doc: List[List[str]] = [[] for _ in index.doc_ids]
+        for term, posting in data["postings"].items():
+            index.postings[term] = {n: tf for n, tf in posting}
+            for n, _ in posting:
+                terms_by_doc[n].append(term)
+        index.doc_terms = [tuple(terms) for terms in terms_by_doc]
+        return index
+
+    @classmethod
+    def build(cls, documents: Iterable[Tuple[str, str]]) -> "InvertedIndex":
+        index = cls()
+        for doc_id, text in documents:
+            index.add(doc_id, text)
+        return index
@@ -0,0 +1,178 @@
+"""
+Graph Tiering - Finished and stale nodes archived to a cold on-disk tier
+========================================================================
+The hot graph holds what the orchestrator analyzes. Nodes it no longer needs
+(done tasks, old emails, past events) move with their edges to a SQLite
+graph store, and leave every in-memory index through the hot graph's usual
+node_removed events, so memory and analysis cost follow the live items only.
+
+Archived ids stay known: reading or writing one moves it back to the hot
+graph first, with its edges to hot nodes, so callers never see the split.
+An edge lives in the hot graph only while both of its ends do; any edge
+touching an archived node is kept in the cold tier.
+"""
+
+import time
+import logging
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Callable, Iterable, Set
+
+from life_orchestrator import ContextNode, ContextEdge, EntityType, GraphStore, encode_cursor
+from sqlite_store import SQLiteGraphStore
+
+logger = logging.getLogger(__name__)
+
+# A rehydrated node is not archived again until this long after it was read
+REHYDRATE_GRACE_SECONDS = 24 * 3600
+
+class TieredGraph:
+    """GraphStore over a hot graph with a cold SQLiteGraphStore behind it.
+
+    Anything not overridden here (iteration, counts, traversal, listeners,
+    history) is the hot graph's.
+    """
+
+    def __init__(self, hot: GraphStore, cold: SQLiteGraphStore, grace_seconds: float = REHYDRATE_GRACE_SECONDS):
+        self.hot = hot
+        self.cold = cold
+        self.grace_seconds = grace_seconds
+        self.archived: Set[str] = {row[0] for row in cold.conn.execute("SELECT id FROM nodes")}
+        # Rehydrated id -> when, so a node that was just read stays hot for a while
+        self._recalled: Dict[str, float] = {}
+        # Called with each rehydrated node, for indexes kept outside the graph's listeners
+        self.on_rehydrate: Optional[Callable[[ContextNode], None]] = None
+        self.counts = {"archived": 0, "rehydrated": 0}
+        logger.info(f"Cold tier at {cold.path}: {len(self.archived)} archived nodes")
+
+    def __getattr__(self, name: str):
+        return getattr(self.hot, name)
+
+    # ---------- archival ----------
+
+    def archive(self, node_ids: Iterable[str]) -> int:
+        """Move nodes and their edges to the cold tier; returns how many moved"""
+        now = time.time()
+        self._recalled = {k: t for k, t in self._recalled.items() if now - t < self.grace_seconds}
+        nodes = [n for n in map(self.hot.get_node, node_ids) if n is not None and n.id not in self._recalled]
+        if not nodes:
+            return 0
+
+        edges: Dict[int, ContextEdge] = {}
+        for node in nodes:
+            for edge in self.hot.neighbors(node.id):
+                edges[id(edge)] = edge
+        # Written before the hot copy goes, so a failed write loses nothing
+        self.cold.bulk_load(nodes, edges.values())
+        self.archived.update(n.id for n in nodes)
+        self.hot.remove_nodes([n.id for n in nodes], record_removal=False)
+        self.counts["archived"] += len(nodes)
+        logger.info(f"Archived {len(nodes)} nodes and {len(edges)} edges to the cold tier")
+        return len(nodes)
+
+    def rehydrate(self, node_id: str) -> Optional[ContextNode]:
+        """Move an archived node back to the hot graph with its edges to hot nodes"""
+        if node_id not in self.archived:
+            return None
+
+        def to_hot(edge: ContextEdge) -> bool:
+            other = edge.to_node if edge.from_node == node_id else edge.from_node
+            return other == node_id or other not in self.archived
+
+        node, edges = self.cold.detach_node(node_id, to_hot)
+        self.archived.discard(node_id)
+        if node is None:
+            return None
+        self._recalled[node_id] = time.time()
+        self.hot.add_node(node)
+        for edge in edges:
+            self.hot.add_edge(edge)
+        self.counts["rehydrated"] += 1
+        if self.on_rehydrate is not None:
+            self.on_rehydrate(node)
+        logger.debug("Rehydrated node %s with %d edges", node_id, len(edges))
+        return node
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self.counts,
+            "hot_nodes": self.hot.node_count(),
+            "hot_edges": self.hot.edge_count(),
+            "cold_nodes": len(self.archived),
+            "cold_edges": self.cold.edge_count(),
+            "cold_path": self.cold.path
+        }
+
+    # ---------- GraphStore ----------
+
+    def get_node(self, node_id: str) -> Optional[ContextNode]:
+        node = self.hot.get_node(node_id)
+        if node is None and node_id in self.archived:
+            node = self.rehydrate(node_id)
+        return node
+
+    def read_node(self, node_id: str) -> Optional[ContextNode]:
+        """A node from whichever tier holds it, without moving it"""
+        node = self.hot.get_node(node_id)
+        if node is None and node_id in self.archived:
+            node = self.cold.get_node(node_id)
+        return node
+
+    def has_node(self, node_id: str) -> bool:
+        return node_id in self.archived or self.hot.has_node(node_id)
+
+    def add_node(self, node: ContextNode):
+        # A new version of an archived node replaces it in the hot graph, keeping its edges
+        if node.id in self.archived:
+            self.rehydrate(node.id)
+        self.hot.add_node(node)
+
+    def update_node(self, node_id: str, data: Optional[Dict[str, Any]] = None,
+                    status: Optional[str] = None, confidence: Optional[float] = None) -> ContextNode:
+        if node_id in self.archived:
+            self.rehydrate(node_id)
+        return self.hot.update_node(node_id, data=data, status=status, confidence=confidence)
+
+    def remove_node(self, node_id: str) -> Optional[ContextNode]:
+        if node_id in self.archived:
+            self.archived.discard(node_id)
+            return self.cold.remove_node(node_id)
+        return self.hot.remove_node(node_id)
+
+    def add_edge(self, edge: ContextEdge):
+        if edge.from_node in self.archived or edge.to_node in self.archived:
+            self.cold.add_edge(edge)
+        else:
+            self.hot.add_edge(edge)
+
+    def bulk_load(self, nodes: Iterable[ContextNode], edges: Iterable[ContextEdge]):
+        """Load into the hot graph, skipping what was archived after the loaded state was written"""
+        self.hot.bulk_load(
+            (n for n in nodes if n.id not in self.archived),
+            (e for e in edges if e.from_node not in self.archived and e.to_node not in self.archived)
+        )
+
+    def query(self, types: Optional[List[EntityType]] = None,
+              statuses: Optional[List[str]] = None,
+              deadline_from: Optional[datetime] = None,
+              deadline_to: Optional[datetime] = None,
+              attributes: Optional[Dict[str, Any]] = None,
+              limit: int = 50,
+              cursor: Optional[str] = None,
+              include_archived: bool = False) -> Dict[str, Any]:
+        """Hot nodes only unless include_archived; archived matches are read in place, not rehydrated"""
+        filters = dict(types=types, statuses=statuses, deadline_from=deadline_from, deadline_to=deadline_to,
+                       attributes=attributes, limit=limit, cursor=cursor)
+        hot = self.hot.query(**filters)
+        if not include_archived:
+            return hot
+
+        # Both tiers page by id, so merging two pages gives the next page of the union
+        cold = self.cold.query(**filters)
+        merged = sorted(hot["nodes"] + cold["nodes"], key=lambda n: n.id)
+        page = merged[:limit]
+        has_more = len(merged) > limit or hot["next_cursor"] is not None or cold["next_cursor"] is not None
+        return {
+            "nodes": page,
+            "next_cursor": encode_cursor(page[-1].id) if has_more and page else None,
+            "archived": [n.id for n in page if n.id in self.archived]
+        }
@@ -0,0 +1,283 @@
+"""
+Semantic Vectors - Local embeddings and approximate nearest-neighbour search
+============================================================================
+Nodes are embedded with hashed word and character n-gram TF-IDF, computed
+locally with no model download. Vectors are sparse and L2-normalized, so
+cosine similarity is a dot product. An HNSW graph keeps lookups
+sub-linear as the number of nodes grows.
+"""
+
+import math
+import heapq
+import random
+import zlib
+from array import array
+from typing import Dict, Any, List, Tuple, Optional, Iterable
+
+from text_index import tokenize
+
+SparseVector = Dict[int, float]
+
+# ==================== Hashed TF-IDF Vectorizer ====================
+
+class HashingVectorizer:
+    """Hashed n-gram TF-IDF with document frequencies learned online"""
+
+    def __init__(self, dimensions: int = 2 ** 18, char_ngram: int = 3, max_features: int = 64):
+        self.dimensions = dimensions
+        self.char_ngram = char_ngram
+        self.max_features = max_features
+        self.doc_freq: Dict[int, int] = {}
+        self.doc_count = 0
+
+    def _features(self, text: str) -> Dict[int, int]:
+        counts: Dict[int, int] = {}
+        n = self.char_ngram
+        for token in tokenize(text):
+            features = [f"w:{token}"]
+            padded = f"#{token}#"
+            # Character n-grams match inflections and typos that exact words miss
+            features.extend(f"c:{padded[i:i + n]}" for i in range(max(1, len(padded) - n + 1)))
+            for feature in features:
+                bucket = zlib.crc32(feature.encode()) % self.dimensions
+                counts[bucket] = counts.get(bucket, 0) + 1
+        return counts
+
+    def fit(self, text: str) -> Dict[int, int]:
+        """Fold a new document into the document frequencies; returns its feature counts"""
+        counts = self._features(text)
+        self.doc_count += 1
+        for bucket in counts:
+            self.doc_freq[bucket] = self.doc_freq.get(bucket, 0) + 1
+        return counts
+
+    def unfit(self, buckets: Iterable[int]):
+        """Take back a document folded in by fit, given the buckets it had"""
+        self.doc_count = max(0, self.doc_count - 1)
+        for bucket in buckets:
+            remaining = self.doc_freq.get(bucket, 0) - 1
+            if remaining > 0:
+                self.doc_freq[bucket] = remaining
+            else:
+                self.doc_freq.pop(bucket, None)
+
+    def fit_transform(self, text: str) -> SparseVector:
+        """Vectorize a new document and fold it into the document frequencies"""
+        return self._weigh(self.fit(text))
+
+    def transform(self, text: str) -> SparseVector:
+        return self._weigh(self._features(text))
+
+    def _weigh(self, counts: Dict[int, int]) -> SparseVector:
+        total = self.doc_count + 1
+        vector = {
+            bucket: (1 + math.log(tf)) * math.log(total / (1 + self.doc_freq.get(bucket, 0)) + 1)
+            for bucket, tf in counts.items()
+        }
+        if len(vector) > self.max_features:
+            # The heaviest features carry the meaning; the tail only slows every comparison
+            vector = dict(heapq.nlargest(self.max_features, vector.items(), key=lambda item: item[1]))
+        norm = math.sqrt(sum(w * w for w in vector.values()))
+        if norm == 0:
+            return {}
+        return {bucket: w / norm for bucket, w in vector.items()}
+
+def cosine(a: SparseVector, b: SparseVector) -> float:
+    # Key intersection runs in C; shared features are few, so the Python loop stays short
+    return sum(a[k] * b[k] for k in a.keys() & b.keys())
+
+# ==================== HNSW Index ====================
+
+class HNSWIndex:
+    """Hierarchical navigable small world graph over sparse cosine vectors"""
+
+    def __init__(self, m: int = 8, ef_construction: int = 40, ef_search: int = 40, seed: int = 42):
+        self.m = m
+        self.m0 = m * 2
+        self.ef_construction = ef_construction
+        self.ef_search = ef_search
+        self.level_factor = 1 / math.log(m)
+        self.vectors: Dict[str, SparseVector] = {}
+        self.layers: List[Dict[str, List[str]]] = []
+        self.entry_point: Optional[str] = None
+        self._random = random.Random(seed)
+
+    def __len__(self):
+        return len(self.vectors)
+
+    def __contains__(self, key: str):
+        return key in self.vectors
+
+    def _distance(self, a: SparseVector, key: str) -> float:
+        return 1.0 - cosine(a, self.vectors[key])
+
+    def _search_layer(self, query: SparseVector, entry_points: List[str], ef: int, layer: int) -> List[Tuple[float, str]]:
+        visited = set(entry_points)
+        candidates = [(self._distance(query, e), e) for e in entry_points]
+        heapq.heapify(candidates)
+        # Max-heap of the best `ef` results via negated distances
+        results = [(-d, e) for d, e in candidates]
+        heapq.heapify(results)
+
+        graph = self.layers[layer]
+        while candidates:
+            dist, current = heapq.heappop(candidates)
+            if dist > -results[0][0] and len(results) >= ef:
+                break
+            for neighbor in graph.get(current, []):
+                # Links to removed vectors are skipped here and pruned on the next overflow
+                if neighbor in visited or neighbor not in self.vectors:
+                    continue
+                visited.add(neighbor)
+                d = self._distance(query, neighbor)
+                if len(results) < ef or d < -results[0][0]:
+                    heapq.heappush(candidates, (d, neighbor))
+                    heapq.heappush(results, (-d, neighbor))
+                    if len(results) > ef:
+                        heapq.heappop(results)
+
+        return sorted((-d, e) for d, e in results)
+
+    def add(self, key: str, vector: SparseVector):
+        if key in self.vectors:
+            self.remove(key)
+        if not vector:
+            return
+
+        self.vectors[key] = vector
+        level = int(-math.log(1 - self._random.random()) * self.level_factor)
+        while len(self.layers) <= level:
+            self.layers.append({})
+        for layer in range(level + 1):
+            self.layers[layer][key] = []
+
+        if self.entry_point is None:
+            self.entry_point = key
+            return
+
+        entry = [self.entry_point]
+        top = self._node_level(self.entry_point)
+        for layer in range(top, level, -1):
+            entry = [self._search_layer(vector, entry, 1, layer)[0][1]]
+
+        for layer in range(min(level, top), -1, -1):
+            found = self._search_layer(vector, entry, self.ef_construction, layer)
+            limit = self.m0 if layer == 0 else self.m
+            neighbors = [e for _, e in found if e != key][:limit]
+            graph = self.layers[layer]
+            graph[key] = neighbors
+            for neighbor in neighbors:
+                links = graph[neighbor]
+                links.append(key)
+                if len(links) > limit:
+                    # Keep the closest links; the farthest is the cheapest to lose
+                    base = self.vectors[neighbor]
+                    vectors = self.vectors
+                    links[:] = heapq.nlargest(
+                        limit, (o for o in links if o in vectors), key=lambda o: cosine(base, vectors[o])
+                    )
+            entry = [e for _, e in found]
+
+        if level > top:
+            self.entry_point = key
+
+    def _node_level(self, key: str) -> int:
+        for layer in range(len(self.layers) - 1, -1, -1):
+            if key in self.layers[layer]:
+                return layer
+        return 0
+
+    def remove(self, key: str):
+        """Unlink a vector; neighbours are reconnected to each other to keep the graph navigable"""
+        if key not in self.vectors:
+            return
+        del self.vectors[key]
+
+        for graph in self.layers:
+            links = graph.pop(key, None)
+            if links is None:
+                continue
+            for neighbor in links:
+                neighbor_links = graph.get(neighbor)
+                if neighbor_links is None:
+                    continue
+                if key in neighbor_links:
+                    neighbor_links.remove(key)
+                for candidate in links:
+                    if candidate != neighbor and candidate not in neighbor_links and len(neighbor_links) < self.m:
+                        neighbor_links.append(candidate)
+
+        if self.entry_point == key:
+            self.entry_point = None
+            for graph in reversed(self.layers):
+                if graph:
+                    self.entry_point = next(iter(graph))
+                    break
+        while self.layers and not self.layers[-1]:
+            self.layers.pop()
+
+    def search(self, vector: SparseVector, k: int = 10) -> List[Tuple[str, float]]:
+        """Approximate top-k by cosine similarity as (key, similarity) pairs"""
+        if self.entry_point is None or not vector:
+            return []
+
+        entry = [self.entry_point]
+        for layer in range(self._node_level(self.entry_point), 0, -1):
+            entry = [self._search_layer(vector, entry, 1, layer)[0][1]]
+
+        found = self._search_layer(vector, entry, max(self.ef_search, k), 0)
+        return [(key, round(1.0 - dist, 4)) for dist, key in found[:k]]
+
+# ==================== Semantic Index ====================
+
+class SemanticIndex:
+    """Embeds graph nodes and answers nearest-neighbour queries over them"""
+
+    def __init__(self, dimensions: int = 2 ** 18):
+        self.vectorizer = HashingVectorizer(dimensions)
+        self.index = HNSWIndex()
+        # Key -> every bucket its text counted towards doc_freq (vectors keep only the heaviest),
+        # so re-embedding or removing a key takes its old counts back
+        self.fitted: Dict[str, array] = {}
+
+    def __len__(self):
+        return len(self.index)
+
+    @staticmethod
+    def node_text(data: Dict[str, Any]) -> str:
+        """Text used to embed a node: its descriptive fields, not ids or dates"""
+        parts = []
+        for key in ("title", "subject", "name", "description", "content", "client", "category", "notes"):
+            value = data.get(key)
+            if isinstance(value, str) and value:
+                parts.append(value)
+        return "\n".join(parts)
+
+    def add(self, key: str, data: Dict[str, Any]) -> SparseVector:
+        """Embed a node, replacing its previous vector and document frequencies"""
+        previous = self.fitted.pop(key, None)
+        if previous is not None:
+            self.vectorizer.unfit(previous)
+        text = self.node_text(data)
+        vector = {}
+        if text:
+            counts = self.vectorizer.fit(text)
+            self.fitted[key] = array("I", counts)
+            vector = self.vectorizer._weigh(counts)
+        self.index.add(key, vector)
+        return vector
+
+    def remove(self, key: str):
+        previous = self.fitted.pop(key, None)
+        if previous is not None:
+            self.vectorizer.unfit(previous)
+        self.index.remove(key)
+
+    def similar(self, key: str, k: int = 5) -> List[Tuple[str, float]]:
+        vector = self.index.vectors.get(key)
+        if not vector:
+            return []
+        return [(other, sim) for other, sim in self.index.search(vector, k + 1) if other != key][:k]
+
+    def search(self, text: str, k: int = 10) -> List[Tuple[str, float]]:
+        return self.index.search(self.vectorizer.transform(text), k)